@@ -0,0 +1,92 @@
+"""
+Import-time benchmark of the analysis modules
+
+Each module is imported in a fresh interpreter, like a newly spawned worker process,
+and the heavy reporting, imaging and GUI backends that were pulled in are listed
+
+Usage: python benchmarks/importTime.py [-n REPEAT] [module ...]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+
+# modules of the analysis that are imported by the worker processes
+MODULES = ["directStiffnessMethod.structure",
+           "directStiffnessMethod.analysis",
+           "directStiffnessMethod.batchAnalysis",
+           "directStiffnessMethod.parametricSweep"]
+
+# backends that should only be loaded on first use
+BACKENDS = ["fpdf", "PIL", "reportlab", "tkinter"]
+
+# program run in the fresh interpreter
+PROGRAM = """
+import json, sys, time
+start = time.perf_counter()
+__import__(sys.argv[1])
+end = time.perf_counter()
+backends = [name for name in json.loads(sys.argv[2]) if name in sys.modules]
+print(json.dumps({"time": end - start, "modules": len(sys.modules), "backends": backends}))
+"""
+
+
+def measureImport(module, repeat):
+    """
+    Import a module in a fresh interpreter for several times
+
+    :param module: module name
+    :param repeat: number of measurements
+    :return: dictionary of "module", "times", "modules" and "backends"
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    environment = dict(os.environ)
+    environment["PYTHONPATH"] = root + os.pathsep + environment.get("PYTHONPATH", "")
+
+    result = {"module": module, "times": [], "modules": 0, "backends": []}
+    for index in range(repeat):
+        output = subprocess.run([sys.executable, "-c", PROGRAM, module, json.dumps(BACKENDS)],
+                                capture_output=True, text=True, cwd=root, env=environment)
+        if output.returncode != 0:
+            raise Exception('Import of ' + module + ' failed!\n' + output.stderr)
+        data = json.loads(output.stdout.strip().split("\n")[-1])
+        result["times"].append(data["time"])
+        result["modules"] = data["modules"]
+        result["backends"] = data["backends"]
+    return result
+
+
+def main(argv=None):
+    """
+    Run the benchmark and display the result
+
+    :param argv: list of argument, the arguments of the command line are used if None
+    :return: exit status, 1 if a backend is loaded by the import
+    """
+    parser = argparse.ArgumentParser(description="Import-time benchmark of the analysis modules")
+    parser.add_argument("modules", nargs="*", default=MODULES, help="modules to be imported")
+    parser.add_argument("-n", "--repeat", type=int, default=10, help="number of fresh interpreters for each module")
+    args = parser.parse_args(argv)
+
+    status = 0
+    print("module".ljust(42) + "min [ms]".rjust(10) + "median [ms]".rjust(13) + "modules".rjust(9) + "  backends")
+    for module in args.modules:
+        result = measureImport(module, args.repeat)
+        backends = ", ".join(result["backends"])
+        if backends == "":
+            backends = "-"
+        else:
+            status = 1
+        print(module.ljust(42) +
+              format(min(result["times"])*1000, ".2f").rjust(10) +
+              format(statistics.median(result["times"])*1000, ".2f").rjust(13) +
+              str(result["modules"]).rjust(9) + "  " + backends)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
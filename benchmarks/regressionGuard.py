@@ -0,0 +1,361 @@
+"""
+Benchmark regression guard of the structure analysis and the report generation
+
+The timings and the peak memory of a fixed set of example and generated models are stored as baselines,
+and a new run is compared against them:
+a timing fails if its median is slower than the baseline by more than the tolerance
+and the slowdown is significant by the one-sided Mann-Whitney U test,
+the timings are compared in units of a fixed reference workload timed right before each sample,
+so the drift of the machine speed between and during the runs is cancelled,
+the peak memory fails if it is larger than the baseline by more than the memory tolerance
+
+Usage: python benchmarks/regressionGuard.py            compare against benchmarks/baselines.json
+       python benchmarks/regressionGuard.py --update   store a new baseline
+"""
+
+import argparse
+import datetime
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from directStiffnessMethod import structureGenerator
+from directStiffnessMethod.analysis import Analysis
+from directStiffnessMethod.pdfReport import PdfReport
+from directStiffnessMethod.structureFile import StructureFile
+
+
+BASELINE_FILE = os.path.join(ROOT, "benchmarks", "baselines.json")
+
+# fixed set of models: [name, "example" or generator name, file name or arguments]
+CASES = [["frame", "example", "frame.txt"],
+         ["frame2", "example", "frame2.txt"],
+         ["frame_truss", "example", "frame_truss.txt"],
+         ["truss1", "example", "truss1.txt"],
+         ["beam1", "example", "beam1.txt"],
+         ["portal2x3", "generatePortalFrame", [2, 3]],
+         ["pratt8", "generateTruss", [8, "pratt"]],
+         ["beam12", "generateContinuousBeam", [12]],
+         ["lattice4x1", "generateRandomLattice", [4, 1, 3000, 0.2, 1]]]
+
+# benchmarks of each model
+METRICS = ["analysis", "report"]
+
+
+def loadCase(case):
+    """
+    Load the structure data of a model
+
+    :param case: [name, source, file name or arguments]
+    :return: [structure data, unit]
+    """
+    name, source, argument = case
+    if source == "example":
+        data = StructureFile().read(os.path.join(ROOT, "exampleStructures", argument))
+        return [data["structureData"], data["unit"]]
+    return [getattr(structureGenerator, source)(*argument), None]
+
+
+def runAnalysis(structureData, unit):
+    """
+    Build and analyse a model, the result includes the packed result and the result text
+
+    :param structureData: structure data of the model
+    :param unit: unit of the model
+    :return: the analysed structure
+    """
+    structure = StructureFile().buildStructure(structureData, unit)
+    Analysis(structure, unit).analyse()
+    return structure
+
+
+def runReport(structure):
+    """
+    Generate the report of an analysed model
+    Without the report backend only the tables of the report are collected
+
+    :param structure: analysed structure
+    """
+    report = PdfReport(structure)
+    data = report.getData()
+    try:
+        import reportlab
+    except ImportError:
+        return
+    report.write(os.devnull, "benchmark", data)
+
+
+def referenceWorkload():
+    """
+    Fixed pure Python workload, independent of the analysis code, to measure the speed of the machine
+    """
+    matrix = []
+    for row in range(40):
+        matrix.append([(row*col) % 7 + 1.0 for col in range(40)])
+    result = 0
+    for row in range(40):
+        for col in range(40):
+            value = 0
+            for k in range(40):
+                value = value + matrix[row][k]*matrix[k][col]
+            result = result + value
+    return result
+
+
+def measure(function, repeat):
+    """
+    Time a function after one warm-up run, the reference workload is timed right before each sample
+
+    :param function: function to be timed
+    :param repeat: number of samples
+    :return: [list of time in seconds, list of reference time in seconds]
+    """
+    function()
+    referenceWorkload()
+    samples = []
+    references = []
+    for index in range(repeat):
+        start = time.perf_counter()
+        referenceWorkload()
+        middle = time.perf_counter()
+        function()
+        end = time.perf_counter()
+        references.append(middle - start)
+        samples.append(end - middle)
+    return [samples, references]
+
+
+def measurePeakMemory(function):
+    """
+    Measure the peak memory allocated by a function
+
+    :param function: function to be measured
+    :return: peak memory in bytes
+    """
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def runCases(repeat):
+    """
+    Run every benchmark of every model
+
+    :param repeat: number of samples of each timing
+    :return: dictionary of "case/metric" to {"samples", "median", "references", "peakMemory"},
+    "references" is the time of the reference workload measured before each sample
+    """
+    result = {}
+    for case in CASES:
+        structureData, unit = loadCase(case)
+        structure = runAnalysis(structureData, unit)
+        functions = {"analysis": lambda: runAnalysis(structureData, unit),
+                     "report": lambda: runReport(structure)}
+        for metric in METRICS:
+            samples, references = measure(functions[metric], repeat)
+            result[case[0] + "/" + metric] = {"samples": samples,
+                                              "median": statistics.median(samples),
+                                              "references": references,
+                                              "peakMemory": measurePeakMemory(functions[metric])}
+            print("    " + (case[0] + "/" + metric).ljust(28) + format(statistics.median(samples)*1000, ".3f") + " ms",
+                  flush=True)
+    return result
+
+
+def mannWhitneyU(baseline, new):
+    """
+    One-sided Mann-Whitney U test that the new samples are larger than the baseline samples,
+    by the normal approximation with the tie correction
+
+    :param baseline: list of baseline sample
+    :param new: list of new sample
+    :return: p-value
+    """
+    n1 = len(new)
+    n2 = len(baseline)
+    if n1 == 0 or n2 == 0:
+        return 1
+
+    values = []
+    for value in new:
+        values.append([value, 0])
+    for value in baseline:
+        values.append([value, 1])
+    values.sort(key=lambda item: item[0])
+
+    # average rank of the tied values
+    ranks = [0]*len(values)
+    ties = 0
+    index = 0
+    while index < len(values):
+        end = index
+        while end + 1 < len(values) and values[end + 1][0] == values[index][0]:
+            end = end + 1
+        for position in range(index, end + 1):
+            ranks[position] = (index + end)/2 + 1
+        count = end - index + 1
+        ties = ties + count**3 - count
+        index = end + 1
+
+    rankSum = 0
+    for position in range(len(values)):
+        if values[position][1] == 0:
+            rankSum = rankSum + ranks[position]
+    U = rankSum - n1*(n1 + 1)/2
+
+    n = n1 + n2
+    variance = n1*n2/12*((n + 1) - ties/(n*(n - 1)))
+    if variance <= 0:
+        return 1
+    z = (U - n1*n2/2 - 0.5)/math.sqrt(variance)
+    return 0.5*math.erfc(z/math.sqrt(2))
+
+
+def compare(baseline, current, tolerance, memoryTolerance, alpha):
+    """
+    Compare a new run against the baseline
+
+    :param baseline: "results" of the baseline file
+    :param current: result of runCases
+    :param tolerance: allowed relative slowdown of the median time
+    :param memoryTolerance: allowed relative increase of the peak memory
+    :param alpha: significance level of the slowdown
+    :return: list of [name, quantity, baseline, new, change, p-value, status]
+    """
+    report = []
+    for name in current:
+        if name not in baseline:
+            report.append([name, "time", None, current[name]["median"], None, None, "new"])
+            continue
+
+        old = baseline[name]
+        new = current[name]
+        oldSamples = []
+        for index in range(len(old["samples"])):
+            oldSamples.append(old["samples"][index]/old["references"][index])
+        newSamples = []
+        for index in range(len(new["samples"])):
+            newSamples.append(new["samples"][index]/new["references"][index])
+
+        change = statistics.median(newSamples)/statistics.median(oldSamples) - 1
+        p = mannWhitneyU(oldSamples, newSamples)
+        status = "pass"
+        if change > tolerance and p < alpha:
+            status = "FAIL"
+        elif change < -tolerance and mannWhitneyU(newSamples, oldSamples) < alpha:
+            status = "faster"
+        report.append([name, "time", old["median"], new["median"], change, p, status])
+
+        change = 0
+        if old["peakMemory"] > 0:
+            change = new["peakMemory"]/old["peakMemory"] - 1
+        status = "pass"
+        if change > memoryTolerance:
+            status = "FAIL"
+        report.append([name, "memory", old["peakMemory"], new["peakMemory"], change, None, status])
+    return report
+
+
+def formatReport(report):
+    """
+    Convert the comparison into a printable table
+
+    :param report: result of compare
+    :return: the table string
+    """
+    result = "case".ljust(28) + "quantity".ljust(10) + "baseline".rjust(14) + "new".rjust(14) + \
+             "change".rjust(10) + "p".rjust(9) + "  status\n"
+    for name, quantity, old, new, change, p, status in report:
+        if quantity == "time":
+            oldText = "-" if old == None else format(old*1000, ".3f") + " ms"
+            newText = format(new*1000, ".3f") + " ms"
+        else:
+            oldText = format(old/1024, ".1f") + " kB"
+            newText = format(new/1024, ".1f") + " kB"
+        changeText = "-" if change == None else format(change*100, "+.1f") + "%"
+        pText = "-" if p == None else format(p, ".4f")
+        result = result + name.ljust(28) + quantity.ljust(10) + oldText.rjust(14) + newText.rjust(14) + \
+                 changeText.rjust(10) + pText.rjust(9) + "  " + status + "\n"
+    return result
+
+
+def main(argv=None):
+    """
+    Run the regression guard
+
+    :param argv: list of argument, the arguments of the command line are used if None
+    :return: exit status, 1 if any benchmark fails
+    """
+    parser = argparse.ArgumentParser(description="Benchmark regression guard of the analysis and the report")
+    parser.add_argument("--update", action="store_true", help="store the run as the new baseline")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="path of the baseline file")
+    parser.add_argument("--repeat", type=int, default=7, help="number of samples of each timing")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed relative slowdown of the median time")
+    parser.add_argument("--memory-tolerance", type=float, default=0.05, help="allowed relative increase of the peak memory")
+    parser.add_argument("--alpha", type=float, default=0.01, help="significance level of the slowdown")
+    parser.add_argument("--report", default=None, help="path of the JSON report of the comparison")
+    args = parser.parse_args(argv)
+
+    print("Running " + str(len(CASES)) + " models x " + str(len(METRICS)) + " benchmarks")
+    current = runCases(args.repeat)
+
+    if args.update:
+        data = {"timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "repeat": args.repeat,
+                "results": current}
+        fd = open(args.baseline, "w")
+        try:
+            json.dump(data, fd, indent=2)
+        finally:
+            fd.close()
+        print("Baseline is stored in " + args.baseline)
+        return 0
+
+    if not os.path.isfile(args.baseline):
+        print("No baseline is found, run with --update first")
+        return 1
+    fd = open(args.baseline, "r")
+    try:
+        baseline = json.load(fd)
+    finally:
+        fd.close()
+    if baseline["python"] != platform.python_version() or baseline["platform"] != platform.platform():
+        print("Warning: the baseline is recorded on Python " + baseline["python"] + ", " + baseline["platform"])
+
+    report = compare(baseline["results"], current, args.tolerance, args.memory_tolerance, args.alpha)
+    print("")
+    print(formatReport(report))
+
+    failed = 0
+    for item in report:
+        if item[6] == "FAIL":
+            failed = failed + 1
+    if args.report != None:
+        fd = open(args.report, "w")
+        try:
+            json.dump({"failed": failed, "comparison": report}, fd, indent=2)
+        finally:
+            fd.close()
+
+    if failed > 0:
+        print(str(failed) + " benchmarks FAILED")
+        return 1
+    print("All benchmarks passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+"""
+Scaling benchmark of the assembly, solve and result recovery
+
+Each phase is timed separately on generated models from 10 to 10^5 DOFs,
+the empirical complexity t = c*n^k of each phase is fitted over the number of free DOFs n,
+and the result is written as JSON to be tracked release over release
+A phase is skipped for the larger models once its fitted time is over the time budget
+
+Usage: python benchmarks/scalingBenchmark.py [--family frame] [--budget 60] [-o results/scaling.json]
+"""
+
+import argparse
+import datetime
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from directStiffnessMethod import structureGenerator
+from directStiffnessMethod.pdfReport import PdfReport
+
+
+# target number of free DOFs of the generated models
+SIZES = [10, 30, 100, 300, 1000, 3000, 10000, 30000, 100000]
+
+# timed phases, in the order they are run on each model
+PHASES = ["getGlobalStiffness", "getKff", "getrf", "getRs", "packAllResult", "getAllResult", "pdf"]
+
+FAMILIES = ["frame", "truss", "beam", "lattice"]
+
+
+def generateModel(family, dofs):
+    """
+    Generate a model of a family with about the required number of free DOFs
+
+    :param family: "frame", "truss", "beam" or "lattice"
+    :param dofs: required number of free DOFs
+    :return: structure data
+    """
+    if family == "frame":
+        # 3 free DOFs for each node above the fixed bases, bays = storeys = k
+        k = max(1, int(round((-1 + math.sqrt(1 + 4*dofs/3))/2)))
+        return structureGenerator.generatePortalFrame(k, k)
+    elif family == "truss":
+        return structureGenerator.generateTruss(max(2, int(round((dofs + 3)/4))), "pratt")
+    elif family == "beam":
+        return structureGenerator.generateContinuousBeam(max(1, dofs - 1))
+    elif family == "lattice":
+        # columns = 4 x rows, about 2 free DOFs for each node
+        rows = max(1, int(round((math.sqrt(dofs/2) - 1)/2)))
+        return structureGenerator.generateRandomLattice(4*rows, rows, seed=1)
+    raise Exception('Unknown family ' + str(family) + '!')
+
+
+def fitComplexity(points):
+    """
+    Fit t = c*n^k by the least squares on log(t) = log(c) + k*log(n)
+
+    :param points: list of [n, t]
+    :return: dictionary of "exponent" and "coefficient", None if there are less than two points
+    """
+    data = []
+    for n, t in points:
+        if n > 0 and t != None and t > 0:
+            data.append([math.log(n), math.log(t)])
+    if len(data) < 2:
+        return None
+
+    meanX = sum(item[0] for item in data)/len(data)
+    meanY = sum(item[1] for item in data)/len(data)
+    sxx = sum((item[0] - meanX)**2 for item in data)
+    if sxx == 0:
+        return None
+    sxy = sum((item[0] - meanX)*(item[1] - meanY) for item in data)
+    exponent = sxy/sxx
+    return {"exponent": exponent, "coefficient": math.exp(meanY - exponent*meanX)}
+
+
+def predictTime(fit, n):
+    """
+    Predict the time of a phase from its fit
+
+    :param fit: result of fitComplexity
+    :param n: number of free DOFs
+    :return: predicted time in seconds, 0 if there is no fit
+    """
+    if fit == None:
+        return 0
+    return fit["coefficient"]*(n**fit["exponent"])
+
+
+def timePhase(function, repeat):
+    """
+    Time a phase, the fastest run is taken and a slow phase is only run once
+
+    :param function: function of the phase
+    :param repeat: maximum number of runs
+    :return: [time in seconds, result of the last run]
+    """
+    best = None
+    result = None
+    for index in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        if best == None or elapsed < best:
+            best = elapsed
+        if elapsed > 1:
+            break
+    return [best, result]
+
+
+def runModel(structure, skipped, repeat, pdfDirectory):
+    """
+    Time every phase of a model
+
+    :param structure: structure of the model
+    :param skipped: list of phase that is not run
+    :param repeat: maximum number of runs of each phase
+    :param pdfDirectory: directory of the generated PDF
+    :return: dictionary of phase to time in seconds (None if skipped), and "pdfRenderer"
+    """
+    timing = {}
+    for phase in PHASES:
+        timing[phase] = None
+
+    if "getGlobalStiffness" not in skipped:
+        timing["getGlobalStiffness"] = timePhase(structure.getGlobalStiffness, repeat)[0]
+    if "getKff" not in skipped:
+        timing["getKff"] = timePhase(structure.getKff, repeat)[0]
+
+    # the recovery phases reuse rf, so they are only run after the solve
+    if "getrf" in skipped:
+        return timing
+    timing["getrf"], rf = timePhase(structure.getrf, repeat)
+
+    if "getRs" not in skipped:
+        timing["getRs"] = timePhase(lambda: structure.getRs(rf), repeat)[0]
+    if "packAllResult" not in skipped:
+        timing["packAllResult"] = timePhase(lambda: structure.packAllResult(rf), repeat)[0]
+    if "getAllResult" not in skipped:
+        timing["getAllResult"] = timePhase(lambda: structure.getAllResult(rf), repeat)[0]
+
+    if "pdf" not in skipped:
+        report = PdfReport(structure)
+        try:
+            import reportlab
+            filename = os.path.join(pdfDirectory, "report.pdf")
+            timing["pdf"] = timePhase(lambda: report.write(filename, "benchmark"), repeat)[0]
+            timing["pdfRenderer"] = "reportlab"
+        except ImportError:
+            # only the tables of the report are collected without the report backend
+            timing["pdf"] = timePhase(report.getData, repeat)[0]
+            timing["pdfRenderer"] = "none"
+    return timing
+
+
+def runBenchmark(family, sizes, budget, repeat):
+    """
+    Run the benchmark of a family
+
+    :param family: family of the generated models
+    :param sizes: list of target number of free DOFs
+    :param budget: time budget of a phase on one model in seconds
+    :param repeat: maximum number of runs of each phase
+    :return: dictionary of "family", "budget", "models" and "fit"
+    """
+    result = {"family": family, "budget": budget, "models": [], "fit": {}}
+    points = {}
+    for phase in PHASES:
+        points[phase] = []
+
+    pdfDirectory = tempfile.mkdtemp()
+    for size in sizes:
+        skipped = []
+        for phase in PHASES:
+            if predictTime(fitComplexity(points[phase]), size) > budget:
+                skipped.append(phase)
+        if len(skipped) == len(PHASES):
+            # the model is not even generated when no phase fits in the budget
+            result["models"].append({"targetDofs": size, "dofs": None, "phases": dict.fromkeys(PHASES),
+                                     "skipped": skipped})
+            continue
+
+        structureData = generateModel(family, size)
+        start = time.perf_counter()
+        structure = structureGenerator.createStructure(structureData)
+        build = time.perf_counter() - start
+        n = len(structure.getFreeNodalIndex())
+
+        timing = runModel(structure, skipped, repeat, pdfDirectory)
+        model = {"targetDofs": size, "dofs": n, "nodes": len(structureData["node"]),
+                 "members": len(structureData["member"]), "build": build, "phases": {}, "skipped": skipped}
+        for phase in PHASES:
+            model["phases"][phase] = timing[phase]
+            if timing[phase] != None:
+                points[phase].append([n, timing[phase]])
+            elif phase not in skipped:
+                skipped.append(phase)
+        if "pdfRenderer" in timing:
+            model["pdfRenderer"] = timing["pdfRenderer"]
+        result["models"].append(model)
+
+        line = family + " n=" + str(n)
+        for phase in PHASES:
+            if timing[phase] != None:
+                line = line + " " + phase + "=" + format(timing[phase], ".4f") + "s"
+        print(line, flush=True)
+
+    for phase in PHASES:
+        result["fit"][phase] = fitComplexity(points[phase])
+    return result
+
+
+def main(argv=None):
+    """
+    Run the benchmark and write the JSON result
+
+    :param argv: list of argument, the arguments of the command line are used if None
+    :return: exit status
+    """
+    parser = argparse.ArgumentParser(description="Scaling benchmark of the assembly, solve and result recovery")
+    parser.add_argument("--family", nargs="+", default=["frame"], choices=FAMILIES, help="families of the generated models")
+    parser.add_argument("--sizes", nargs="+", type=int, default=SIZES, help="target number of free DOFs")
+    parser.add_argument("--budget", type=float, default=60, help="time budget of a phase on one model in seconds")
+    parser.add_argument("--repeat", type=int, default=3, help="maximum number of runs of each phase")
+    parser.add_argument("-o", "--output", default="results/scaling.json", help="path of the JSON result")
+    args = parser.parse_args(argv)
+
+    result = {"timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+              "python": platform.python_version(),
+              "platform": platform.platform(),
+              "benchmarks": []}
+    for family in args.family:
+        result["benchmarks"].append(runBenchmark(family, args.sizes, args.budget, args.repeat))
+
+    for benchmark in result["benchmarks"]:
+        print("")
+        print(benchmark["family"] + " empirical complexity t = c*n^k:")
+        for phase in PHASES:
+            fit = benchmark["fit"][phase]
+            if fit != None:
+                print("    " + phase.ljust(20) + "k = " + format(fit["exponent"], ".2f") +
+                      "    c = " + format(fit["coefficient"], ".3e"))
+
+    directory = os.path.dirname(args.output)
+    if directory != "" and not os.path.isdir(directory):
+        os.makedirs(directory)
+    fd = open(args.output, "w")
+    try:
+        json.dump(result, fd, indent=2)
+    finally:
+        fd.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
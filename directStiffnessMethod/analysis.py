@@ -0,0 +1,282 @@
+import os
+import time
+from directStiffnessMethod.structureFile import StructureFile
+from directStiffnessMethod.modelFile import ModelFile, isModelFile
+from directStiffnessMethod.resultQuery import ResultQuery
+from directStiffnessMethod.analysisResult import AnalysisResult
+from directStiffnessMethod.resultFile import ResultFile, getStructureHash
+
+
+class Analysis(object):
+    """
+    Analysis engine of the structure without the user interface
+    It reads the structure .txt or binary model file into a structure, analyses the structure and returns the result
+    """
+
+    def __init__(self, structure=None, unit=None, cache=None):
+        """
+        Initiating the analysis
+
+        :param structure: structure for analysis, it can be loaded from a file later if None
+        :param unit: required unit [force unit, length unit, decimal place], the unit of the structure is used if None
+        :param cache: analysis cache (see AnalysisCache), an identical model is not solved again, no cache if None
+        """
+        self._structure = structure
+        self._unit = unit
+        self._cache = cache
+        self._fileData = None
+        self._time = {}
+        self.clearResult()
+
+
+    def clearResult(self):
+        """
+        Forget the result of the last analysis, the analysis result and the query are built again from the next one
+        """
+        self._rf = None
+        self._Rs = None
+        self._resultFile = None
+        self._analysisResult = None
+        self._query = None
+
+
+    def load(self, filename):
+        """
+        Read the structure .txt file or the binary model file (see ModelFile) and build the structure
+
+        :param filename: path of the .txt or .i2d file
+        :return: dictionary of "origin", "unit", "scaling" and "structureData" of the file
+        """
+        if isModelFile(filename):
+            start = time.perf_counter()
+            fileData = ModelFile().read(filename)
+            self._time["parse"] = time.perf_counter() - start
+            return self.loadFileData(fileData)
+
+        fd = open(filename, "r")
+        try:
+            return self.loadLines(fd)
+        finally:
+            fd.close()
+
+
+    def loadLines(self, lines):
+        """
+        Read the lines of the structure .txt file and build the structure
+
+        :param lines: list or file of line string
+        :return: dictionary of "origin", "unit", "scaling" and "structureData" of the file
+        """
+        start = time.perf_counter()
+        fileData = StructureFile().readLines(lines)
+        self._time["parse"] = time.perf_counter() - start
+        return self.loadFileData(fileData)
+
+
+    def loadFileData(self, fileData):
+        """
+        Build the structure from the data of a read file
+
+        :param fileData: dictionary of "origin", "unit", "scaling" and "structureData"
+        :return: the file data
+        """
+        start = time.perf_counter()
+        self._fileData = fileData
+        self._unit = fileData["unit"]
+        self._structure = StructureFile().buildStructure(fileData["structureData"], self._unit)
+        self._time["build"] = time.perf_counter() - start
+        return self._fileData
+
+
+    def getStructure(self):
+        """
+        Return the structure of the analysis
+
+        :return: the structure
+        """
+        return self._structure
+
+
+    def getFileData(self):
+        """
+        Return the data of the loaded file
+
+        :return: dictionary of "origin", "unit", "scaling" and "structureData", None if no file is loaded
+        """
+        return self._fileData
+
+
+    def getTime(self):
+        """
+        Return the time of each phase of the last load and analysis
+
+        :return: dictionary of "parse", "build", "solve" and "result" to time in seconds
+        """
+        return self._time
+
+
+    def getUnit(self):
+        """
+        Return the unit of the analysis
+
+        :return: [force unit, length unit, decimal place]
+        """
+        return self._unit
+
+
+    def setUnit(self, unit):
+        """
+        Change the unit of the analysis
+
+        :param unit: [force unit, length unit, decimal place]
+        """
+        self._unit = unit
+
+
+    def analyse(self):
+        """
+        Analyse the structure, the structure is only solved once for all the result
+
+        :return: dictionary of the packed result (see Structure.packAllResult) and "report" (the result text),
+        the arrays of the result and the result query are returned by getAnalysisResult and getQuery
+        """
+        if self._structure == None:
+            raise Exception('No structure is loaded!')
+
+        structure = self._structure
+        if self._unit != None:
+            structure.changeUnit(self._unit)
+        self.clearResult()
+
+        if self._cache != None:
+            start = time.perf_counter()
+            modelHash = self.getModelHash()
+            resultFile = self._cache.get(modelHash)
+            if resultFile != None:
+                result = resultFile.load(structure)
+                self._resultFile = resultFile
+                self._time["solve"] = 0
+                self._time["result"] = time.perf_counter() - start
+                return result
+
+        start = time.perf_counter()
+        rf = structure.getrf()
+        self._time["solve"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        Rs = structure.getRs(rf)
+        result = structure.packAllResult(rf, Rs)
+        result["report"] = structure.getAllResult(rf, Rs)
+        self._rf = rf
+        self._Rs = Rs
+        self._time["result"] = time.perf_counter() - start
+
+        if self._cache != None:
+            self._cache.put(modelHash, result["report"], self.getAnalysisResult(), self.getQuery())
+        return result
+
+
+    def getAnalysisResult(self):
+        """
+        Return the arrays of the result of the last analysis by node and member (see AnalysisResult),
+        they are built at the first call, from the solved displacement or the reloaded result
+
+        :return: the analysis result
+        """
+        if self._analysisResult == None:
+            if self._resultFile != None:
+                self._analysisResult = self._resultFile.getAnalysisResult()
+            elif self._rf != None:
+                self._analysisResult = AnalysisResult(self._structure, self._rf, self._Rs)
+            else:
+                raise Exception('No structure is analysed!')
+        return self._analysisResult
+
+
+    def getQuery(self):
+        """
+        Return the result query of every member of the last analysis (see ResultQuery), it is built at the first call,
+        from the solved displacement or the reloaded result
+
+        :return: the result query
+        """
+        if self._query == None:
+            if self._resultFile != None:
+                self._query = ResultQuery(self._structure, resultFile=self._resultFile)
+            elif self._rf != None:
+                self._query = ResultQuery(self._structure, self._rf)
+            else:
+                raise Exception('No structure is analysed!')
+        return self._query
+
+
+    def getModelHash(self):
+        """
+        Return the canonical hash of the structure and the unit of the analysis (see getStructureHash)
+
+        :return: SHA-256 hex string
+        """
+        if self._structure == None:
+            raise Exception('No structure is loaded!')
+        unit = self._unit
+        if unit == None:
+            unit = self._structure.getUnit()
+        return getStructureHash(self._structure, unit)
+
+
+    def saveResult(self, result, filename):
+        """
+        Save the result of the last analysis into the binary result file, usually next to the structure file
+
+        :param result: result of analyse or loadResult
+        :param filename: path of the .res file
+        """
+        ResultFile().write(filename, self.getModelHash(), result["report"], self.getAnalysisResult(),
+                           self.getQuery())
+
+
+    def loadResult(self, filename):
+        """
+        Reload the saved result of the structure without solving it
+        The result is not used if the file is missing, unreadable or saved for another model or unit
+
+        :param filename: path of the .res file
+        :return: dictionary of the result (see ResultFile.load), None if there is no valid saved result
+        """
+        if self._structure == None:
+            raise Exception('No structure is loaded!')
+        if not os.path.isfile(filename):
+            return None
+
+        start = time.perf_counter()
+        resultFile = ResultFile()
+        try:
+            modelHash = resultFile.open(filename)
+        except Exception:
+            return None
+        if modelHash != self.getModelHash():
+            return None
+        result = resultFile.load(self._structure)
+        self.clearResult()
+        self._resultFile = resultFile
+        self._time["result"] = time.perf_counter() - start
+        return result
+
+
+    def analyseFile(self, filename):
+        """
+        Read the structure .txt or .i2d file and analyse the structure
+
+        :param filename: path of the .txt or .i2d file
+        :return: the result of analyse
+        """
+        self.load(filename)
+        return self.analyse()
+
+
+# testing only
+"""
+analysis = Analysis()
+result = analysis.analyseFile("exampleStructures/frame.txt")
+print(result["report"])
+"""
@@ -0,0 +1,187 @@
+import os
+from directStiffnessMethod.resultFile import ResultFile
+
+
+# default limit of the total size of the cache in bytes
+MAX_SIZE = 256*1024*1024
+
+
+class AnalysisCache(object):
+    """
+    Content-addressed cache of the analysis results on the disk
+    Each result is a result file named by the canonical hash of its model (see getStructureHash),
+    so an identical model is not solved again, even in another process or another run
+    The least recently used results are removed when the total size exceeds the limit,
+    the time of the last use is the modification time of the file
+    """
+
+    def __init__(self, directory, maxSize=MAX_SIZE, evictOnPut=True):
+        """
+        Initiating the analysis cache
+
+        :param directory: directory of the cached result files, it is created if it does not exist
+        :param maxSize: limit of the total size of the cached result files in bytes
+        :param evictOnPut: remove the least recently used results after each put, which scans the directory,
+        if False evict is called by the owner, for example once at the end of a batch
+        """
+        self._directory = directory
+        self._maxSize = maxSize
+        self._evictOnPut = evictOnPut
+        self._statistics = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        if not os.path.isdir(directory):
+            os.makedirs(directory, exist_ok=True)
+
+
+    def getFilename(self, modelHash):
+        """
+        Return the path of the cached result of a model
+
+        :param modelHash: hash of the model
+        :return: path of the .res file
+        """
+        return os.path.join(self._directory, modelHash + ".res")
+
+
+    def get(self, modelHash):
+        """
+        Return the cached result of a model and mark it as recently used
+
+        :param modelHash: hash of the model
+        :return: the opened result file (see ResultFile), None if the model is not cached
+        """
+        filename = self.getFilename(modelHash)
+        resultFile = ResultFile()
+        try:
+            storedHash = resultFile.open(filename)
+        except Exception:
+            storedHash = None
+        if storedHash != modelHash:
+            self._statistics["misses"] = self._statistics["misses"] + 1
+            return None
+
+        try:
+            os.utime(filename)
+        except OSError:
+            # it is removed by another process, the opened file can still be read
+            pass
+        self._statistics["hits"] = self._statistics["hits"] + 1
+        return resultFile
+
+
+    def put(self, modelHash, report, analysisResult, query):
+        """
+        Store the result of a model, the least recently used results are removed if the cache is full,
+        unless the eviction is left to the owner (see evictOnPut)
+
+        :param modelHash: hash of the model
+        :param report: the result text
+        :param analysisResult: the arrays of the result (see Analysis.getAnalysisResult)
+        :param query: the result query (see Analysis.getQuery)
+        """
+        ResultFile().write(self.getFilename(modelHash), modelHash, report, analysisResult, query)
+        self._statistics["stores"] = self._statistics["stores"] + 1
+        if self._evictOnPut:
+            self.evict()
+
+
+    def getEntries(self):
+        """
+        Return the cached result files from the least recently used
+
+        :return: list of [path, size in bytes, time of the last use]
+        """
+        result = []
+        for entry in os.scandir(self._directory):
+            if not entry.name.endswith(".res"):
+                continue
+            try:
+                information = entry.stat()
+            except OSError:
+                continue
+            result.append([entry.path, information.st_size, information.st_mtime])
+        result.sort(key=lambda item: item[2])
+        return result
+
+
+    def getSize(self):
+        """
+        Return the total size of the cached result files
+
+        :return: size in bytes
+        """
+        size = 0
+        for path, fileSize, lastUse in self.getEntries():
+            size = size + fileSize
+        return size
+
+
+    def evict(self):
+        """
+        Remove the least recently used results until the total size is within the limit
+
+        :return: number of removed results
+        """
+        entries = self.getEntries()
+        size = 0
+        for path, fileSize, lastUse in entries:
+            size = size + fileSize
+
+        removed = 0
+        for path, fileSize, lastUse in entries:
+            if size <= self._maxSize:
+                break
+            try:
+                os.remove(path)
+                removed = removed + 1
+            except OSError:
+                # it is removed by another process
+                pass
+            size = size - fileSize
+        self._statistics["evictions"] = self._statistics["evictions"] + removed
+        return removed
+
+
+    def clear(self):
+        """
+        Remove every cached result
+        """
+        for path, fileSize, lastUse in self.getEntries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+    def getStatistics(self, scan=True):
+        """
+        Return the statistics of the cache since it is created
+
+        :param scan: count the entries and the size, it scans the directory
+        :return: dictionary of "hits", "misses", "stores", "evictions", "hitRate", "entries" and "size" (bytes),
+        without "entries" and "size" if scan is False
+        """
+        result = dict(self._statistics)
+        lookups = result["hits"] + result["misses"]
+        result["hitRate"] = 0
+        if lookups > 0:
+            result["hitRate"] = result["hits"]/lookups
+        if not scan:
+            return result
+        entries = self.getEntries()
+        result["entries"] = len(entries)
+        result["size"] = 0
+        for path, fileSize, lastUse in entries:
+            result["size"] = result["size"] + fileSize
+        return result
+
+
+# testing only
+"""
+from directStiffnessMethod.analysis import Analysis
+
+cache = AnalysisCache("results/cache")
+for repeat in range(3):
+    analysis = Analysis(cache=cache)
+    analysis.analyseFile("exampleStructures/frame.txt")
+print(cache.getStatistics())
+"""
@@ -0,0 +1,371 @@
+from array import array
+
+
+# arrays of the result, they are saved and restored by name
+ARRAYS = ["rf", "Rs", "nodeIds", "coordinates", "displacement", "reaction", "state",
+          "memberIds", "memberNodes", "memberLength", "memberForce"]
+
+# state of each component of a node
+NO_DOF = 0
+FREE = 1
+RESTRAINED = 2
+
+
+class AnalysisResult(object):
+    """
+    Result of the analysis of the structure indexed by node and component
+    Every node has 3 components (u, v, θ) in the displacement and the reaction arrays,
+    and every member has 6 local end forces [Fx_i, Fy_i, M_i, Fx_j, Fy_j, M_j] in the member force matrix,
+    a component which is not a degree of freedom of the node is 0
+    """
+
+    def __init__(self, structure=None, rf=None, Rs=None, arrays=None):
+        """
+        Initiating the analysis result
+
+        :param structure: analysed structure
+        :param rf: result of getrf, it is calculated if None
+        :param Rs: result of getRs, it is calculated if None
+        :param arrays: dictionary of the name in ARRAYS to the saved array (see getArrays),
+        the result is restored from the arrays without the structure if not None
+        """
+        self._nodeIndex = None
+        self._memberIndex = None
+        if arrays != None:
+            for name in ARRAYS:
+                setattr(self, "_" + name, arrays[name])
+            return
+
+        if rf == None:
+            rf = structure.getrf()
+        if Rs == None:
+            Rs = structure.getRs(rf)
+        self._rf = array("d", [row[0] for row in rf])
+        self._Rs = array("d", [row[0] for row in Rs])
+
+        nodes = {}
+        for node in structure.getNodes():
+            nodes[node.getID()] = node
+        dofMap = structure.getDofMap()
+
+        self._nodeIds = array("q", sorted(dofMap))
+        self._coordinates = array("d", [0.0])*(2*len(self._nodeIds))
+        self._displacement = array("d", [0.0])*(3*len(self._nodeIds))
+        self._reaction = array("d", [0.0])*(3*len(self._nodeIds))
+        self._state = array("b", [NO_DOF])*(3*len(self._nodeIds))
+
+        # the free components take rf and the restrained components take Rs in the order of the numbering,
+        # r is the nodal displacement of the structure in the same order for the member forces
+        r = []
+        freeIndex = 0
+        supportIndex = 0
+        for index in range(len(self._nodeIds)):
+            nodeId = self._nodeIds[index]
+            node = nodes[nodeId]
+            self._coordinates[2*index] = node.getx()
+            self._coordinates[2*index + 1] = node.gety()
+
+            nodalDisplacement = node.getNodalDisplacement()
+            for component in dofMap[nodeId][1]:
+                position = 3*index + component
+                if isinstance(nodalDisplacement[component], str):
+                    self._state[position] = FREE
+                    self._displacement[position] = rf[freeIndex][0]
+                    freeIndex = freeIndex + 1
+                else:
+                    self._state[position] = RESTRAINED
+                    self._displacement[position] = nodalDisplacement[component]
+                    self._reaction[position] = Rs[supportIndex][0]
+                    supportIndex = supportIndex + 1
+                r.append(self._displacement[position])
+
+        # member end forces in the local axes, a truss member only has the axial force
+        memberForce = structure.getAllMemberForce(r)
+
+        self._memberIds = array("q")
+        self._memberNodes = array("q")
+        self._memberLength = array("d")
+        self._memberForce = array("d")
+        for member in structure.getMembers():
+            self._memberIds.append(member.getId())
+            self._memberNodes.extend(member.get_ij())
+            self._memberLength.append(member.getL())
+
+            force = memberForce[member.getId()]
+            if member.getType() == "truss":
+                self._memberForce.extend([-force, 0, 0, force, 0, 0])
+            elif member.getType() == "beam":
+                self._memberForce.extend([0, force[0][0], force[1][0], 0, force[2][0], force[3][0]])
+            else:
+                self._memberForce.extend([force[index][0] for index in range(6)])
+
+
+    def getArrays(self):
+        """
+        Return every array of the result for saving
+
+        :return: dictionary of the name in ARRAYS to the array
+        """
+        result = {}
+        for name in ARRAYS:
+            result[name] = getattr(self, "_" + name)
+        return result
+
+
+    def getNodeIds(self):
+        """
+        Return the nodal IDs in the order of the arrays
+
+        :return: array of nodal ID
+        """
+        return self._nodeIds
+
+
+    def getMemberIds(self):
+        """
+        Return the member IDs in the order of the member force matrix
+
+        :return: array of member ID
+        """
+        return self._memberIds
+
+
+    def getNodeIndex(self, nodeId):
+        """
+        Return the position of a node in the arrays, the index is built at the first lookup
+
+        :param nodeId: nodal ID
+        :return: index of the node
+        """
+        if self._nodeIndex == None:
+            self._nodeIndex = {}
+            for index in range(len(self._nodeIds)):
+                self._nodeIndex[self._nodeIds[index]] = index
+        if nodeId not in self._nodeIndex:
+            raise Exception('Node ' + str(nodeId) + ' is not found!')
+        return self._nodeIndex[nodeId]
+
+
+    def getMemberIndex(self, memberId):
+        """
+        Return the position of a member in the member force matrix, the index is built at the first lookup
+
+        :param memberId: member ID
+        :return: index of the member
+        """
+        if self._memberIndex == None:
+            self._memberIndex = {}
+            for index in range(len(self._memberIds)):
+                self._memberIndex[self._memberIds[index]] = index
+        if memberId not in self._memberIndex:
+            raise Exception('Member ' + str(memberId) + ' is not found!')
+        return self._memberIndex[memberId]
+
+
+    def getrf(self):
+        """
+        Return the free nodal displacements in the order of the numbering
+
+        :return: array of displacement
+        """
+        return self._rf
+
+
+    def getRs(self):
+        """
+        Return the support reactions in the order of the numbering
+
+        :return: array of reaction force
+        """
+        return self._Rs
+
+
+    def getCoordinate(self, nodeId):
+        """
+        Return the coordinate of a node
+
+        :param nodeId: nodal ID
+        :return: [x, y]
+        """
+        index = self.getNodeIndex(nodeId)
+        return [self._coordinates[2*index], self._coordinates[2*index + 1]]
+
+
+    def getDeflectedCoordinate(self, nodeId):
+        """
+        Return the coordinate of a node after the displacement
+
+        :param nodeId: nodal ID
+        :return: [x + u, y + v]
+        """
+        index = self.getNodeIndex(nodeId)
+        return [self._coordinates[2*index] + self._displacement[3*index],
+                self._coordinates[2*index + 1] + self._displacement[3*index + 1]]
+
+
+    def getState(self, nodeId, component):
+        """
+        Return the state of a component of a node
+
+        :param nodeId: nodal ID
+        :param component: 0 for x, 1 for y, 2 for θ
+        :return: NO_DOF, FREE or RESTRAINED
+        """
+        return self._state[3*self.getNodeIndex(nodeId) + component]
+
+
+    def isFree(self, nodeId, component):
+        """
+        Check whether a component of a node is a free degree of freedom
+
+        :param nodeId: nodal ID
+        :param component: 0 for x, 1 for y, 2 for θ
+        :return: True if it is free
+        """
+        return self.getState(nodeId, component) == FREE
+
+
+    def isRestrained(self, nodeId, component):
+        """
+        Check whether a component of a node is a restrained degree of freedom with a reaction force
+
+        :param nodeId: nodal ID
+        :param component: 0 for x, 1 for y, 2 for θ
+        :return: True if it is restrained
+        """
+        return self.getState(nodeId, component) == RESTRAINED
+
+
+    def getDisplacement(self, nodeId):
+        """
+        Return the displacement of a node, the settlement is included at a support
+
+        :param nodeId: nodal ID
+        :return: [u, v, θ]
+        """
+        index = 3*self.getNodeIndex(nodeId)
+        return list(self._displacement[index:index + 3])
+
+
+    def getDisplacementArray(self):
+        """
+        Return the displacement of all the nodes
+
+        :return: array of [u, v, θ] of each node in the order of getNodeIds
+        """
+        return self._displacement
+
+
+    def getReaction(self, nodeId):
+        """
+        Return the reaction force of a node, 0 for a component which is not restrained
+
+        :param nodeId: nodal ID
+        :return: [Fx, Fy, M]
+        """
+        index = 3*self.getNodeIndex(nodeId)
+        return list(self._reaction[index:index + 3])
+
+
+    def getReactionArray(self):
+        """
+        Return the reaction force of all the nodes
+
+        :return: array of [Fx, Fy, M] of each node in the order of getNodeIds
+        """
+        return self._reaction
+
+
+    def getStateArray(self):
+        """
+        Return the state of every component of all the nodes
+
+        :return: array of NO_DOF, FREE or RESTRAINED of each component in the order of getNodeIds
+        """
+        return self._state
+
+
+    def getMemberNodes(self, memberId):
+        """
+        Return the nodes at the both ends of a member
+
+        :param memberId: member ID
+        :return: [node i, node j]
+        """
+        index = self.getMemberIndex(memberId)
+        return [self._memberNodes[2*index], self._memberNodes[2*index + 1]]
+
+
+    def getMemberLength(self, memberId):
+        """
+        Return the length of a member
+
+        :param memberId: member ID
+        :return: length
+        """
+        return self._memberLength[self.getMemberIndex(memberId)]
+
+
+    def getMemberForce(self, memberId):
+        """
+        Return the end forces of a member in the local axes
+
+        :param memberId: member ID
+        :return: [Fx_i, Fy_i, M_i, Fx_j, Fy_j, M_j]
+        """
+        index = 6*self.getMemberIndex(memberId)
+        return list(self._memberForce[index:index + 6])
+
+
+    def getMemberForceMatrix(self):
+        """
+        Return the end forces of all the members
+
+        :return: array of [Fx_i, Fy_i, M_i, Fx_j, Fy_j, M_j] of each member in the order of getMemberIds
+        """
+        return self._memberForce
+
+
+    def getAxialForce(self, memberId):
+        """
+        Return the axial force of a member
+
+        :param memberId: member ID
+        :return: axial force, tension is positive
+        """
+        index = 6*self.getMemberIndex(memberId)
+        axialForce = -self._memberForce[index]
+        if axialForce == 0:
+            # no negative zero
+            axialForce = 0
+        return axialForce
+
+
+    def getMaxDisplacement(self):
+        """
+        Return the free translational displacement with the maximum magnitude
+
+        :return: [nodal ID, component, displacement], [None, None, 0] if there is no free translation
+        """
+        result = [None, None, 0]
+        for index in range(len(self._nodeIds)):
+            for component in range(2):
+                position = 3*index + component
+                if self._state[position] == FREE and abs(self._displacement[position]) > abs(result[2]):
+                    result = [self._nodeIds[index], component, self._displacement[position]]
+        return result
+
+
+# testing only
+"""
+from directStiffnessMethod.structureFile import StructureFile
+
+structureFile = StructureFile()
+data = structureFile.read("exampleStructures/frame.txt")
+structure = structureFile.buildStructure(data["structureData"], data["unit"])
+result = AnalysisResult(structure)
+for nodeId in result.getNodeIds():
+    print(nodeId, result.getDisplacement(nodeId), result.getReaction(nodeId))
+for memberId in result.getMemberIds():
+    print(memberId, result.getMemberForce(memberId))
+"""
@@ -0,0 +1,285 @@
+import csv
+import glob
+import os
+import sys
+import time
+from directStiffnessMethod.analysis import Analysis
+from directStiffnessMethod.analysisCache import AnalysisCache, MAX_SIZE
+from directStiffnessMethod.modelFile import EXTENSION, isModelFile
+
+
+# time of each phase in the summary, in the order of the columns
+PHASES = ["read", "parse", "build", "solve", "result", "write"]
+
+
+# analysis cache of the worker process, it is shared by every file the worker analyses (see _initWorker)
+_workerCache = None
+
+
+def analyseFile(filename, resultFilename, cache=None):
+    """
+    Analyse a structure .txt or .i2d file and write the result text into the result file
+
+    :param filename: path of the structure .txt or .i2d file
+    :param resultFilename: path of the result file
+    :param cache: analysis cache (see AnalysisCache), it can be shared by many files, no cache if None
+    :return: [filename, node num, member num, max displacement, status, cache, time of each phase..., total time],
+    cache is "hit", "miss" or "" without the cache
+    """
+    start = time.perf_counter()
+    timing = {}
+    row = [filename, "", "", ""]
+    lookups = None
+    if cache != None:
+        lookups = cache.getStatistics(False)
+    try:
+        analysis = Analysis(cache=cache)
+        if isModelFile(filename):
+            # the binary model is memory-mapped, reading it is a part of the parse
+            analysis.load(filename)
+        else:
+            fd = open(filename, "r")
+            try:
+                lines = fd.read().split("\n")
+            finally:
+                fd.close()
+            timing["read"] = time.perf_counter() - start
+            analysis.loadLines(lines)
+        result = analysis.analyse()
+        timing.update(analysis.getTime())
+
+        writeStart = time.perf_counter()
+        fd = open(resultFilename, "w")
+        try:
+            fd.write(result["report"])
+        finally:
+            fd.close()
+        timing["write"] = time.perf_counter() - writeStart
+
+        structure = analysis.getStructure()
+        maxDisplacement = 0
+        for name, displacement, unit in result["nodalDisplacement"]:
+            if ("u" in name or "v" in name) and abs(displacement) > abs(maxDisplacement):
+                maxDisplacement = displacement
+        row = [filename, structure.getNodeNum(), len(structure.getMembers()), maxDisplacement, "ok"]
+    except Exception as error:
+        row.append("error: " + str(error))
+
+    cacheStatus = ""
+    if cache != None:
+        statistics = cache.getStatistics(False)
+        if statistics["hits"] > lookups["hits"]:
+            cacheStatus = "hit"
+        elif statistics["misses"] > lookups["misses"]:
+            cacheStatus = "miss"
+    row.append(cacheStatus)
+
+    for phase in PHASES:
+        row.append(timing.get(phase, ""))
+    row.append(time.perf_counter() - start)
+    return row
+
+
+def _initWorker(cacheDirectory, cacheSize):
+    """
+    Create the analysis cache of the worker process once for the whole batch
+    The cache does not evict at each put, the batch evicts once at the end (see BatchAnalysis.run)
+
+    :param cacheDirectory: directory of the analysis cache, no cache if None
+    :param cacheSize: limit of the total size of the analysis cache in bytes
+    """
+    global _workerCache
+    _workerCache = None
+    if cacheDirectory != None:
+        _workerCache = AnalysisCache(cacheDirectory, cacheSize, False)
+
+
+def _analyseWorkerFile(item):
+    """
+    Analyse a structure file inside the worker process
+
+    :param item: [filename, result filename]
+    :return: summary row of the file
+    """
+    return analyseFile(item[0], item[1], _workerCache)
+
+
+class BatchAnalysis(object):
+    """
+    Analysis of many structure .txt files across a process pool, without the user interface
+    Each structure gets a result file, and one summary .csv file records the time of each phase
+    With the analysis cache, a model which is already analysed in this or an earlier batch is not solved again
+    """
+
+    def __init__(self, paths, outputDir, cacheDirectory=None, cacheSize=MAX_SIZE):
+        """
+        Initiating the batch analysis
+
+        :param paths: list of structure .txt or .i2d file, directory of structure files or glob pattern
+        :param outputDir: directory of the result files and the summary
+        :param cacheDirectory: directory of the analysis cache shared by the workers, no cache if None
+        :param cacheSize: limit of the total size of the analysis cache in bytes
+        """
+        self._outputDir = outputDir
+        self._cacheDirectory = cacheDirectory
+        self._cacheSize = cacheSize
+        self._files = []
+        found = set()
+        for path in paths:
+            if os.path.isdir(path):
+                filenames = sorted(glob.glob(os.path.join(path, "*.txt")) + glob.glob(os.path.join(path, "*" + EXTENSION)))
+            elif os.path.isfile(path):
+                filenames = [path]
+            else:
+                filenames = sorted(glob.glob(path))
+            for filename in filenames:
+                if os.path.normpath(filename) not in found:
+                    found.add(os.path.normpath(filename))
+                    self._files.append(filename)
+
+        self._resultFiles = []
+        names = {}
+        for filename in self._files:
+            name = os.path.splitext(os.path.basename(filename))[0]
+            if name in names:
+                names[name] = names[name] + 1
+                name = name + "_" + str(names[name])
+            else:
+                names[name] = 0
+            self._resultFiles.append(os.path.join(outputDir, name + "_result.txt"))
+
+
+    def getFiles(self):
+        """
+        Return the structure files of the batch
+
+        :return: list of path
+        """
+        return self._files
+
+
+    def getHeader(self):
+        """
+        Return the header of the summary
+
+        :return: list of column name
+        """
+        header = ["file", "nodes", "members", "max displacement", "status", "cache"]
+        for phase in PHASES:
+            header.append(phase + " [s]")
+        header.append("total [s]")
+        return header
+
+
+    def run(self, maxWorkers=None, chunksize=None, summaryFilename=None):
+        """
+        Analyse every structure file across the process pool and write the summary .csv file
+        Each row is written as soon as its result is returned
+
+        :param maxWorkers: number of worker processes, all the cores are used if None
+        :param chunksize: number of files sent to a worker at a time, it is calculated if None
+        :param summaryFilename: path of the summary .csv file, "summary.csv" in the output directory if None
+        :return: dictionary of "count", "failed", "time" (wall time in seconds), "throughput" (models per second),
+        "hits", "misses" and "evictions" of the analysis cache
+        """
+        # the process pool is only loaded by the main process, not by the workers
+        from concurrent.futures import ProcessPoolExecutor
+
+        if summaryFilename == None:
+            summaryFilename = os.path.join(self._outputDir, "summary.csv")
+        if not os.path.isdir(self._outputDir):
+            os.makedirs(self._outputDir)
+
+        workers = maxWorkers
+        if workers == None:
+            workers = os.cpu_count() or 1
+        if chunksize == None:
+            chunksize = max(1, len(self._files)//(workers*4))
+
+        items = []
+        for index in range(len(self._files)):
+            items.append([self._files[index], self._resultFiles[index]])
+
+        # the cache is created before the workers, so they do not race to create its directory
+        cache = None
+        if self._cacheDirectory != None:
+            cache = AnalysisCache(self._cacheDirectory, self._cacheSize, False)
+
+        start = time.perf_counter()
+        count = 0
+        failed = 0
+        hits = 0
+        misses = 0
+        fd = open(summaryFilename, "w", newline="")
+        try:
+            writer = csv.writer(fd)
+            writer.writerow(self.getHeader())
+            with ProcessPoolExecutor(max_workers=maxWorkers, initializer=_initWorker,
+                                     initargs=(self._cacheDirectory, self._cacheSize)) as executor:
+                for row in executor.map(_analyseWorkerFile, items, chunksize=chunksize):
+                    writer.writerow(row)
+                    count = count + 1
+                    if row[4] != "ok":
+                        failed = failed + 1
+                    if row[5] == "hit":
+                        hits = hits + 1
+                    elif row[5] == "miss":
+                        misses = misses + 1
+        finally:
+            fd.close()
+
+        # the least recently used results are removed once for the whole batch, not after each stored result
+        evictions = 0
+        if cache != None:
+            evictions = cache.evict()
+
+        wallTime = time.perf_counter() - start
+        throughput = 0
+        if wallTime > 0:
+            throughput = count/wallTime
+        return {"count": count, "failed": failed, "time": wallTime, "throughput": throughput, "hits": hits, "misses": misses,
+                "evictions": evictions}
+
+
+def main(argv=None):
+    """
+    Command-line entry point of the batch analysis
+
+    :param argv: list of argument, the arguments of the command line are used if None
+    :return: exit status, 1 if any structure failed
+    """
+    import argparse
+    parser = argparse.ArgumentParser(description="Analyse structure .txt files in parallel without the user interface")
+    parser.add_argument("paths", nargs="+", help="structure .txt or .i2d files, directories or glob patterns")
+    parser.add_argument("-o", "--output", default="results/batch", help="directory of the result files and the summary")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="number of worker processes (default: all the cores)")
+    parser.add_argument("--chunksize", type=int, default=None, help="number of files sent to a worker at a time")
+    parser.add_argument("--summary", default=None, help="path of the summary .csv file (default: OUTPUT/summary.csv)")
+    parser.add_argument("--cache", default=None, help="directory of the analysis cache, identical models are not solved again")
+    parser.add_argument("--cache-size", type=float, default=MAX_SIZE/(1024*1024), help="limit of the analysis cache in MB")
+    args = parser.parse_args(argv)
+
+    batch = BatchAnalysis(args.paths, args.output, args.cache, int(args.cache_size*1024*1024))
+    if len(batch.getFiles()) == 0:
+        print("No structure file is found")
+        return 1
+
+    result = batch.run(args.workers, args.chunksize, args.summary)
+    print(str(result["count"]) + " models analysed, " + str(result["failed"]) + " failed, " +
+          format(result["time"], ".2f") + " s, " + format(result["throughput"], ".2f") + " models/s")
+    if args.cache != None:
+        print("analysis cache: " + str(result["hits"]) + " hits, " + str(result["misses"]) + " misses, " +
+              str(result["evictions"]) + " evicted")
+    if result["failed"] > 0:
+        return 1
+    return 0
+
+
+# testing only
+"""
+python -m directStiffnessMethod.batchAnalysis exampleStructures/ -o results/batch -j 4
+"""
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -68,12 +68,13 @@ class BeamElement(Member):
         self._memberLoads["uniformlyDistributedLoad"].append(w)
 
 
-    def addPointLoad(self, x, P):
+    def calculatePointLoadP(self, x, P):
         """
-        Add the point load into this member
+        Calculate the loading matrix of a point load without adding it into this member
 
         :param x: distance for the point load on the member from starting node
         :param P: point load magnitude
+        :return: loading matrix of the point load
         """
         a = x
         b = self._L - x
@@ -82,10 +83,31 @@ class BeamElement(Member):
               [-P*a*(b**2)/(L**2)],
               [-(P*a/L)*(1-(b**2-a*b)/(L**2))],
               [P*(a**2)*b/(L**2)]]
-        self.addP(Pp)
+        return Pp
+
+
+    def addPointLoad(self, x, P):
+        """
+        Add the point load into this member
+
+        :param x: distance for the point load on the member from starting node
+        :param P: point load magnitude
+        """
+        self.addP(self.calculatePointLoadP(x, P))
         self._memberLoads["pointLoad"].append([x,P])
 
 
+    def setSection(self, A, I):
+        """
+        Change the section of this member, the area value is not used by beam member
+
+        :param A: area value
+        :param I: area Moment of Inertia
+        """
+        self._I = I
+        self._stiffness = BeamStiffness(self._id, self._i, self._j, I, self._E, self._L)
+
+
     def getI(self):
         """
         Get the Area Moment of Inertia
@@ -141,15 +163,17 @@ class BeamElement(Member):
                     P[3]]
 
 
-    def calculateMemberForce(self, r_e):
+    def calculateMemberForce(self, r_e, Pe=None):
         """
         Calculate the member force of this member
 
         :param r_e: nodal displacement
+        :param Pe: loading matrix, the loading of this member is used if None
         :return: member force of this member
         """
         Ke = self.getStiffness().getK()
-        Pe = self.getP()
+        if Pe == None:
+            Pe = self.getP()
 
         result = self._matrixCalculator.matrixMultiplication(Ke, r_e)
         result = self._matrixCalculator.matrixAddition(result, "+", Pe)
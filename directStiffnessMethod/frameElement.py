@@ -38,7 +38,8 @@ class FrameElement(Member):
         self._stiffness = FrameStiffness(id, i, j, A, I, E, L, self._c, self._s)
         self._matrixCalculator = MatrixCalculation()
 
-        self._memberLoads = {"pointLoad": [], "uniformlyDistributedLoad":[], "id":self.getId(), "pointMoment":[]}
+        self._memberLoads = {"pointLoad": [], "uniformlyDistributedLoad":[], "id":self.getId(), "pointMoment":[],
+                             "axialPointLoad":[]}
 
 
     def getType(self):
@@ -113,13 +114,14 @@ class FrameElement(Member):
         self._memberLoads["pointLoad"].append([x,P])
 
 
-    def addGlobalPointLoad(self, x, Px, Py):
+    def calculateGlobalPointLoadP(self, x, Px, Py):
         """
-        Add the global point load into this member
+        Calculate the loading matrix of a global point load without adding it into this member
 
         :param x: distance for the point load on the member from starting node
         :param Px: point load magnitude for x direction
         :param Py: point load magnitude for y direction
+        :return: loading matrix of the point load
         """
         a = x
         b = self._L - x
@@ -130,8 +132,33 @@ class FrameElement(Member):
               [-Px*(b/L),],
               [-(Py*a/L)*(1-(b**2-a*b)/(L**2))],
               [Py*(a**2)*b/(L**2)]]
-        self.addP(Pp)
+        return Pp
+
+
+    def addGlobalPointLoad(self, x, Px, Py):
+        """
+        Add the global point load into this member
+
+        :param x: distance for the point load on the member from starting node
+        :param Px: point load magnitude for x direction
+        :param Py: point load magnitude for y direction
+        """
+        self.addP(self.calculateGlobalPointLoadP(x, Px, Py))
         self._memberLoads["pointLoad"].append([x,Py])
+        if Px != 0:
+            self._memberLoads["axialPointLoad"].append([x,Px])
+
+
+    def setSection(self, A, I):
+        """
+        Change the section of this member
+
+        :param A: area value
+        :param I: area Moment of Inertia
+        """
+        self._A = A
+        self._I = I
+        self._stiffness = FrameStiffness(self._id, self._i, self._j, A, I, self._E, self._L, self._c, self._s)
 
 
     def getI(self):
@@ -243,10 +270,19 @@ class FrameElement(Member):
         for item in self._allP:
             result = self._matrixCalculator.matrixAddition(result, "+", item)
 
-        if self.getAngle() != 0 and self.getAngle() != math.pi:
-            result = self._matrixCalculator.matrixMultiplication(self.getStiffness().get_LD_transpose(), result)
+        return self.transformP(result)
 
-        return result
+
+    def transformP(self, P):
+        """
+        Transform a loading matrix of this member in the same way as getP
+
+        :param P: loading matrix
+        :return: transformed loading matrix
+        """
+        if self.getAngle() != 0 and self.getAngle() != math.pi:
+            P = self._matrixCalculator.matrixMultiplication(self.getStiffness().get_LD_transpose(), P)
+        return P
 
 
     def getCertainP(self, pointNum):
@@ -267,15 +303,17 @@ class FrameElement(Member):
                     P[5]]
 
 
-    def calculateMemberForce(self, r_e):
+    def calculateMemberForce(self, r_e, Pe=None):
         """
         Calculate the member force of this member
 
         :param r_e: nodal displacement
+        :param Pe: loading matrix, the loading of this member is used if None
         :return: member force of this member
         """
         Ke = self.getStiffness().getK()
-        Pe = self.getP()
+        if Pe == None:
+            Pe = self.getP()
         LDe = self.getLD()
 
         result = self._matrixCalculator.matrixMultiplication(Ke, r_e)
@@ -1,6 +1,5 @@
 import time
 from itertools import permutations
-import random
 
 
 class MatrixCalculation(object):
@@ -366,6 +365,119 @@ class MatrixCalculation(object):
         return resultRounded
 
 
+    def matrixProfile(self, matrix):
+        """
+        Find the first nonzero column of each row on or below the diagonal
+        For matrix with a symmetric nonzero pattern only (e.g. stiffness matrix)
+
+        :param matrix: input matrix
+        :return: first nonzero column of each row
+        """
+        profile = []
+        for i in range(len(matrix)):
+            row = matrix[i]
+            first = i
+            for j in range(i):
+                if row[j] != 0:
+                    first = j
+                    break
+            profile.append(first)
+        return profile
+
+
+    def luDecomposition(self, originalMatrix, profile=None):
+        """
+        LU decomposition of a matrix without pivoting (same as the Gauss Elimination)
+        Only the entries inside the profile of the matrix are eliminated,
+        so a banded stiffness matrix costs O(n*b^2) instead of O(n^3)
+
+        :param originalMatrix: square matrix with a symmetric nonzero pattern
+        :param profile: first nonzero column of each row, it is calculated if None
+        :return: [LU matrix, first nonzero column of each row, last nonzero column of each row]
+        """
+        matrix = []
+        for row in originalMatrix:
+            matrix.append(row.copy())
+
+        n = len(matrix)
+        if profile == None:
+            profile = self.matrixProfile(matrix)
+
+        # last nonzero column of each row above the diagonal (symmetric pattern)
+        last = list(range(n))
+        for j in range(n):
+            for k in range(profile[j], j):
+                last[k] = j
+
+        for i in range(n):
+            if matrix[i][i] == 0.0:
+                raise Exception('Divide by zero detected!')
+
+            rowI = matrix[i]
+            end = last[i] + 1
+            for j in range(i+1, end):
+                if profile[j] > i:
+                    continue
+                rowJ = matrix[j]
+                ratio = rowJ[i]/rowI[i]
+                rowJ[i] = ratio
+                if ratio == 0:
+                    continue
+                for k in range(i+1, end):
+                    rowJ[k] = rowJ[k] - ratio * rowI[k]
+
+        return [matrix, profile, last]
+
+
+    def luSolve(self, factor, constant):
+        """
+        Solve the equation by a LU decomposition
+        Several constant columns are solved together by the same decomposition
+
+        :param factor: result of the luDecomposition
+        :param constant: constant part (n x m matrix)
+        :return: parameter result part (n x m matrix)
+        """
+        matrix = factor[0]
+        profile = factor[1]
+        last = factor[2]
+        n = len(matrix)
+
+        x = []
+        for row in constant:
+            x.append(list(row))
+
+        if n == 0:
+            return x
+        m = len(x[0])
+
+        # Forward Substitution
+        for i in range(n):
+            row = matrix[i]
+            xi = x[i]
+            for j in range(profile[i], i):
+                ratio = row[j]
+                if ratio != 0:
+                    xj = x[j]
+                    for col in range(m):
+                        xi[col] = xi[col] - ratio * xj[col]
+
+        # Back Substitution
+        for i in range(n-1, -1, -1):
+            row = matrix[i]
+            xi = x[i]
+            for j in range(i+1, last[i]+1):
+                value = row[j]
+                if value != 0:
+                    xj = x[j]
+                    for col in range(m):
+                        xi[col] = xi[col] - value * xj[col]
+            for col in range(m):
+                xi[col] = xi[col]/row[i]
+
+        return x
+
+
 # testing only
 
 """
@@ -395,6 +507,7 @@ print(matrixCalculator.gaussElimination(A,B))
 
 """
 # Matrix Inversion test
+import random
 A = []
 n = 150 # 150 -> 36.35305595397949 s
 matrixCalculator = MatrixCalculation()
@@ -416,6 +529,7 @@ print("time:", end-start, "s")
 
 """
 # Gauss Elimination test using factor of 25 to estimate the whole system calculation with Kff(n x n)
+import random
 A = []
 n = 300 # n=300 -> Whole system= 52.72955298423767 s
 matrixCalculator = MatrixCalculation()
@@ -0,0 +1,380 @@
+import bisect
+import math
+
+
+def evaluatePolynomial(coefficients, t):
+    """
+    Evaluate a polynomial by the Horner's method
+
+    :param coefficients: list of coefficient in ascending power of t
+    :param t: variable
+    :return: value
+    """
+    value = 0
+    for index in range(len(coefficients) - 1, -1, -1):
+        value = value*t + coefficients[index]
+    return value
+
+
+def getDerivative(coefficients):
+    """
+    Differentiate a polynomial
+
+    :param coefficients: list of coefficient in ascending power
+    :return: list of coefficient of the derivative
+    """
+    result = []
+    for power in range(1, len(coefficients)):
+        result.append(power*coefficients[power])
+    return result
+
+
+def getIntegral(coefficients, constant):
+    """
+    Integrate a polynomial
+
+    :param coefficients: list of coefficient in ascending power
+    :param constant: value of the integral at zero
+    :return: list of coefficient of the integral
+    """
+    result = [constant]
+    for power in range(len(coefficients)):
+        result.append(coefficients[power]/(power + 1))
+    return result
+
+
+def shiftPolynomial(coefficients, x0):
+    """
+    Express a polynomial of x in t = x - x0
+
+    :param coefficients: list of coefficient in ascending power of x
+    :param x0: new origin
+    :return: list of coefficient in ascending power of t
+    """
+    result = []
+    derivative = list(coefficients)
+    factorial = 1
+    for power in range(len(coefficients)):
+        if power > 0:
+            factorial = factorial*power
+        result.append(evaluatePolynomial(derivative, x0)/factorial)
+        derivative = getDerivative(derivative)
+    return result
+
+
+def getRoots(coefficients, length):
+    """
+    Find the roots of a polynomial inside (0, length)
+    The roots of the derivative split the range into monotonic parts, each part has at most one root found by bisection
+
+    :param coefficients: list of coefficient in ascending power of t
+    :param length: end of the range
+    :return: list of t in ascending order
+    """
+    degree = len(coefficients) - 1
+    while degree > 0 and coefficients[degree] == 0:
+        degree = degree - 1
+    if degree <= 0:
+        return []
+    if degree == 1:
+        t = -coefficients[0]/coefficients[1]
+        if 0 < t < length:
+            return [t]
+        return []
+
+    coefficients = coefficients[:degree + 1]
+    positions = [0] + getRoots(getDerivative(coefficients), length) + [length]
+    result = []
+    for index in range(len(positions) - 1):
+        start = positions[index]
+        end = positions[index + 1]
+        valueStart = evaluatePolynomial(coefficients, start)
+        valueEnd = evaluatePolynomial(coefficients, end)
+        if valueStart == 0:
+            if 0 < start < length and start not in result:
+                result.append(start)
+            continue
+        if valueStart*valueEnd >= 0:
+            continue
+        for iteration in range(200):
+            middle = (start + end)/2
+            if middle == start or middle == end:
+                break
+            valueMiddle = evaluatePolynomial(coefficients, middle)
+            if valueMiddle == 0:
+                break
+            if valueStart*valueMiddle < 0:
+                end = middle
+            else:
+                start = middle
+                valueStart = valueMiddle
+        result.append((start + end)/2)
+    return result
+
+
+class PiecewisePolynomial(object):
+    """
+    Piecewise polynomial along a member, used for the exact shear force, bending moment and deflection
+    Each piece starts at a breakpoint and is valid until the next one, the value at a breakpoint is the value of
+    the piece starting there, so a jump of a point load is included at its position
+    The coefficients of each piece are in the distance from its breakpoint, to keep the precision on long members
+    """
+
+    def __init__(self, breakpoints, coefficients):
+        """
+        Initiating the piecewise polynomial
+
+        :param breakpoints: list of x at the start of each piece, and the end of the last piece
+        :param coefficients: list of coefficients of each piece in ascending power of (x - start of the piece)
+        """
+        self._breakpoints = breakpoints
+        self._coefficients = coefficients
+
+
+    def getBreakpoints(self):
+        """
+        Return the breakpoints
+
+        :return: list of x
+        """
+        return self._breakpoints
+
+
+    def getCoefficients(self):
+        """
+        Return the coefficients of each piece
+
+        :return: list of coefficients in ascending power of (x - start of the piece)
+        """
+        return self._coefficients
+
+
+    def evaluate(self, piece, x):
+        """
+        Evaluate a piece at x
+
+        :param piece: index of the piece
+        :param x: position along the member
+        :return: value
+        """
+        return evaluatePolynomial(self._coefficients[piece], x - self._breakpoints[piece])
+
+
+    def getPiece(self, x):
+        """
+        Find the piece that x belongs to, the first and the last piece are extended beyond the member
+
+        :param x: position along the member
+        :return: index of the piece
+        """
+        piece = bisect.bisect_right(self._breakpoints, x) - 1
+        return min(max(piece, 0), len(self._coefficients) - 1)
+
+
+    def getValue(self, x):
+        """
+        Return the value at x
+
+        :param x: position along the member
+        :return: value
+        """
+        return self.evaluate(self.getPiece(x), x)
+
+
+    def getValues(self, xs):
+        """
+        Return the values at a list of x, the pieces are walked through once if the list is in ascending order
+
+        :param xs: list of position along the member
+        :return: list of value
+        """
+        result = []
+        piece = 0
+        last = len(self._coefficients) - 1
+        previous = None
+        for x in xs:
+            if previous == None or x < previous:
+                piece = self.getPiece(x)
+            else:
+                while piece < last and self._breakpoints[piece + 1] <= x:
+                    piece = piece + 1
+            result.append(self.evaluate(piece, x))
+            previous = x
+        return result
+
+
+    def getCriticalPoints(self):
+        """
+        Return the points where the extreme values can be, they are the both sides of each breakpoint
+        and the stationary points inside each piece
+
+        :return: list of [x, value] in ascending x
+        """
+        result = []
+        for piece in range(len(self._coefficients)):
+            start = self._breakpoints[piece]
+            end = self._breakpoints[piece + 1]
+            result.append([start, self.evaluate(piece, start)])
+            for t in getRoots(getDerivative(self._coefficients[piece]), end - start):
+                result.append([start + t, self.evaluate(piece, start + t)])
+            result.append([end, self.evaluate(piece, end)])
+        return result
+
+
+    def getMax(self):
+        """
+        Return the maximum value
+
+        :return: [x, value]
+        """
+        return max(self.getCriticalPoints(), key=lambda point: point[1])
+
+
+    def getMin(self):
+        """
+        Return the minimum value
+
+        :return: [x, value]
+        """
+        return min(self.getCriticalPoints(), key=lambda point: point[1])
+
+
+    def getAbsMax(self):
+        """
+        Return the value with the maximum magnitude
+
+        :return: [x, value]
+        """
+        return max(self.getCriticalPoints(), key=lambda point: abs(point[1]))
+
+
+    def getDrawingPoints(self, step):
+        """
+        Return the vertices to draw the diagram
+        Both sides of every breakpoint are included, a straight piece only needs its ends,
+        and a curved piece is divided at about the step with its stationary points included, so the peaks are exact
+
+        :param step: distance along the member of about one pixel on the screen
+        :return: list of [x, value]
+        """
+        result = []
+        for piece in range(len(self._coefficients)):
+            start = self._breakpoints[piece]
+            end = self._breakpoints[piece + 1]
+            coefficients = self._coefficients[piece]
+
+            positions = [start]
+            curved = False
+            for power in range(2, len(coefficients)):
+                if coefficients[power] != 0:
+                    curved = True
+            if curved and end > start:
+                count = int(math.ceil((end - start)/step))
+                for index in range(1, count):
+                    positions.append(start + (end - start)*index/count)
+                for t in getRoots(getDerivative(coefficients), end - start):
+                    positions.append(start + t)
+                positions.sort()
+            if end > start:
+                positions.append(end)
+
+            for x in positions:
+                value = self.evaluate(piece, x)
+                # a continuous breakpoint is only drawn once
+                if len(result) != 0 and result[-1][0] == x and abs(result[-1][1] - value) <= 1e-9*(1 + abs(value)):
+                    continue
+                result.append([x, value])
+        return result
+
+
+def getBreakpoints(L, positions):
+    """
+    Sort the distinct positions along a member together with the both ends
+    The last position is repeated, so the last piece is the value at the end including the point load there
+
+    :param L: length of the member
+    :param positions: list of position of the loads
+    :return: list of x
+    """
+    result = sorted(set([0, L] + positions))
+    result.append(result[-1])
+    return result
+
+
+def createShearDiagram(memberShearData, L):
+    """
+    Create the shear force diagram of a member
+    V(x) = sum of the point loads at or before x + w*x, the member end forces are included as the point loads at the ends
+
+    :param memberShearData: shear force data of the member from packAllResult
+    :param L: length of the member
+    :return: piecewise polynomial of the shear force
+    """
+    pointLoads = sorted(memberShearData["pointLoad"], key=lambda pointData: pointData[0])
+    w = sum(memberShearData["uniformlyDistributedLoad"])
+    breakpoints = getBreakpoints(L, [pointData[0] for pointData in pointLoads])
+
+    coefficients = []
+    shear = 0
+    index = 0
+    for piece in range(len(breakpoints) - 1):
+        while index < len(pointLoads) and pointLoads[index][0] <= breakpoints[piece]:
+            shear = shear + pointLoads[index][1]
+            index = index + 1
+        coefficients.append(shiftPolynomial([shear, w, 0], breakpoints[piece]))
+    return PiecewisePolynomial(breakpoints, coefficients)
+
+
+def createBendingDiagram(memberBendingData, L):
+    """
+    Create the bending moment diagram of a member in the sign of the drawing
+    The point loads and the UDL are superposed on the simply supported member,
+    and the moments at the ends are interpolated linearly
+
+    :param memberBendingData: bending moment data of the member from packAllResult
+    :param L: length of the member
+    :return: piecewise polynomial of the bending moment
+    """
+    pointLoads = sorted(memberBendingData["pointLoad"], key=lambda pointData: pointData[0])
+    breakpoints = getBreakpoints(L, [pointData[0] for pointData in pointLoads])
+
+    # every point load starts with P*x*(L-a)/L before its position
+    c0 = 0
+    c1 = 0
+    c2 = 0
+    for a, P in pointLoads:
+        c1 = c1 + P*(L - a)/L
+    for w in memberBendingData["uniformlyDistributedLoad"]:
+        c1 = c1 + w*L/2
+        c2 = c2 - w/2
+    for position, moment in memberBendingData["pointMoment"]:
+        if position == 0:
+            c0 = c0 - moment
+            c1 = c1 + moment/L
+        elif position == round(L):
+            c1 = c1 - moment/L
+
+    coefficients = []
+    index = 0
+    for piece in range(len(breakpoints) - 1):
+        # after its position a point load changes to P*(L-x)*a/L
+        while index < len(pointLoads) and pointLoads[index][0] <= breakpoints[piece]:
+            a, P = pointLoads[index]
+            c1 = c1 - P*(L - a)/L - P*a/L
+            c0 = c0 + P*a
+            index = index + 1
+        coefficients.append(shiftPolynomial([c0, c1, c2], breakpoints[piece]))
+    return PiecewisePolynomial(breakpoints, coefficients)
+
+
+# testing only
+"""
+memberShearData = {"pointLoad": [[2000, -10000], [0, 6000], [5000, 4000]], "uniformlyDistributedLoad": [], "pointMoment": []}
+shear = createShearDiagram(memberShearData, 5000)
+print(shear.getCriticalPoints())
+
+memberBendingData = {"pointLoad": [[2000, -10000]], "uniformlyDistributedLoad": [-2], "pointMoment": [[0, 0], [5000, 0]]}
+bending = createBendingDiagram(memberBendingData, 5000)
+print(bending.getAbsMax())
+print(bending.getDrawingPoints(100))
+"""
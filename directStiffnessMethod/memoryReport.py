@@ -0,0 +1,181 @@
+import sys
+
+
+def getDeepSize(item, counted=None):
+    """
+    Calculate the bytes held by an object and everything it refers to,
+    such as the list-of-list matrices, the dictionaries and the attributes of the objects
+
+    :param item: required object
+    :param counted: set of id of the objects that are already counted, they are not counted again
+    :return: size in bytes
+    """
+    if counted == None:
+        counted = set()
+
+    result = 0
+    stack = [item]
+    while len(stack) != 0:
+        item = stack.pop()
+        if id(item) in counted or isinstance(item, type):
+            continue
+        counted.add(id(item))
+        result = result + sys.getsizeof(item)
+
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        elif hasattr(item, "__dict__"):
+            stack.append(item.__dict__)
+    return result
+
+
+def getPeakRSS():
+    """
+    Return the peak resident set size of the process
+
+    :return: peak RSS in bytes, None if it is not available
+    """
+    try:
+        import resource
+    except ImportError:
+        # the peak RSS is not available on Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return peak
+    return peak*1024
+
+
+class MemoryReport(object):
+    """
+    Memory accounting of an analysis of the structure
+    The bytes held by the matrices, the load vectors, the member objects and the results are counted,
+    and the peak traced memory of each stage is measured while the stage is run again
+    """
+
+    def __init__(self, structure):
+        """
+        Initiating the memory report
+
+        :param structure: structure for analysis
+        """
+        self._structure = structure
+        self._report = None
+
+
+    def measureStage(self, function):
+        """
+        Run a stage of the analysis and measure its peak traced memory
+
+        :param function: function of the stage
+        :return: [result of the function, peak traced memory in bytes above the memory at the start]
+        """
+        import tracemalloc
+        started = False
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started = True
+        try:
+            tracemalloc.reset_peak()
+            start = tracemalloc.get_traced_memory()[0]
+            result = function()
+            peak = tracemalloc.get_traced_memory()[1] - start
+        finally:
+            if started:
+                tracemalloc.stop()
+        return [result, peak]
+
+
+    def measure(self):
+        """
+        Analyse the structure and account the memory of each part
+
+        :return: dictionary of "held" (part name to bytes held), "peak" (stage name to peak traced bytes),
+        "dofNum", "freeNum" and "peakRSS" (bytes, None if not available)
+        """
+        structure = self._structure
+        held = {}
+        peak = {}
+
+        K, peak["globalStiffness"] = self.measureStage(structure.getGlobalStiffness)
+        Kff, peak["Kff"] = self.measureStage(structure.getKff)
+        Ksf, peak["Ksf"] = self.measureStage(structure.getKsf)
+        loads, peak["loadVector"] = self.measureStage(
+            lambda: [structure.getGlobalP(), structure.getRf(), structure.getPf(), structure.getPs()])
+        rf, peak["solve"] = self.measureStage(structure.getrf)
+        Rs, peak["reactionRecovery"] = self.measureStage(lambda: structure.getRs(rf))
+        packed, peak["result"] = self.measureStage(lambda: structure.packAllResult(rf))
+
+        held["globalStiffness"] = getDeepSize(K)
+        held["Kff"] = getDeepSize(Kff)
+        held["Ksf"] = getDeepSize(Ksf)
+        held["loadVector"] = getDeepSize(loads)
+
+        # the members are counted with their stiffness objects and loading matrices
+        counted = set()
+        held["members"] = 0
+        for member in structure.getMembers():
+            held["members"] = held["members"] + getDeepSize(member, counted)
+        held["nodes"] = getDeepSize(structure.getNodes())
+
+        # the envelope kernel refers back to the structure and the members, they are not counted again
+        kernel = 0
+        stiffnessKernel, loadBasis = structure.getKernelCache()
+        if stiffnessKernel != None:
+            excluded = set(counted)
+            excluded.add(id(structure))
+            kernel = kernel + getDeepSize(stiffnessKernel, excluded)
+        if loadBasis != None:
+            kernel = kernel + getDeepSize(loadBasis)
+        held["kernelCache"] = kernel
+
+        held["result"] = getDeepSize([rf, Rs, packed])
+
+        dofNum = len(structure.getFreeNodalIndex()) + len(structure.getSupportNodalIndex())
+        self._report = {"held": held, "peak": peak, "dofNum": dofNum, "freeNum": len(rf),
+                        "peakRSS": getPeakRSS()}
+        return self._report
+
+
+    def getTable(self, report=None):
+        """
+        Return the memory report as a printable table
+
+        :param report: result of measure, the last report is used if None
+        :return: the table string
+        """
+        if report == None:
+            report = self._report
+        if report == None:
+            report = self.measure()
+
+        result = "DOFs: " + str(report["dofNum"]) + " (" + str(report["freeNum"]) + " free)\n"
+        result = result + "held".ljust(22) + "[kB]".rjust(12) + "\n"
+        total = 0
+        for name in report["held"]:
+            total = total + report["held"][name]
+            result = result + "    " + name.ljust(18) + format(report["held"][name]/1024, ".1f").rjust(12) + "\n"
+        result = result + "    " + "total".ljust(18) + format(total/1024, ".1f").rjust(12) + "\n"
+
+        result = result + "peak traced".ljust(22) + "[kB]".rjust(12) + "\n"
+        for name in report["peak"]:
+            result = result + "    " + name.ljust(18) + format(report["peak"][name]/1024, ".1f").rjust(12) + "\n"
+
+        if report["peakRSS"] != None:
+            result = result + "peak RSS".ljust(22) + format(report["peakRSS"]/(1024*1024), ".1f").rjust(12) + " MB"
+        return result
+
+
+# testing only
+"""
+from directStiffnessMethod.structureFile import StructureFile
+
+structureFile = StructureFile()
+data = structureFile.read("exampleStructures/frame.txt")
+structure = structureFile.buildStructure(data["structureData"], data["unit"])
+structure.getMemoryReport()
+print(structure.getMemoryReportTable())
+"""
@@ -0,0 +1,341 @@
+import math
+import mmap
+import os
+import struct
+from array import array
+from directStiffnessMethod.resultFile import getByteOrder, readArray, readSections, writeArrays
+from directStiffnessMethod.structureFile import StructureFile
+
+
+MAGIC = b"IS2DMDL\0"
+VERSION = 1
+EXTENSION = ".i2d"
+
+# magic, version, number of sections, byte order of the columns, origin x, origin y, scaling,
+# force unit, length unit, decimal place
+HEADER = struct.Struct("<8sIIc7xddd8s8sq")
+
+# member type of each type code
+MEMBER_TYPES = ["truss", "beam", "frame"]
+
+# loads of the structure data, a row is the ID and the values
+LOAD_KEYS = ["nodalLoad", "memberPointLoad", "uniformlyDistributedLoad", "nodalSettlement"]
+LOAD_WIDTHS = {"nodalLoad": 3, "memberPointLoad": 3, "uniformlyDistributedLoad": 1, "nodalSettlement": 3}
+
+# parts of the model which can be read alone
+GEOMETRY = ["node", "member"]
+PARTS = GEOMETRY + LOAD_KEYS
+
+
+def getRestraintCode(restraint):
+    """
+    Convert a restraint string into its code, the bit of each fixed component is set
+
+    :param restraint: restraint string such as "FFR", "" for a node without the restraint
+    :return: code from 0 to 7, -1 for ""
+    """
+    if restraint == "":
+        return -1
+    if len(restraint) != 3 or restraint.strip("FR") != "":
+        raise Exception('Invalid restraint ' + restraint + '!')
+    code = 0
+    for component in range(3):
+        if restraint[component] == "F":
+            code = code | (1 << component)
+    return code
+
+
+def getRestraint(code):
+    """
+    Convert a restraint code into its string
+
+    :param code: code from 0 to 7, -1 for the node without the restraint
+    :return: restraint string
+    """
+    if code < 0:
+        return ""
+    restraint = ""
+    for component in range(3):
+        if code & (1 << component):
+            restraint = restraint + "F"
+        else:
+            restraint = restraint + "R"
+    return restraint
+
+
+def isModelFile(filename):
+    """
+    Check whether a file is a binary model file by its magic number
+
+    :param filename: path of the file
+    :return: True if it is a binary model file
+    """
+    try:
+        fd = open(filename, "rb")
+    except OSError:
+        return False
+    try:
+        return fd.read(len(MAGIC)) == MAGIC
+    finally:
+        fd.close()
+
+
+class ModelFile(object):
+    """
+    Binary file of the structure, an alternative of the .txt file for very large structures
+    The nodes, the members and the loads are stored as typed columns, such as node:id, node:x, member:A and
+    member:type, with the same table of arrays as the result file (see writeArrays),
+    the file is memory-mapped when opened, so only the header is read and each column is read when it is used
+    The IDs and the coordinates in mm are 32-bit integers, the properties and the loads are doubles,
+    the restraint is a code of the fixed components, the member type is its index in MEMBER_TYPES,
+    and a missing A or I is NaN
+    """
+
+    def __init__(self):
+        """
+        Initiating the model file
+        """
+        self._mmap = None
+        self._byteOrder = None
+        self._header = None
+        self._sections = {}
+        self._columns = {}
+
+
+    def write(self, filename, fileData):
+        """
+        Write the structure into the binary file
+
+        :param filename: path of the .i2d file
+        :param fileData: dictionary of "origin", "unit", "scaling" and "structureData"
+        """
+        structureData = fileData["structureData"]
+        sections = []
+
+        nodes = structureData["node"]
+        supportNames = []
+        supportIndex = {}
+        supports = array("h")
+        for data in nodes:
+            if data[4] not in supportIndex:
+                supportIndex[data[4]] = len(supportNames)
+                supportNames.append(data[4])
+            supports.append(supportIndex[data[4]])
+        sections.append(["node:id", array("i", [data[0] for data in nodes])])
+        sections.append(["node:x", array("i", [data[1] for data in nodes])])
+        sections.append(["node:y", array("i", [data[2] for data in nodes])])
+        restraintCodes = {}
+        restraints = array("b")
+        for data in nodes:
+            if data[3] not in restraintCodes:
+                restraintCodes[data[3]] = getRestraintCode(data[3])
+            restraints.append(restraintCodes[data[3]])
+        sections.append(["node:restraint", restraints])
+        sections.append(["node:support", supports])
+        sections.append(["supportNames", array("B", "\n".join(supportNames).encode("utf-8"))])
+
+        members = structureData["member"]
+        sections.append(["member:id", array("i", [data[0] for data in members])])
+        sections.append(["member:i", array("i", [data[1] for data in members])])
+        sections.append(["member:j", array("i", [data[2] for data in members])])
+        for name, column in [["member:A", 3], ["member:I", 4]]:
+            values = array("d")
+            for data in members:
+                if data[column] == None:
+                    values.append(math.nan)
+                else:
+                    values.append(data[column])
+            sections.append([name, values])
+        sections.append(["member:E", array("d", [data[5] for data in members])])
+        types = array("b")
+        for data in members:
+            if data[6] not in MEMBER_TYPES:
+                raise Exception('Unknown type ' + str(data[6]) + ' of member ' + str(data[0]) + '!')
+            types.append(MEMBER_TYPES.index(data[6]))
+        sections.append(["member:type", types])
+
+        for key in LOAD_KEYS:
+            loads = structureData.get(key, [])
+            values = array("d")
+            for data in loads:
+                values.extend(data[1:])
+            sections.append([key + ":id", array("i", [data[0] for data in loads])])
+            sections.append([key + ":values", values])
+
+        origin = fileData["origin"]
+        unit = fileData["unit"]
+        header = HEADER.pack(MAGIC, VERSION, len(sections), getByteOrder(), origin[0], origin[1], fileData["scaling"],
+                             unit[0].encode("ascii"), unit[1].encode("ascii"), unit[2])
+        writeArrays(filename, header, sections)
+
+
+    def open(self, filename):
+        """
+        Memory-map the binary file and read its header, the columns are not read,
+        but the table of the columns is checked against the size of the file
+
+        :param filename: path of the .i2d file
+        :return: dictionary of "origin", "unit" and "scaling"
+        """
+        fd = open(filename, "rb")
+        try:
+            if os.fstat(fd.fileno()).st_size < HEADER.size:
+                raise Exception(filename + ' is not a model file!')
+            self._mmap = mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+        finally:
+            fd.close()
+
+        magic, version, sectionNum, byteOrder, originX, originY, scaling, forceUnit, lengthUnit, decimalPlace = \
+            HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise Exception(filename + ' is not a model file!')
+        if version != VERSION:
+            raise Exception('Version ' + str(version) + ' of the model file is not supported!')
+        self._byteOrder = byteOrder
+        self._header = {"origin": [originX, originY],
+                        "unit": [forceUnit.rstrip(b"\0").decode("ascii"), lengthUnit.rstrip(b"\0").decode("ascii"),
+                                 decimalPlace],
+                        "scaling": scaling}
+
+        self._sections = readSections(self._mmap, HEADER.size, sectionNum, filename)
+        self._columns = {}
+        return self._header
+
+
+    def getColumn(self, name):
+        """
+        Return a column of the opened model, it is a view of the mapped file without copying
+
+        :param name: name of the column, such as "node:x" or "member:E"
+        :return: memoryview or array
+        """
+        if name not in self._sections:
+            raise Exception('Column ' + name + ' is not found in the model file!')
+        if name not in self._columns:
+            typecode, offset, count = self._sections[name]
+            self._columns[name] = readArray(self._mmap, self._byteOrder, typecode, offset, count)
+        return self._columns[name]
+
+
+    def getTableColumns(self, names, widths=None):
+        """
+        Return the columns of a table, every column must have the same number of rows,
+        so a damaged file is not read as a smaller model
+
+        :param names: names of the columns of the table
+        :param widths: number of items of each row in each column, 1 for every column if None
+        :return: list of list of the items of each column
+        """
+        if widths == None:
+            widths = [1]*len(names)
+        columns = []
+        rowNum = None
+        for index in range(len(names)):
+            column = self.getColumn(names[index]).tolist()
+            if len(column) % widths[index] != 0:
+                raise Exception('Column ' + names[index] + ' of the model file has an incomplete row!')
+            if rowNum == None:
+                rowNum = len(column)//widths[index]
+            elif len(column)//widths[index] != rowNum:
+                raise Exception('Column ' + names[index] + ' of the model file has ' + str(len(column)//widths[index]) +
+                                ' rows instead of ' + str(rowNum) + '!')
+            columns.append(column)
+        return columns
+
+
+    def getNodeNum(self):
+        """
+        Return the number of nodes without reading the columns
+
+        :return: number of nodes
+        """
+        return self._sections["node:id"][2]
+
+
+    def getMemberNum(self):
+        """
+        Return the number of members without reading the columns
+
+        :return: number of members
+        """
+        return self._sections["member:id"][2]
+
+
+    def getNodes(self):
+        """
+        Read the node data of the opened model
+
+        :return: list of [id, x, y, restraint, support type]
+        """
+        supportNames = bytes(self.getColumn("supportNames")).decode("utf-8").split("\n")
+        restraints = [getRestraint(code) for code in range(-1, 8)]
+        columns = self.getTableColumns(["node:id", "node:x", "node:y", "node:restraint", "node:support"])
+        return [[id, x, y, restraints[code + 1], supportNames[support]] for id, x, y, code, support in zip(*columns)]
+
+
+    def getMembers(self):
+        """
+        Read the member data of the opened model
+
+        :return: list of [id, i, j, A, I, E, type], A and I are None if missing
+        """
+        ids, i, j, A, I, E, types = self.getTableColumns(["member:id", "member:i", "member:j", "member:A", "member:I",
+                                                          "member:E", "member:type"])
+        A = [None if value != value else value for value in A]
+        I = [None if value != value else value for value in I]
+        return [[id, nodeI, nodeJ, a, inertia, e, MEMBER_TYPES[type]] for id, nodeI, nodeJ, a, inertia, e, type in
+                zip(ids, i, j, A, I, E, types)]
+
+
+    def getLoads(self, key):
+        """
+        Read the load data of the opened model
+
+        :param key: one of LOAD_KEYS
+        :return: list of [id, values...]
+        """
+        width = LOAD_WIDTHS[key]
+        ids, values = self.getTableColumns([key + ":id", key + ":values"], [1, width])
+        return [[ids[index]] + values[index*width:(index + 1)*width] for index in range(len(ids))]
+
+
+    def read(self, filename, parts=None):
+        """
+        Read the structure from the binary file, only the columns of the required parts are read,
+        for example GEOMETRY for the nodes and the members only
+        The full structure data is validated in the same way as the .txt file (see StructureFile.validate)
+
+        :param filename: path of the .i2d file
+        :param parts: list of the keys of the structure data in PARTS, every part is read if None
+        :return: dictionary of "origin", "unit", "scaling" and "structureData" of the required parts
+        """
+        result = dict(self.open(filename))
+        if parts == None:
+            parts = PARTS
+
+        structureData = {}
+        for part in parts:
+            if part == "node":
+                structureData["node"] = self.getNodes()
+            elif part == "member":
+                structureData["member"] = self.getMembers()
+            elif part in LOAD_KEYS:
+                structureData[part] = self.getLoads(part)
+            else:
+                raise Exception('Unknown part ' + str(part) + ' of the model!')
+        result["structureData"] = structureData
+
+        if len(structureData) == len(PARTS):
+            StructureFile().validate(structureData)
+        return result
+
+
+# testing only
+"""
+from directStiffnessMethod.structureFile import StructureFile
+
+fileData = StructureFile().read("exampleStructures/frame.txt")
+ModelFile().write("exampleStructures/frame.i2d", fileData)
+print(ModelFile().read("exampleStructures/frame.i2d")["structureData"])
+print(ModelFile().read("exampleStructures/frame.i2d", GEOMETRY)["structureData"])
+"""
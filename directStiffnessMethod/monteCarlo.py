@@ -0,0 +1,297 @@
+import math
+import random
+from directStiffnessMethod import matrixCalculation
+
+
+class MonteCarlo(object):
+    """
+    Monte Carlo reliability analysis of the structure
+    The loads are superposed from one batched solve of a load basis, so the stiffness matrix
+    is only assembled (from the stiffness kernels) and decomposed again when the section properties are random
+    """
+
+    def __init__(self, structure, seed=None):
+        """
+        Initiating the Monte Carlo analysis
+
+        :param structure: structure for analysis
+        :param seed: seed of the random number generator
+        """
+        self._structure = structure
+        self._kernel = structure.getStiffnessKernel()
+        self._matrixCalculator = matrixCalculation.MatrixCalculation()
+        self._random = random.Random(seed)
+        self._memberVariables = []
+        self._loadVariables = []
+
+
+    def checkDistribution(self, distribution):
+        """
+        Check the distribution
+
+        :param distribution: ["normal", mean, standard deviation], ["lognormal", mean, standard deviation]
+        or ["uniform", lower bound, upper bound]
+        """
+        if distribution[0] not in ["normal", "lognormal", "uniform"]:
+            raise Exception('Unknown distribution ' + str(distribution[0]) + '!')
+        if distribution[0] == "lognormal" and distribution[1] <= 0:
+            raise Exception('Mean value of lognormal distribution should be larger than zero!')
+
+
+    def addMemberVariable(self, memberId, property, distribution):
+        """
+        Add a random section property of a member
+
+        :param memberId: member ID
+        :param property: "E", "A" or "I"
+        :param distribution: distribution of the property value
+        """
+        if memberId not in self._kernel.getMemberIds():
+            raise Exception('Member ' + str(memberId) + ' does not exist!')
+        if property not in ["E", "A", "I"]:
+            raise Exception('Unknown property ' + str(property) + '!')
+        self.checkDistribution(distribution)
+        self._memberVariables.append([memberId, ["E", "A", "I"].index(property), distribution])
+
+
+    def addLoadVariable(self, type, id, distribution):
+        """
+        Add a random load factor, all the loads of the node or the member are multiplied by the factor
+
+        :param type: "nodalLoad" (node ID) or "memberLoad" (member ID)
+        :param id: node ID or member ID
+        :param distribution: distribution of the load factor
+        """
+        if type not in ["nodalLoad", "memberLoad"]:
+            raise Exception('Unknown load type ' + str(type) + '!')
+        for variable in self._loadVariables:
+            if variable[0] == type and variable[1] == id:
+                raise Exception('Load variable of ' + type + ' ' + str(id) + ' is already added!')
+        self.checkDistribution(distribution)
+        self._loadVariables.append([type, id, distribution])
+
+
+    def sample(self, distribution):
+        """
+        Draw a sample from a distribution
+
+        :param distribution: required distribution
+        :return: the sample value
+        """
+        if distribution[0] == "normal":
+            return self._random.gauss(distribution[1], distribution[2])
+        elif distribution[0] == "lognormal":
+            mean = distribution[1]
+            sigma2 = math.log(1 + (distribution[2]/mean)**2)
+            return self._random.lognormvariate(math.log(mean) - sigma2/2, math.sqrt(sigma2))
+        return self._random.uniform(distribution[1], distribution[2])
+
+
+    def getResponseName(self):
+        """
+        Return the name of every response in the result
+
+        :return: list of name
+        """
+        return self._kernel.getResponseName()
+
+
+    def getLoadBasis(self):
+        """
+        Split the loading of the structure into the fixed part and the part of each load variable
+
+        :return: [Rf - Pf (free num x basis num), Ps (support num x basis num), list of dictionary of member ID to Pe]
+        """
+        loadColumn = {}
+        for col in range(len(self._loadVariables)):
+            type, id, distribution = self._loadVariables[col]
+            loadColumn[(type, id)] = col + 1
+        return self._kernel.getLoadBasis(loadColumn, len(self._loadVariables) + 1)
+
+
+    def solveBasis(self, properties, Rf_Pf, Ps, rs):
+        """
+        Solve all the load basis together by one decomposition
+        The support displacement belongs to the fixed part (column 0)
+
+        :param properties: dictionary of member ID to [E, A, I]
+        :param Rf_Pf: free loading of the load basis
+        :param Ps: support loading of the load basis
+        :param rs: support displacement (list of value)
+        :return: [rf (free num x basis num), Rs (support num x basis num)]
+        """
+        Kff, Ksf, Kss = self._kernel.assemble(properties)
+        Rf_Pf, Ps = self._kernel.applySettlement(Rf_Pf, Ps, Ksf, Kss, rs)
+        rf = self._matrixCalculator.luSolve(self._kernel.decompose(Kff), Rf_Pf)
+        Rs = self._matrixCalculator.matrixMultiplication(Ksf, rf)
+        Rs = self._matrixCalculator.matrixAddition(Rs, "+", Ps)
+        return [rf, Rs]
+
+
+    def calculateResponse(self, properties, rf, Rs, memberP, rs, factors):
+        """
+        Superpose the load basis by the load factors and calculate all the responses
+
+        :param properties: dictionary of member ID to [E, A, I]
+        :param rf: rf of the load basis
+        :param Rs: Rs of the load basis
+        :param memberP: list of dictionary of member ID to Pe for the load basis
+        :param rs: support displacement (list of value)
+        :param factors: factor of each load basis
+        :return: list of response value in the order of getResponseName
+        """
+        kernel = self._kernel
+        result = []
+        r = [0]*kernel.getDofNum()
+        freeIndex = kernel.getFreeIndex()
+        for index in range(len(freeIndex)):
+            value = 0
+            for col in range(len(factors)):
+                value = value + factors[col]*rf[index][col]
+            r[freeIndex[index]] = value
+            result.append(value)
+        supportIndex = kernel.getSupportIndex()
+        for index in range(len(supportIndex)):
+            r[supportIndex[index]] = factors[0]*rs[index]
+
+        for row in Rs:
+            value = 0
+            for col in range(len(factors)):
+                value = value + factors[col]*row[col]
+            result.append(value)
+
+        for memberId in kernel.getMemberIds():
+            dofIndex = kernel.getMemberDofIndex(memberId)
+            r_e = []
+            Pe = [0]*len(dofIndex)
+            for index in dofIndex:
+                r_e.append(r[index])
+            for col in range(len(factors)):
+                if memberId in memberP[col] and factors[col] != 0:
+                    for row in range(len(dofIndex)):
+                        Pe[row] = Pe[row] + factors[col]*memberP[col][memberId][row]
+            E, A, I = properties.get(memberId, kernel.getMemberProperty(memberId))
+            result.extend(kernel.calculateMemberForce(memberId, r_e, Pe, E, A, I))
+        return result
+
+
+    def run(self, sampleNum, limits=None):
+        """
+        Run the Monte Carlo analysis
+
+        :param sampleNum: number of samples
+        :param limits: dictionary of response name to limit value for the exceedance probability P(|response| > limit)
+        :return: dictionary of "sampleNum", "response" (list of [name, mean, standard deviation, minimum, maximum])
+        and "exceedance" (list of [name, limit, probability])
+        """
+        if limits == None:
+            limits = {}
+        names = self.getResponseName()
+        for name in limits:
+            if name not in names:
+                raise Exception('Unknown response ' + str(name) + '!')
+
+        Rf_Pf, Ps, memberP = self.getLoadBasis()
+        rs = self._kernel.getSupportDisplacement()
+        basisNum = len(self._loadVariables) + 1
+
+        nominal = {}
+        for memberId in self._kernel.getMemberIds():
+            nominal[memberId] = self._kernel.getMemberProperty(memberId)
+
+        if len(self._memberVariables) == 0:
+            # responses are linear to the load factors, so the response of each load basis is calculated once
+            rf, Rs = self.solveBasis(nominal, Rf_Pf, Ps, rs)
+            basisResponse = []
+            for col in range(basisNum):
+                factors = [0]*basisNum
+                factors[col] = 1
+                basisResponse.append(self.calculateResponse(nominal, rf, Rs, memberP, rs, factors))
+
+        count = [0]*len(names)
+        mean = [0]*len(names)
+        M2 = [0]*len(names)
+        minimum = [None]*len(names)
+        maximum = [None]*len(names)
+        exceedance = {}
+        for name in limits:
+            exceedance[name] = 0
+        limitIndex = []
+        for name in limits:
+            limitIndex.append([name, names.index(name), limits[name]])
+
+        for sampleIndex in range(sampleNum):
+            properties = {}
+            for memberId, propertyIndex, distribution in self._memberVariables:
+                if memberId not in properties:
+                    properties[memberId] = list(nominal[memberId])
+                properties[memberId][propertyIndex] = self.sample(distribution)
+
+            factors = [1]
+            for type, id, distribution in self._loadVariables:
+                factors.append(self.sample(distribution))
+
+            if len(self._memberVariables) == 0:
+                response = [0]*len(names)
+                for col in range(basisNum):
+                    factor = factors[col]
+                    colResponse = basisResponse[col]
+                    for index in range(len(names)):
+                        response[index] = response[index] + factor*colResponse[index]
+            else:
+                rf, Rs = self.solveBasis(properties, Rf_Pf, Ps, rs)
+                response = self.calculateResponse(properties, rf, Rs, memberP, rs, factors)
+
+            # running mean and variance (Welford)
+            for index in range(len(names)):
+                value = response[index]
+                count[index] = count[index] + 1
+                delta = value - mean[index]
+                mean[index] = mean[index] + delta/count[index]
+                M2[index] = M2[index] + delta*(value - mean[index])
+                if minimum[index] == None or value < minimum[index]:
+                    minimum[index] = value
+                if maximum[index] == None or value > maximum[index]:
+                    maximum[index] = value
+
+            for name, index, limit in limitIndex:
+                if abs(response[index]) > limit:
+                    exceedance[name] = exceedance[name] + 1
+
+        result = {"sampleNum": sampleNum, "response": [], "exceedance": []}
+        for index in range(len(names)):
+            std = 0
+            if sampleNum > 1:
+                std = math.sqrt(M2[index]/(sampleNum - 1))
+            result["response"].append([names[index], mean[index], std, minimum[index], maximum[index]])
+        for name in limits:
+            probability = 0
+            if sampleNum > 0:
+                probability = exceedance[name]/sampleNum
+            result["exceedance"].append([name, limits[name], probability])
+        return result
+
+
+# testing only
+"""
+from directStiffnessMethod.structure import Structure
+
+structure = Structure()
+structure.addNode(1,0,0,"FFF")
+structure.addNode(2,3000,6000,"RRR")
+structure.addNode(3,8000,6000,"FFF")
+
+structure.addMember(1,1,2,(10**4),(10**7),2*(10**5),"frame")
+structure.addMember(2,2,3,(10**4),(10**7),2*(10**5),"frame")
+
+structure.addGlobalMemberPointLoad(2,2500,0,-10000)
+
+monteCarlo = MonteCarlo(structure, 1)
+monteCarlo.addMemberVariable(1, "E", ["lognormal", 2*(10**5), 10**4])
+monteCarlo.addMemberVariable(2, "I", ["normal", 10**7, 5*(10**5)])
+monteCarlo.addLoadVariable("memberLoad", 2, ["normal", 1, 0.1])
+result = monteCarlo.run(10000, {"v2": 0.5})
+for item in result["response"]:
+    print(item)
+print(result["exceedance"])
+"""
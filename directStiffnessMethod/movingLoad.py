@@ -0,0 +1,332 @@
+from directStiffnessMethod import matrixCalculation
+
+
+class MovingLoad(object):
+    """
+    Moving load (vehicle train) analysis over a line of beam or frame members
+    """
+
+    def __init__(self, structure, memberIds, axleLoads, axleSpacing, increment):
+        """
+        Initiating the moving load analysis
+
+        :param structure: structure for analysis
+        :param memberIds: member IDs of the line in order, from node i to node j
+        :param axleLoads: y value of the load for each axle, starting from the leading axle
+        :param axleSpacing: distance between each axle and the next one
+        :param increment: distance for each step of the train and each station on the members
+        """
+        if len(axleLoads) == 0:
+            raise Exception('No axle load is defined!')
+        if len(axleSpacing) != len(axleLoads)-1:
+            raise Exception('Number of the axle spacing should be one less than the number of axle loads!')
+        if increment <= 0:
+            raise Exception('Increment should be larger than zero!')
+
+        self._structure = structure
+        self._axleLoads = axleLoads
+        self._axleSpacing = axleSpacing
+        self._increment = increment
+        self._matrixCalculator = matrixCalculation.MatrixCalculation()
+
+        self._lane = []
+        for memberId in memberIds:
+            for member in structure.getMembers():
+                if member.getId() == memberId:
+                    if member.getType() == "truss":
+                        raise Exception('Moving load cannot be applied on truss member ' + str(memberId) + '!')
+                    if len(self._lane) != 0 and self._lane[-1].getj() != member.geti():
+                        raise Exception('Member ' + str(memberId) + ' is not connected to the previous member!')
+                    self._lane.append(member)
+                    break
+            else:
+                raise Exception('Member ' + str(memberId) + ' does not exist!')
+
+
+    def getLaneLength(self):
+        """
+        Return the length of the line of members
+
+        :return: the length of the line of members
+        """
+        length = 0
+        for member in self._lane:
+            length = length + member.getL()
+        return length
+
+
+    def getAxleOffset(self):
+        """
+        Return the distance from the leading axle to each axle
+
+        :return: list of the distance from the leading axle
+        """
+        result = [0]
+        for spacing in self._axleSpacing:
+            result.append(result[-1] + spacing)
+        return result
+
+
+    def getTrainPositions(self):
+        """
+        Return the position of the leading axle for each step,
+        from entering the line to leaving the line
+
+        :return: list of the position of the leading axle
+        """
+        end = self.getLaneLength() + self.getAxleOffset()[-1]
+        result = []
+        step = 0
+        while step*self._increment < end:
+            result.append(step*self._increment)
+            step = step + 1
+        result.append(end)
+        return result
+
+
+    def getStations(self, member):
+        """
+        Return the stations on a member for the envelope
+
+        :param member: required member
+        :return: list of distance from the starting node
+        """
+        L = member.getL()
+        result = []
+        step = 0
+        while step*self._increment < L:
+            result.append(step*self._increment)
+            step = step + 1
+        result.append(L)
+        return result
+
+
+    def getMemberLoads(self, leadPosition):
+        """
+        Find the point loads on each member of the line for a position of the train
+
+        :param leadPosition: position of the leading axle from the start of the line
+        :return: dictionary of member ID to list of [distance from the starting node, local x value, local y value]
+        """
+        result = {}
+        offset = self.getAxleOffset()
+        for axleNum in range(len(self._axleLoads)):
+            position = leadPosition - offset[axleNum]
+            if position < 0:
+                continue
+
+            start = 0
+            for member in self._lane:
+                L = member.getL()
+                if position <= start + L:
+                    x = position - start
+                    if member.getType() == "beam":
+                        forces = [[0, self._axleLoads[axleNum]]]
+                    else:
+                        forces = self._structure.resolveGlobalPointLoad(member, 0, self._axleLoads[axleNum])
+
+                    if member.getId() not in result:
+                        result[member.getId()] = []
+                    for f_x, f_y in forces:
+                        result[member.getId()].append([x, f_x, f_y])
+                    break
+                start = start + L
+        return result
+
+
+    def getMemberP(self, member, loads):
+        """
+        Calculate the loading matrix of a member for the point loads of the train
+
+        :param member: required member
+        :param loads: list of [distance from the starting node, local x value, local y value]
+        :return: loading matrix of the member
+        """
+        if member.getType() == "beam":
+            P = [[0,], [0,], [0,], [0,]]
+            for x, f_x, f_y in loads:
+                P = self._matrixCalculator.matrixAddition(P, "+", member.calculatePointLoadP(x, f_y))
+            return P
+
+        P = [[0,], [0,], [0,], [0,], [0,], [0,]]
+        for x, f_x, f_y in loads:
+            P = self._matrixCalculator.matrixAddition(P, "+", member.calculateGlobalPointLoadP(x, f_x, f_y))
+        return member.transformP(P)
+
+
+    def analyse(self):
+        """
+        Analyse the structure for every position of the train
+        All the positions are solved together by one decomposition of the free stiffness matrix
+
+        :return: list of [leading axle position, member loads, rf matrix, Rs matrix, dictionary of member ID to member force]
+        """
+        structure = self._structure
+        dofMap = structure.getDofMap()
+        freeNodalIndex = structure.getFreeNodalIndex()
+        supportNodalIndex = structure.getSupportNodalIndex()
+        freePosition = {}
+        for index in range(len(freeNodalIndex)):
+            freePosition[freeNodalIndex[index]] = index
+        supportPosition = {}
+        for index in range(len(supportNodalIndex)):
+            supportPosition[supportNodalIndex[index]] = index
+
+        memberDofIndex = {}
+        for member in structure.getMembers():
+            memberDofIndex[member.getId()] = structure.getMemberDofIndex(member, dofMap)
+
+        positions = self.getTrainPositions()
+
+        # loading matrix for each position, one column for each position
+        Pf = []
+        for index in freeNodalIndex:
+            Pf.append([0]*len(positions))
+        Ps = []
+        for index in supportNodalIndex:
+            Ps.append([0]*len(positions))
+
+        allMemberLoads = []
+        allMemberP = []
+        for col in range(len(positions)):
+            memberLoads = self.getMemberLoads(positions[col])
+            memberP = {}
+            for member in self._lane:
+                if member.getId() not in memberLoads:
+                    continue
+                P = self.getMemberP(member, memberLoads[member.getId()])
+                memberP[member.getId()] = P
+                dofIndex = memberDofIndex[member.getId()]
+                for row in range(len(dofIndex)):
+                    if dofIndex[row] in freePosition:
+                        Pf[freePosition[dofIndex[row]]][col] -= P[row][0]
+                    else:
+                        Ps[supportPosition[dofIndex[row]]][col] += P[row][0]
+            allMemberLoads.append(memberLoads)
+            allMemberP.append(memberP)
+
+        factor = structure.getKffDecomposition()
+        rf = self._matrixCalculator.luSolve(factor, Pf)
+        Rs = self._matrixCalculator.matrixMultiplication(structure.getKsf(), rf)
+        Rs = self._matrixCalculator.matrixAddition(Rs, "+", Ps)
+
+        result = []
+        for col in range(len(positions)):
+            r = [0]*(len(freeNodalIndex) + len(supportNodalIndex))
+            for index in range(len(freeNodalIndex)):
+                r[freeNodalIndex[index]] = rf[index][col]
+
+            memberForces = {}
+            for member in self._lane:
+                r_e = []
+                for index in memberDofIndex[member.getId()]:
+                    r_e.append([r[index],])
+                Pe = allMemberP[col].get(member.getId())
+                if Pe == None:
+                    Pe = []
+                    for index in r_e:
+                        Pe.append([0,])
+                memberForces[member.getId()] = member.calculateMemberForce(r_e, Pe)
+
+            rfCol = []
+            for row in rf:
+                rfCol.append([row[col],])
+            RsCol = []
+            for row in Rs:
+                RsCol.append([row[col],])
+            result.append([positions[col], allMemberLoads[col], rfCol, RsCol, memberForces])
+        return result
+
+
+    def getShearAndMoment(self, member, memberForce, loads, x):
+        """
+        Calculate the shear force and bending moment of a member at a station
+        The sign convention is the same as the shear force and bending moment diagram
+
+        :param member: required member
+        :param memberForce: member force of the member
+        :param loads: list of [distance from the starting node, local x value, local y value]
+        :param x: distance from the starting node
+        :return: [shear force, bending moment]
+        """
+        L = member.getL()
+        if member.getType() == "beam":
+            shear = memberForce[0][0]
+            momentI = memberForce[1][0]
+            momentJ = memberForce[3][0]
+        else:
+            shear = memberForce[1][0]
+            momentI = memberForce[2][0]
+            momentJ = memberForce[5][0]
+
+        moment = momentI*(L-x)/L - momentJ*x/L
+        for a, f_x, f_y in loads:
+            if a <= x:
+                shear = shear + f_y
+                moment = moment + f_y*(L-x)*a/L
+            else:
+                moment = moment + f_y*x*(L-a)/L
+        return [shear, -moment]
+
+
+    def getEnvelope(self):
+        """
+        Calculate the envelope of the shear force, bending moment and reaction force of the moving load
+
+        :return: dictionary of the envelope, "station" is list of [member ID, distance from the starting node,
+        minimum shear force, maximum shear force, minimum bending moment, maximum bending moment],
+        "reactionForce" is list of [name, minimum value, maximum value]
+        """
+        result = {"station": [], "reactionForce": []}
+        analysis = self.analyse()
+
+        for member in self._lane:
+            for x in self.getStations(member):
+                shearMin = None
+                shearMax = None
+                momentMin = None
+                momentMax = None
+                for position, memberLoads, rf, Rs, memberForces in analysis:
+                    loads = memberLoads.get(member.getId(), [])
+                    shear, moment = self.getShearAndMoment(member, memberForces[member.getId()], loads, x)
+                    if shearMin == None or shear < shearMin:
+                        shearMin = shear
+                    if shearMax == None or shear > shearMax:
+                        shearMax = shear
+                    if momentMin == None or moment < momentMin:
+                        momentMin = moment
+                    if momentMax == None or moment > momentMax:
+                        momentMax = moment
+                result["station"].append([member.getId(), x, shearMin, shearMax, momentMin, momentMax])
+
+        nodalLoad = self._structure.getNodalLoad()
+        supportNodalIndex = self._structure.getSupportNodalIndex()
+        for index in range(len(supportNodalIndex)):
+            values = []
+            for position, memberLoads, rf, Rs, memberForces in analysis:
+                values.append(Rs[index][0])
+            result["reactionForce"].append([nodalLoad[supportNodalIndex[index]], min(values), max(values)])
+        return result
+
+
+# testing only
+"""
+from directStiffnessMethod.structure import Structure
+
+E = 200000
+I = 4*(10**8)
+structure = Structure()
+structure.addNode(1,0,0,"RFR")
+structure.addNode(2,10000,0,"RFR")
+structure.addNode(3,20000,0,"RFR")
+
+structure.addMember(1,1,2,None,I,E,"beam")
+structure.addMember(2,2,3,None,I,E,"beam")
+
+movingLoad = MovingLoad(structure, [1,2], [-50000,-100000,-100000], [3000,1200], 500)
+envelope = movingLoad.getEnvelope()
+for item in envelope["station"]:
+    print(item)
+for item in envelope["reactionForce"]:
+    print(item)
+"""
@@ -17,6 +17,7 @@ class Node(object):
         self._y = y
         self._restraint = restraint
         self._load = [0, 0, 0]
+        self._settlement = [0, 0, 0]
 
 
     def getID(self):
@@ -89,7 +90,7 @@ class Node(object):
 
         for index in range(0, 3):
             if restraint[index] == "F":
-                nodalDisplacement.append(0)
+                nodalDisplacement.append(self._settlement[index])
             elif restraint[index] == "R":
                 if index == 0:
                     name = "u"+id
@@ -114,6 +115,44 @@ class Node(object):
         self._load[2] = self._load[2] + moment
 
 
+    def addSettlement(self, dx, dy, rotation):
+        """
+        Add the prescribed displacement (support settlement) of the restrained displacements
+
+        :param dx: x value of the displacement
+        :param dy: y value of the displacement
+        :param rotation: rotation value of the displacement
+        """
+        restraint = self.getRestraint()
+        if restraint == None:
+            restraint = "RRR"
+        settlement = [dx, dy, rotation]
+        for index in range(0, 3):
+            if settlement[index] != 0 and restraint[index] != "F":
+                raise Exception('Settlement can only be added to the restrained displacement of node ' + str(self.getID()) + '!')
+
+        for index in range(0, 3):
+            self._settlement[index] = self._settlement[index] + settlement[index]
+
+
+    def getSettlement(self):
+        """
+        Return the prescribed displacement of the node
+
+        :return: the prescribed displacement [dx, dy, rotation]
+        """
+        return self._settlement
+
+
+    def getLoad(self):
+        """
+        Return the applied nodal loading of all the components, including the restrained ones
+
+        :return: the nodal loading [fx, fy, moment]
+        """
+        return self._load
+
+
     def getNodalLoad(self):
         """
         Return the nodal loading
@@ -0,0 +1,238 @@
+import csv
+import itertools
+import os
+from directStiffnessMethod.structure import Structure
+from directStiffnessMethod.structureFile import StructureFile
+
+
+# index of each parameter inside the structure data
+PARAMETER_FIELDS = {"node": {"x": 1, "y": 2},
+                    "member": {"A": 3, "I": 4, "E": 5},
+                    "nodalLoad": {"Fx": 1, "Fy": 2, "M": 3},
+                    "memberPointLoad": {"x": 1, "Fx": 2, "Fy": 3},
+                    "uniformlyDistributedLoad": {"w": 1},
+                    "nodalSettlement": {"dx": 1, "dy": 2, "rotation": 3}}
+
+
+# base model of the worker process, sent once by the initializer
+_workerData = {"structureData": None, "parameters": None}
+
+
+def _initialiseWorker(structureData, parameters):
+    """
+    Keep the base model inside the worker process
+
+    :param structureData: structure data of the base model
+    :param parameters: list of [section, ID, field]
+    """
+    _workerData["structureData"] = structureData
+    _workerData["parameters"] = parameters
+
+
+def _analyseWorkerVariant(values):
+    """
+    Analyse a variant inside the worker process
+
+    :param values: parameter values of the variant
+    :return: result row of the variant
+    """
+    return analyseVariant(_workerData["structureData"], _workerData["parameters"], values)
+
+
+def applyVariant(structureData, parameters, values):
+    """
+    Create the structure data of a variant
+
+    :param structureData: structure data of the base model
+    :param parameters: list of [section, ID, field]
+    :param values: parameter values of the variant
+    :return: structure data of the variant
+    """
+    result = {}
+    for key in structureData:
+        result[key] = []
+        for data in structureData[key]:
+            result[key].append(list(data))
+
+    for index in range(len(parameters)):
+        section, id, field = parameters[index]
+        fieldIndex = PARAMETER_FIELDS[section][field]
+        for data in result[section]:
+            if data[0] == id:
+                data[fieldIndex] = values[index]
+    return result
+
+
+def analyseVariant(structureData, parameters, values):
+    """
+    Analyse a variant of the base model
+    The system is solved once and shared by the displacement, reaction and member force
+
+    :param structureData: structure data of the base model
+    :param parameters: list of [section, ID, field]
+    :param values: parameter values of the variant
+    :return: [parameter values..., max displacement, reaction forces..., member forces..., status]
+    """
+    row = list(values)
+    try:
+        structure = StructureFile().buildStructure(applyVariant(structureData, parameters, values))
+        rf = structure.getrf()
+        allMemberForce = structure.getAllMemberForce(structure.getNodalDisplacementResult(rf))
+        Rs = structure.getRs(rf)
+
+        nodalDisplacement = structure.getNodalDisplacement()
+        maxDisplacement = 0
+        freeNodalIndex = structure.getFreeNodalIndex()
+        for index in range(len(freeNodalIndex)):
+            name = nodalDisplacement[freeNodalIndex[index]]
+            if "u" in name or "v" in name:
+                maxDisplacement = max(maxDisplacement, abs(rf[index][0]))
+        row.append(maxDisplacement)
+
+        for item in Rs:
+            row.append(item[0])
+
+        for member in structure.getMembers():
+            memberForce = allMemberForce[member.getId()]
+            if member.getType() == "truss":
+                row.append(memberForce)
+            else:
+                for item in memberForce:
+                    row.append(item[0])
+        row.append("ok")
+
+    except Exception as error:
+        row.append(str(error))
+    return row
+
+
+class ParametricSweep(object):
+    """
+    Parametric sweep of a base model over a process pool
+    """
+
+    def __init__(self, base):
+        """
+        Initiating the parametric sweep
+
+        :param base: base model, a structure or the path of a structure .txt file
+        """
+        if isinstance(base, Structure):
+            self._structureData = base.getStructureData()
+        else:
+            self._structureData = StructureFile().read(base)["structureData"]
+        self._parameters = []
+        self._values = []
+
+
+    def addParameter(self, section, id, field, values):
+        """
+        Add a parameter range for the sweep
+
+        :param section: "node", "member", "nodalLoad", "memberPointLoad", "uniformlyDistributedLoad" or "nodalSettlement"
+        :param id: node ID or member ID of the data
+        :param field: field name of the data, see PARAMETER_FIELDS
+        :param values: list of value for the parameter
+        """
+        if section not in PARAMETER_FIELDS:
+            raise Exception('Unknown section ' + str(section) + '!')
+        if field not in PARAMETER_FIELDS[section]:
+            raise Exception('Unknown field ' + str(field) + ' for ' + section + '!')
+
+        found = False
+        for data in self._structureData[section]:
+            if data[0] == id:
+                found = True
+        if not found:
+            raise Exception(section + ' ' + str(id) + ' does not exist!')
+
+        self._parameters.append([section, id, field])
+        self._values.append(list(values))
+
+
+    def getVariantNum(self):
+        """
+        Return the number of variants in the sweep
+
+        :return: the number of variants
+        """
+        result = 1
+        for values in self._values:
+            result = result*len(values)
+        return result
+
+
+    def getVariants(self):
+        """
+        Return the parameter values of every variant
+
+        :return: iterator of the parameter values
+        """
+        return itertools.product(*self._values)
+
+
+    def getHeader(self):
+        """
+        Return the column names of the result table
+
+        :return: list of column name
+        """
+        structure = StructureFile().buildStructure(self._structureData)
+        result = []
+        for section, id, field in self._parameters:
+            result.append(section + " " + str(id) + " " + field)
+        result.append("max displacement")
+
+        nodalLoad = structure.getNodalLoad()
+        for index in structure.getSupportNodalIndex():
+            result.append(nodalLoad[index])
+
+        for member in structure.getMembers():
+            result.extend(structure.getMemberForceName(member))
+        result.append("status")
+        return result
+
+
+    def run(self, filename, maxWorkers=None, chunksize=None):
+        """
+        Analyse every variant across the process pool and write the result table into a .csv file
+        Each row is written as soon as its result is returned
+
+        :param filename: path of the .csv file
+        :param maxWorkers: number of worker processes, all the cores are used if None
+        :param chunksize: number of variants sent to a worker at a time, it is calculated if None
+        :return: the number of variants
+        """
+        # the process pool is only loaded by the main process, not by the workers
+        from concurrent.futures import ProcessPoolExecutor
+
+        if chunksize == None:
+            workers = maxWorkers
+            if workers == None:
+                workers = os.cpu_count() or 1
+            chunksize = max(1, self.getVariantNum()//(workers*4))
+
+        count = 0
+        fd = open(filename, "w", newline="")
+        try:
+            writer = csv.writer(fd)
+            writer.writerow(self.getHeader())
+            with ProcessPoolExecutor(max_workers=maxWorkers, initializer=_initialiseWorker,
+                                     initargs=(self._structureData, self._parameters)) as executor:
+                for row in executor.map(_analyseWorkerVariant, self.getVariants(), chunksize=chunksize):
+                    writer.writerow(row)
+                    count = count + 1
+        finally:
+            fd.close()
+        return count
+
+
+# testing only
+"""
+if __name__ == "__main__":
+    sweep = ParametricSweep("exampleStructures/frame.txt")
+    sweep.addParameter("node", 2, "y", [15000, 20000, 25000])
+    sweep.addParameter("member", 3, "I", [1.0e9, 2.06e9, 4.0e9])
+    sweep.addParameter("uniformlyDistributedLoad", 3, "w", [-50, -100, -150])
+    print(sweep.run("results/sweep.csv"), "variants")
+"""
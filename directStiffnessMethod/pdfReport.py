@@ -0,0 +1,167 @@
+class PdfReport(object):
+    """
+    PDF report of the analysis result, without the user interface
+    The report backend (reportlab) is only loaded when the PDF is written
+    """
+
+    def __init__(self, structure):
+        """
+        Initiating the PDF report
+
+        :param structure: analysed structure
+        """
+        self._structure = structure
+
+
+    def getData(self):
+        """
+        Collect the tables of the report from the structure
+
+        :return: dictionary of table name to table data (list of row), or list of table data for each member
+        """
+        structure = self._structure
+        return {"memberTable1": structure.getMemberInformationTable1(),
+                "memberTable2": structure.getMemberInformationTable2(),
+                "localStiffness": structure.getLocalStiffness(),
+                "globalStiffness": structure.getGlobalStiffnessString(),
+                "nodalDisplacementAndLoad": structure.getNodalDisplacementAndLoad(),
+                "localP": structure.getAllLocalP(),
+                "globalP": structure.getGlobalPString(),
+                "Kff": structure.getKffString(),
+                "Rf": structure.getRfString(),
+                "Pf": structure.getPfString(),
+                "rf": structure.get_rfString(),
+                "Ksf": structure.getKsfString(),
+                "Ps": structure.getPsString(),
+                "Rs": structure.getRsString(),
+                "localMemberForce": structure.getLocalMemberForce()}
+
+
+    def write(self, filename, name, data=None):
+        """
+        Generate the result of the analysis and save it into PDF
+
+        :param filename: path of the PDF file
+        :param name: name of the structure in the title
+        :param data: result of getData, it is collected if None
+        """
+        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
+        from reportlab.lib.pagesizes import letter
+
+        if data == None:
+            data = self.getData()
+
+        pdf = SimpleDocTemplate(filename, pagesize=letter)
+
+        style1 = TableStyle([("ALIGN", (0,0), (-1,-1),"CENTER"),
+                             ("BOX", (0,0), (-1,-1), 2, "black"),
+                             ("LINEBEFORE", (0,0), (-1,-1), 1, "black"),
+                             ("LINEABOVE", (0,0), (-1,-1), 1, "black")])
+
+        memberTable1 = Table(data["memberTable1"])
+        memberTable2 = Table(data["memberTable2"])
+
+        memberTable1.setStyle(style1)
+        memberTable2.setStyle(style1)
+
+        elements = []
+        elements.append(Table([["Linear Analysis Result: " + name,],]))
+        elements.append(Table([["unit: [N], [mm]",],]))
+        elements.append(Table([["",],]))
+        elements.append(Table([["Member Information: ",],]))
+        elements.append(Table([["",],]))
+        elements.append(memberTable1)
+        elements.append(Table([["",],])) # blank line
+        elements.append(memberTable2)
+        elements.append(Table([["",],]))
+
+        style2 = TableStyle([("ALIGN", (0,0), (-1,-1),"CENTER"),])
+
+        elements.append(Table([["",],]))
+        elements.append(Table([["Member Local Stiffness: ",],]))
+        elements.append(Table([["",],]))
+        for stiffness in data["localStiffness"]:
+            table = Table(stiffness)
+            table.setStyle(style2)
+            elements.append(table)
+            elements.append(Table([["",],]))
+
+        style3 = TableStyle([("ALIGN", (0,0), (-1,-1),"CENTER"),
+                             ("FONTSIZE", (0,0), (-1,-1), 7)])
+
+        elements.append(Table([["",],]))
+        elements.append(Table([["Structure Global Stiffness: ",],]))
+        elements.append(Table([["",],]))
+        globalStiffness = Table(data["globalStiffness"])
+        globalStiffness.setStyle(style3)
+        elements.append(globalStiffness)
+        elements.append(Table([["",],]))
+
+        elements.append(Table([["",],]))
+        elements.append(Table([["Nodal Displacement & Nodal Load: ",],]))
+        elements.append(Table([["",],]))
+        r_R = Table(data["nodalDisplacementAndLoad"])
+        r_R.setStyle(style2)
+        elements.append(r_R)
+        elements.append(Table([["",],]))
+
+        elements.append(Table([["",],]))
+        elements.append(Table([["Member Local P: ",],]))
+        elements.append(Table([["",],]))
+        for P in data["localP"]:
+            eachP = Table(P)
+            eachP.setStyle(style2)
+            elements.append(eachP)
+            elements.append(Table([["",],]))
+        elements.append(Table([["",],]))
+
+        elements.append(Table([["",],]))
+        elements.append(Table([["Structure Global P: ",],]))
+        elements.append(Table([["",],]))
+        globalP = Table(data["globalP"])
+        globalP.setStyle(style2)
+        elements.append(globalP)
+        elements.append(Table([["",],]))
+
+        elements.append(Table([["",],]))
+        elements.append(Table([["Nodal Displacement {rf}: ",],]))
+        elements.append(Table([["{Rf} = [Kff]{rf} + {Pf}",],]))
+        elements.append(Table([["{rf} = [Kff]^(-1) x ({Rf} - {Pf})",],]))
+        elements.append(Table([["",],]))
+        for key in ["Kff", "Rf", "Pf", "rf"]:
+            table = Table(data[key])
+            table.setStyle(style2)
+            elements.append(table)
+            elements.append(Table([["",],]))
+
+        elements.append(Table([["",],]))
+        elements.append(Table([["Reaction Force {Rs}: ",],]))
+        elements.append(Table([["{Rs} = [Ksf]{rf} + {Ps}",],]))
+        elements.append(Table([["",],]))
+        for key in ["Ksf", "Ps", "Rs"]:
+            table = Table(data[key])
+            table.setStyle(style2)
+            elements.append(table)
+            elements.append(Table([["",],]))
+
+        elements.append(Table([["",],]))
+        elements.append(Table([["Member Force: ",],]))
+        elements.append(Table([["",],]))
+        for F in data["localMemberForce"]:
+            eachF = Table(F)
+            eachF.setStyle(style2)
+            elements.append(eachF)
+            elements.append(Table([["",],]))
+
+        pdf.build(elements)
+
+
+# testing only
+"""
+from directStiffnessMethod.structureFile import StructureFile
+
+structureFile = StructureFile()
+data = structureFile.read("exampleStructures/frame.txt")
+structure = structureFile.buildStructure(data["structureData"], data["unit"])
+PdfReport(structure).write("results/frame.pdf", "frame")
+"""
@@ -0,0 +1,200 @@
+import time
+
+
+# phases of the analysis pipeline, in the order of the table
+PHASES = ["dofNumbering", "elementStiffness", "assembly", "loadVector", "partition", "factorization",
+          "solve", "reactionRecovery", "memberForceRecovery", "formatting"]
+
+
+def profiled(phase):
+    """
+    Decorator of a Structure method that belongs to a phase of the analysis
+    The method is called directly when the profiling of the structure is not enabled
+    The name and the docstring are copied by hand, functools is not imported to keep the import of Structure light
+
+    :param phase: name of the phase
+    :return: the decorator
+    """
+    def decorator(function):
+        def wrapper(self, *args, **kwargs):
+            profiler = self._profiler
+            if profiler == None:
+                return function(self, *args, **kwargs)
+            profiler.enter(phase)
+            try:
+                return function(self, *args, **kwargs)
+            finally:
+                profiler.exit(phase)
+        wrapper.__name__ = function.__name__
+        wrapper.__qualname__ = function.__qualname__
+        wrapper.__doc__ = function.__doc__
+        wrapper.__module__ = function.__module__
+        wrapper.__wrapped__ = function
+        return wrapper
+    return decorator
+
+
+class Profiler(object):
+    """
+    Record the wall time, call count and allocated memory of each phase of the analysis
+    The self time of a phase excludes the time of the other phases called inside it,
+    so the self times add up to the profiled time
+    """
+
+    def __init__(self, memory=False):
+        """
+        Initiating the profiler
+
+        :param memory: record the allocated memory by tracemalloc, it slows down the analysis
+        """
+        self._memory = memory
+        self._startedTracing = False
+        self._stack = []
+        self.reset()
+
+
+    def start(self):
+        """
+        Start the memory tracing if it is required, tracemalloc is only imported then
+        """
+        if not self._memory:
+            return
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._startedTracing = True
+
+
+    def stop(self):
+        """
+        Stop the memory tracing if it is started by the profiler
+        """
+        if self._startedTracing:
+            import tracemalloc
+            tracemalloc.stop()
+            self._startedTracing = False
+
+
+    def reset(self):
+        """
+        Clear the record of every phase
+        """
+        self._record = {}
+        for phase in PHASES:
+            self._record[phase] = {"calls": 0, "time": 0, "selfTime": 0, "memory": 0}
+        self._peak = 0
+
+
+    def getTracedMemory(self):
+        """
+        Return the current traced memory
+
+        :return: traced memory in bytes, 0 if the memory is not traced
+        """
+        if not self._memory:
+            return 0
+        import tracemalloc
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            self._peak = max(self._peak, peak)
+            return current
+        return 0
+
+
+    def enter(self, phase):
+        """
+        Start a call of a phase
+
+        :param phase: name of the phase
+        """
+        if phase not in self._record:
+            self._record[phase] = {"calls": 0, "time": 0, "selfTime": 0, "memory": 0}
+        self._stack.append([phase, time.perf_counter(), 0, self.getTracedMemory()])
+
+
+    def exit(self, phase):
+        """
+        Finish the last call of a phase
+
+        :param phase: name of the phase
+        """
+        name, start, childTime, startMemory = self._stack.pop()
+        elapsed = time.perf_counter() - start
+        record = self._record[name]
+        record["calls"] = record["calls"] + 1
+        record["selfTime"] = record["selfTime"] + elapsed - childTime
+
+        # a phase called inside the same phase is only counted once in the total time and memory
+        outermost = True
+        for item in self._stack:
+            if item[0] == name:
+                outermost = False
+        if outermost:
+            record["time"] = record["time"] + elapsed
+            record["memory"] = record["memory"] + self.getTracedMemory() - startMemory
+        if len(self._stack) != 0:
+            self._stack[-1][2] = self._stack[-1][2] + elapsed
+
+
+    def getResult(self):
+        """
+        Return the record of every phase
+
+        :return: dictionary of phase to {"calls", "time", "selfTime", "memory"},
+        time in seconds (inclusive of the phases inside), self time in seconds, memory in bytes (net allocation),
+        and "peakMemory" in bytes
+        """
+        result = {}
+        for phase in self._record:
+            result[phase] = dict(self._record[phase])
+        result["peakMemory"] = self._peak
+        return result
+
+
+    def getTable(self):
+        """
+        Return the record of every phase as a printable table
+
+        :return: the table string
+        """
+        totalSelfTime = 0
+        for phase in self._record:
+            totalSelfTime = totalSelfTime + self._record[phase]["selfTime"]
+
+        result = "phase".ljust(22) + "calls".rjust(8) + "total [ms]".rjust(13) + "self [ms]".rjust(13) + \
+                 "self %".rjust(8)
+        if self._memory:
+            result = result + "memory [kB]".rjust(14)
+        result = result + "\n"
+        for phase in self._record:
+            record = self._record[phase]
+            if record["calls"] == 0:
+                continue
+            percentage = 0
+            if totalSelfTime > 0:
+                percentage = record["selfTime"]/totalSelfTime*100
+            result = result + phase.ljust(22) + str(record["calls"]).rjust(8) + \
+                     format(record["time"]*1000, ".2f").rjust(13) + \
+                     format(record["selfTime"]*1000, ".2f").rjust(13) + \
+                     format(percentage, ".1f").rjust(8)
+            if self._memory:
+                result = result + format(record["memory"]/1024, ".1f").rjust(14)
+            result = result + "\n"
+        result = result + "total".ljust(22) + "".rjust(8) + "".rjust(13) + format(totalSelfTime*1000, ".2f").rjust(13)
+        if self._memory:
+            result = result + "\npeak memory: " + format(self._peak/1024, ".1f") + " kB"
+        return result
+
+
+# testing only
+"""
+from directStiffnessMethod.structureFile import StructureFile
+
+structureFile = StructureFile()
+data = structureFile.read("exampleStructures/frame.txt")
+structure = structureFile.buildStructure(data["structureData"], data["unit"])
+structure.enableProfiling(memory=True)
+structure.packAllResult()
+structure.getAllResult()
+print(structure.getProfileTable())
+"""
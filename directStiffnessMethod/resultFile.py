@@ -0,0 +1,382 @@
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from directStiffnessMethod.analysisResult import AnalysisResult, ARRAYS
+from directStiffnessMethod.memberDiagram import PiecewisePolynomial
+from directStiffnessMethod.resultQuery import QUANTITIES
+
+
+MAGIC = b"IS2DRES\0"
+VERSION = 1
+
+# magic, version, number of sections, byte order of the arrays, model hash
+HEADER = struct.Struct("<8sIIc7x32s")
+
+# name, typecode, offset from the start of the file, number of items
+SECTION = struct.Struct("<32sc7xQQ")
+
+def getCanonicalValue(value):
+    """
+    Convert a value of the model into the same text however it is entered,
+    the numbers are compared as floats, so 1000 and 1000.0 are the same
+
+    :param value: number, string, None, list or dictionary
+    :return: the text
+    """
+    if value == None:
+        return ""
+    if isinstance(value, bool):
+        return str(value)
+    if isinstance(value, (int, float)):
+        if value == 0:
+            # no negative zero
+            value = 0
+        return repr(float(value))
+    if isinstance(value, dict):
+        items = []
+        for key in sorted(value):
+            items.append(str(key) + ":" + getCanonicalValue(value[key]))
+        return "{" + ",".join(items) + "}"
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join([getCanonicalValue(item) for item in value]) + "]"
+    return str(value)
+
+
+def getStructureHash(structure, unit):
+    """
+    Calculate the canonical hash of a built structure: the nodes with the restraints, the loads and the settlements,
+    and the members with the properties and the loads
+    The same model gets the same hash however it is entered, from a file or from the user interface,
+    it is the only hash of the model, for the saved result file and for the analysis cache
+
+    :param structure: the structure
+    :param unit: [force unit, length unit, decimal place] of the result
+    :return: SHA-256 hex string
+    """
+    lines = []
+    if unit != None:
+        lines.append(";".join([str(info) for info in unit]))
+
+    nodes = sorted(structure.getNodes(), key=lambda node: node.getID())
+    for node in nodes:
+        restraint = node.getRestraint()
+        if restraint == None or restraint == "":
+            restraint = "RRR"
+        lines.append("node;" + ";".join([getCanonicalValue(node.getID()), getCanonicalValue(node.getx()),
+                                         getCanonicalValue(node.gety()), restraint,
+                                         getCanonicalValue(node.getLoad()), getCanonicalValue(node.getSettlement())]))
+
+    # the order of the members is kept, it is the order of the result text
+    for member in structure.getMembers():
+        items = [getCanonicalValue(member.getId()), getCanonicalValue(member.geti()), getCanonicalValue(member.getj()),
+                 member.getType(), getCanonicalValue(member.getE())]
+        for name in ["getA", "getI"]:
+            if hasattr(member, name):
+                items.append(getCanonicalValue(getattr(member, name)()))
+            else:
+                items.append("")
+        items.append(getCanonicalValue(member.getP()))
+        if hasattr(member, "getMemberLoads"):
+            items.append(getCanonicalValue(member.getMemberLoads()))
+        lines.append("member;" + ";".join(items))
+    return hashlib.sha256("\n".join(lines).encode("utf-8")).hexdigest()
+
+
+def getByteOrder():
+    """
+    Return the byte order of this machine in the header of the binary files
+
+    :return: b"<" for little-endian, b">" for big-endian
+    """
+    if sys.byteorder == "big":
+        return b">"
+    return b"<"
+
+
+def readArray(buffer, byteOrder, typecode, offset, count):
+    """
+    Read an array of a binary file, it is a view of the buffer without copying,
+    unless the file is written on a machine of the other byte order
+
+    :param buffer: mapped file
+    :param byteOrder: byte order in the header of the file
+    :param typecode: typecode of the array
+    :param offset: offset of the array from the start of the file
+    :param count: number of items
+    :return: memoryview or array
+    """
+    view = memoryview(buffer)[offset:offset + count*array(typecode).itemsize]
+    if byteOrder == getByteOrder():
+        return view.cast(typecode)
+    data = array(typecode)
+    data.frombytes(view)
+    data.byteswap()
+    return data
+
+
+def writeArrays(filename, header, sections):
+    """
+    Write a binary file of the header, the table of the arrays (see SECTION) and the arrays
+    Every array starts at a multiple of 8 bytes, and the file is written beside and then renamed,
+    so an old file is never left half written and the processes writing the same file do not interfere
+
+    :param filename: path of the file
+    :param header: packed header
+    :param sections: list of [name, array or memoryview]
+    """
+    table = []
+    offset = len(header) + SECTION.size*len(sections)
+    for name, data in sections:
+        if not isinstance(data, array):
+            data = array(data.format, data)
+        offset = (offset + 7)//8*8
+        table.append([name, data, offset])
+        offset = offset + len(data)*data.itemsize
+
+    temporaryFilename = filename + "." + str(os.getpid()) + ".tmp"
+    fd = open(temporaryFilename, "wb")
+    try:
+        fd.write(header)
+        for name, data, offset in table:
+            fd.write(SECTION.pack(name.encode("ascii"), data.typecode.encode("ascii"), offset, len(data)))
+        for name, data, offset in table:
+            fd.write(b"\0"*(offset - fd.tell()))
+            data.tofile(fd)
+    finally:
+        fd.close()
+    os.replace(temporaryFilename, filename)
+
+
+def readSections(buffer, start, sectionNum, filename):
+    """
+    Read the table of the arrays of a binary file (see SECTION) and check that every array is inside the file,
+    so a truncated file is rejected when it is opened instead of giving a wrong result
+
+    :param buffer: mapped file
+    :param start: offset of the table from the start of the file
+    :param sectionNum: number of arrays in the table
+    :param filename: path of the file for the error message
+    :return: dictionary of the name to [typecode, offset, number of items]
+    """
+    if start + SECTION.size*sectionNum > len(buffer):
+        raise Exception(filename + ' is truncated!')
+    sections = {}
+    for index in range(sectionNum):
+        name, typecode, offset, count = SECTION.unpack_from(buffer, start + SECTION.size*index)
+        try:
+            name = name.rstrip(b"\0").decode("ascii")
+            typecode = typecode.decode("ascii")
+            size = array(typecode).itemsize
+        except (UnicodeDecodeError, ValueError):
+            raise Exception(filename + ' is corrupted!')
+        if offset + count*size > len(buffer):
+            raise Exception(filename + ' is truncated!')
+        sections[name] = [typecode, offset, count]
+    return sections
+
+
+def getResultFilename(filename):
+    """
+    Return the path of the result file next to a structure file
+
+    :param filename: path of the structure .txt file
+    :return: path of the .res file
+    """
+    return os.path.splitext(filename)[0] + ".res"
+
+
+class ResultFile(object):
+    """
+    Binary file of the analysis result, saved next to the structure file and reloaded without solving again
+    The file is a table of named arrays: rf, Rs and the arrays of AnalysisResult, the breakpoints and
+    the coefficients of the diagrams of every member, and the result text,
+    it is memory-mapped when opened, so only the header is read and each array is read when it is used
+    """
+
+    def __init__(self):
+        """
+        Initiating the result file
+        """
+        self._mmap = None
+        self._modelHash = None
+        self._byteOrder = None
+        self._sections = {}
+        self._arrays = {}
+        self._analysisResult = None
+
+
+    def write(self, filename, modelHash, report, analysisResult, query):
+        """
+        Write the analysis result into the binary file (see writeArrays)
+
+        :param filename: path of the .res file
+        :param modelHash: result of getStructureHash of the analysed model
+        :param report: the result text
+        :param analysisResult: the arrays of the result (see Analysis.getAnalysisResult)
+        :param query: the result query (see Analysis.getQuery)
+        """
+        sections = []
+        arrays = analysisResult.getArrays()
+        for name in ARRAYS:
+            sections.append([name, arrays[name]])
+
+        # the pieces of every member are stored one after another, the breakpoints have one more item each member,
+        # and the coefficients are padded with zero to the same number in each quantity
+        for quantity in QUANTITIES:
+            diagrams = []
+            width = 1
+            for memberId in query.getMemberIds():
+                diagram = query.getMemberResult(memberId).getDiagram(quantity)
+                diagrams.append(diagram)
+                for coefficients in diagram.getCoefficients():
+                    width = max(width, len(coefficients))
+
+            pieces = array("q", [0])
+            breakpoints = array("d")
+            coefficientArray = array("d")
+            for diagram in diagrams:
+                pieces.append(pieces[-1] + len(diagram.getCoefficients()))
+                breakpoints.extend(diagram.getBreakpoints())
+                for coefficients in diagram.getCoefficients():
+                    coefficientArray.extend(coefficients)
+                    coefficientArray.extend([0.0]*(width - len(coefficients)))
+            sections.append([quantity + ":pieces", pieces])
+            sections.append([quantity + ":breakpoints", breakpoints])
+            sections.append([quantity + ":coefficients", coefficientArray])
+
+        sections.append(["report", array("B", report.encode("utf-8"))])
+
+        header = HEADER.pack(MAGIC, VERSION, len(sections), getByteOrder(), bytes.fromhex(modelHash))
+        writeArrays(filename, header, sections)
+
+
+    def open(self, filename):
+        """
+        Memory-map the binary file and read its header, the arrays are not read,
+        but the table of the arrays is checked against the size of the file
+
+        :param filename: path of the .res file
+        :return: model hash of the result
+        """
+        fd = open(filename, "rb")
+        try:
+            if os.fstat(fd.fileno()).st_size < HEADER.size:
+                raise Exception(filename + ' is not a result file!')
+            self._mmap = mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+        finally:
+            fd.close()
+
+        magic, version, sectionNum, byteOrder, modelHash = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise Exception(filename + ' is not a result file!')
+        if version != VERSION:
+            raise Exception('Version ' + str(version) + ' of the result file is not supported!')
+        self._byteOrder = byteOrder
+        self._modelHash = modelHash.hex()
+
+        self._sections = readSections(self._mmap, HEADER.size, sectionNum, filename)
+        self._arrays = {}
+        self._analysisResult = None
+        names = ARRAYS + ["report"]
+        for quantity in QUANTITIES:
+            names = names + [quantity + ":pieces", quantity + ":breakpoints", quantity + ":coefficients"]
+        for name in names:
+            if name not in self._sections:
+                raise Exception('Array ' + name + ' is not found in the result file!')
+        return self._modelHash
+
+
+    def getModelHash(self):
+        """
+        Return the model hash of the opened result
+
+        :return: SHA-256 hex string
+        """
+        return self._modelHash
+
+
+    def getArray(self, name):
+        """
+        Return an array of the opened result, it is a view of the mapped file without copying,
+        unless the file is written on a machine of the other byte order
+
+        :param name: name of the array
+        :return: memoryview or array
+        """
+        if name not in self._sections:
+            raise Exception('Array ' + name + ' is not found in the result file!')
+        if name not in self._arrays:
+            typecode, offset, count = self._sections[name]
+            self._arrays[name] = readArray(self._mmap, self._byteOrder, typecode, offset, count)
+        return self._arrays[name]
+
+
+    def getAnalysisResult(self):
+        """
+        Return the analysis result restored from the arrays of the opened result
+
+        :return: the analysis result
+        """
+        if self._analysisResult == None:
+            arrays = {}
+            for name in ARRAYS:
+                arrays[name] = self.getArray(name)
+            self._analysisResult = AnalysisResult(arrays=arrays)
+        return self._analysisResult
+
+
+    def getDiagrams(self, memberId):
+        """
+        Read the diagrams of a member from the opened result
+
+        :param memberId: member ID
+        :return: dictionary of the quantity to the piecewise polynomial
+        """
+        index = self.getAnalysisResult().getMemberIndex(memberId)
+        result = {}
+        for quantity in QUANTITIES:
+            pieces = self.getArray(quantity + ":pieces")
+            breakpoints = self.getArray(quantity + ":breakpoints")
+            coefficientArray = self.getArray(quantity + ":coefficients")
+            start = pieces[index]
+            end = pieces[index + 1]
+            width = 0
+            if pieces[-1] != 0:
+                width = len(coefficientArray)//pieces[-1]
+
+            coefficients = []
+            for piece in range(start, end):
+                coefficients.append(list(coefficientArray[piece*width:(piece + 1)*width]))
+            result[quantity] = PiecewisePolynomial(list(breakpoints[start + index:end + index + 1]), coefficients)
+        return result
+
+
+    def load(self, structure):
+        """
+        Rebuild the result of the analysis from the opened result without solving the structure,
+        the packed result is rebuilt from the saved displacement, so it has the same keys as a solved result
+
+        :param structure: the structure of the result, it must have the model hash of the result
+        :return: dictionary of the packed result (see Structure.packAllResult) and "report", the same as Analysis.analyse
+        """
+        analysisResult = self.getAnalysisResult()
+        rf = [[value] for value in analysisResult.getrf()]
+        Rs = [[value] for value in analysisResult.getRs()]
+        result = structure.packAllResult(rf, Rs)
+        result["report"] = bytes(self.getArray("report")).decode("utf-8")
+        return result
+
+
+# testing only
+"""
+from directStiffnessMethod.analysis import Analysis
+
+analysis = Analysis()
+analysis.load("exampleStructures/frame.txt")
+result = analysis.analyse()
+analysis.saveResult(result, "exampleStructures/frame.res")
+print(analysis.loadResult("exampleStructures/frame.res")["report"])
+"""
@@ -0,0 +1,467 @@
+from directStiffnessMethod.memberDiagram import PiecewisePolynomial, createShearDiagram, evaluatePolynomial, getIntegral
+
+
+# quantities of the member result
+QUANTITIES = ["axialForce", "shear", "moment", "rotation", "deflection", "axialDisplacement"]
+
+
+class MemberResult(object):
+    """
+    Internal forces and deflection along a member, in the member local axes and the unit of the analysis [N], [mm]
+    They are exact piecewise polynomials built once from the member end forces, the member loads
+    and the nodal displacements at the ends:
+    N(x) tension positive, V(x) = dM/dx, M(x) sagging positive, EI v'' = M(x) for the deflection v(x)
+    and EA u' = N(x) for the axial displacement u(x)
+    The deflection is the same as the cubic Hermite interpolation of the end displacements and rotations
+    plus the fixed-end deflection of the member loads, so no intermediate node is needed
+    """
+
+    def __init__(self, member, memberForce, r_e, diagrams=None):
+        """
+        Initiating the member result
+
+        :param member: required member
+        :param memberForce: member force of the member (see Structure.getMemberForce)
+        :param r_e: nodal displacement of the member in the global axes (list of value)
+        :param diagrams: dictionary of the quantity to the saved piecewise polynomial,
+        they are used instead of being built from the member force if not None
+        """
+        self._member = member
+        if diagrams != None:
+            self._diagrams = diagrams
+            return
+
+        L = member.getL()
+        type = member.getType()
+
+        # end forces and displacements in the member local axes
+        if type == "truss":
+            c = member.getc()
+            s = member.gets()
+            Fx = -memberForce
+            Fy = 0
+            Mi = 0
+            ui = c*r_e[0] + s*r_e[1]
+            vi = -s*r_e[0] + c*r_e[1]
+            vj = -s*r_e[2] + c*r_e[3]
+            thetai = (vj - vi)/L
+            loads = {"pointLoad": [], "uniformlyDistributedLoad": []}
+        elif type == "beam":
+            Fx = 0
+            Fy = memberForce[0][0]
+            Mi = memberForce[1][0]
+            ui = 0
+            vi = r_e[0]
+            thetai = r_e[1]
+            loads = member.getMemberLoads()
+        else:
+            Fx = memberForce[0][0]
+            Fy = memberForce[1][0]
+            Mi = memberForce[2][0]
+            LD = member.getLD()
+            ui = 0
+            vi = 0
+            thetai = 0
+            for b in range(6):
+                ui = ui + LD[0][b]*r_e[b]
+                vi = vi + LD[1][b]*r_e[b]
+                thetai = thetai + LD[2][b]*r_e[b]
+            loads = member.getMemberLoads()
+
+        # N(x) = -(Fx,i + axial point loads at or before x)
+        axialLoads = [[0, -Fx]]
+        for a, P in loads.get("axialPointLoad", []):
+            axialLoads.append([a, -P])
+        axialForce = createShearDiagram({"pointLoad": axialLoads, "uniformlyDistributedLoad": []}, L)
+        self._diagrams = {"axialForce": axialForce}
+
+        # u(x) = ui + integral of N/EA
+        EA = 0
+        if type != "beam":
+            EA = member.getE()*member.getA()
+        axialDisplacement = []
+        u = ui
+        for piece in range(len(axialForce.getCoefficients())):
+            strain = []
+            for coefficient in axialForce.getCoefficients()[piece]:
+                if EA == 0:
+                    strain.append(0)
+                else:
+                    strain.append(coefficient/EA)
+            coefficients = getIntegral(strain, u)
+            axialDisplacement.append(coefficients)
+            u = evaluatePolynomial(coefficients, axialForce.getBreakpoints()[piece + 1] - axialForce.getBreakpoints()[piece])
+        self._diagrams["axialDisplacement"] = PiecewisePolynomial(axialForce.getBreakpoints(), axialDisplacement)
+
+        # V(x) = Fy,i + transverse point loads at or before x + w*x
+        pointLoads = [[0, Fy]] + loads["pointLoad"]
+        shear = createShearDiagram({"pointLoad": pointLoads, "uniformlyDistributedLoad": loads["uniformlyDistributedLoad"]}, L)
+        self._diagrams["shear"] = shear
+
+        # M(x) = -Mi + integral of V, then the rotation and the deflection by EI v'' = M
+        EI = 0
+        if type != "truss":
+            EI = member.getEI()
+        breakpoints = shear.getBreakpoints()
+        moment = []
+        rotation = []
+        deflection = []
+        M = -Mi
+        theta = thetai
+        v = vi
+        for piece in range(len(shear.getCoefficients())):
+            length = breakpoints[piece + 1] - breakpoints[piece]
+            momentCoefficients = getIntegral(shear.getCoefficients()[piece], M)
+            curvature = []
+            for coefficient in momentCoefficients:
+                if EI == 0:
+                    curvature.append(0)
+                else:
+                    curvature.append(coefficient/EI)
+            rotationCoefficients = getIntegral(curvature, theta)
+            deflectionCoefficients = getIntegral(rotationCoefficients, v)
+
+            moment.append(momentCoefficients)
+            rotation.append(rotationCoefficients)
+            deflection.append(deflectionCoefficients)
+            M = evaluatePolynomial(momentCoefficients, length)
+            theta = evaluatePolynomial(rotationCoefficients, length)
+            v = evaluatePolynomial(deflectionCoefficients, length)
+
+        self._diagrams["moment"] = PiecewisePolynomial(breakpoints, moment)
+        self._diagrams["rotation"] = PiecewisePolynomial(breakpoints, rotation)
+        self._diagrams["deflection"] = PiecewisePolynomial(breakpoints, deflection)
+
+
+    def getMember(self):
+        """
+        Return the member of the result
+
+        :return: the member
+        """
+        return self._member
+
+
+    def getDiagrams(self):
+        """
+        Return the piecewise polynomial of every quantity
+
+        :return: dictionary of the quantity to the piecewise polynomial
+        """
+        return self._diagrams
+
+
+    def getDiagram(self, quantity):
+        """
+        Return the piecewise polynomial of a quantity
+
+        :param quantity: "axialForce", "shear", "moment", "rotation", "deflection" or "axialDisplacement"
+        :return: the piecewise polynomial
+        """
+        if quantity not in self._diagrams:
+            raise Exception('Unknown quantity ' + str(quantity) + '!')
+        return self._diagrams[quantity]
+
+
+    def getValue(self, quantity, x):
+        """
+        Return the value of a quantity at x, or the values at a list of x
+
+        :param quantity: "axialForce", "shear", "moment", "rotation", "deflection" or "axialDisplacement"
+        :param x: distance from the starting node, or list of distance
+        :return: value, or list of value
+        """
+        diagram = self.getDiagram(quantity)
+        if isinstance(x, (list, tuple, range)):
+            return diagram.getValues(x)
+        return diagram.getValue(x)
+
+
+    def getAxialForce(self, x):
+        """
+        Return the axial force (tension positive) at x, or the values at a list of x
+
+        :param x: distance from the starting node, or list of distance
+        :return: value, or list of value
+        """
+        return self.getValue("axialForce", x)
+
+
+    def getShear(self, x):
+        """
+        Return the shear force at x, or the values at a list of x
+
+        :param x: distance from the starting node, or list of distance
+        :return: value, or list of value
+        """
+        return self.getValue("shear", x)
+
+
+    def getMoment(self, x):
+        """
+        Return the bending moment (sagging positive) at x, or the values at a list of x
+
+        :param x: distance from the starting node, or list of distance
+        :return: value, or list of value
+        """
+        return self.getValue("moment", x)
+
+
+    def getRotation(self, x):
+        """
+        Return the rotation at x, or the values at a list of x
+
+        :param x: distance from the starting node, or list of distance
+        :return: value, or list of value
+        """
+        return self.getValue("rotation", x)
+
+
+    def getDeflection(self, x):
+        """
+        Return the deflection in the member local y axis at x, or the values at a list of x
+
+        :param x: distance from the starting node, or list of distance
+        :return: value, or list of value
+        """
+        return self.getValue("deflection", x)
+
+
+    def getDeflectedShape(self, xi, yi, step):
+        """
+        Return the deflected shape of the member in the global axes
+        The stations are adaptive: about one for each step on the curved deflection,
+        the exact peaks, and the breakpoints of the axial displacement
+
+        :param xi: x coordinate of the starting node
+        :param yi: y coordinate of the starting node
+        :param step: distance between the stations along the member
+        :return: list of [x, y] of the deflected member
+        """
+        stations = []
+        for x, v in self._diagrams["deflection"].getDrawingPoints(step):
+            if x <= self._member.getL():
+                stations.append(x)
+        for x in self._diagrams["axialDisplacement"].getBreakpoints():
+            if x <= self._member.getL():
+                stations.append(x)
+        stations = sorted(set(stations))
+        u = self._diagrams["axialDisplacement"].getValues(stations)
+        v = self._diagrams["deflection"].getValues(stations)
+
+        # the beam displacements are in the global axes, the others in the member local axes
+        if self._member.getType() == "beam":
+            x_axis = self._member.get_x_Axis()
+            length = (x_axis[0][0]**2 + x_axis[1][0]**2)**0.5
+            c = x_axis[0][0]/length
+            s = x_axis[1][0]/length
+            result = []
+            for index in range(len(stations)):
+                result.append([xi + stations[index]*c, yi + stations[index]*s + v[index]])
+            return result
+
+        c = self._member.getc()
+        s = self._member.gets()
+        result = []
+        for index in range(len(stations)):
+            x = stations[index] + u[index]
+            result.append([xi + x*c - v[index]*s, yi + x*s + v[index]*c])
+        return result
+
+
+    def getMax(self, quantity):
+        """
+        Return the maximum value of a quantity along the member
+
+        :param quantity: "axialForce", "shear", "moment", "rotation", "deflection" or "axialDisplacement"
+        :return: [x, value]
+        """
+        return self.getDiagram(quantity).getMax()
+
+
+    def getMin(self, quantity):
+        """
+        Return the minimum value of a quantity along the member
+
+        :param quantity: "axialForce", "shear", "moment", "rotation", "deflection" or "axialDisplacement"
+        :return: [x, value]
+        """
+        return self.getDiagram(quantity).getMin()
+
+
+class ResultQuery(object):
+    """
+    Point queries of the analysis result on any member
+    The result of every member is precomputed once from a single solve of the structure,
+    or read on demand from the saved diagrams of a result file
+    """
+
+    def __init__(self, structure, rf=None, resultFile=None):
+        """
+        Initiating the result query
+
+        :param structure: structure for analysis
+        :param rf: result of getrf, it is calculated if None
+        :param resultFile: opened result file (see ResultFile), the diagrams of each member are read from it
+        when the member is queried instead of being built if not None
+        """
+        self._coordinates = {}
+        for node in structure.getNodes():
+            self._coordinates[node.getID()] = [node.getx(), node.gety()]
+
+        self._memberResults = {}
+        self._memberIds = []
+        self._members = {}
+        self._resultFile = resultFile
+        if resultFile != None:
+            for member in structure.getMembers():
+                self._members[member.getId()] = member
+                self._memberIds.append(member.getId())
+            return
+
+        if rf == None:
+            rf = structure.getrf()
+        r = structure.getNodalDisplacementResult(rf)
+        memberForce = structure.getAllMemberForce(r)
+        dofMap = structure.getDofMap()
+
+        for member in structure.getMembers():
+            r_e = []
+            for index in structure.getMemberDofIndex(member, dofMap):
+                r_e.append(r[index])
+            self._memberResults[member.getId()] = MemberResult(member, memberForce[member.getId()], r_e)
+            self._memberIds.append(member.getId())
+
+
+    def getMemberIds(self):
+        """
+        Return the ID of every member
+
+        :return: list of member ID
+        """
+        return self._memberIds
+
+
+    def getMemberResult(self, memberId):
+        """
+        Return the result of a member
+
+        :param memberId: member ID
+        :return: the member result
+        """
+        if memberId not in self._memberResults:
+            if memberId not in self._members:
+                raise Exception('Member ' + str(memberId) + ' is not found!')
+            diagrams = self._resultFile.getDiagrams(memberId)
+            self._memberResults[memberId] = MemberResult(self._members[memberId], None, None, diagrams)
+        return self._memberResults[memberId]
+
+
+    def getValue(self, memberId, quantity, x):
+        """
+        Return the value of a quantity of a member at x, or the values at a list of x
+
+        :param memberId: member ID
+        :param quantity: "axialForce", "shear", "moment", "rotation", "deflection" or "axialDisplacement"
+        :param x: distance from the starting node, or list of distance
+        :return: value, or list of value
+        """
+        return self.getMemberResult(memberId).getValue(quantity, x)
+
+
+    def getAxialForce(self, memberId, x):
+        """
+        Return the axial force (tension positive) of a member at x, or the values at a list of x
+
+        :param memberId: member ID
+        :param x: distance from the starting node, or list of distance
+        :return: value, or list of value
+        """
+        return self.getValue(memberId, "axialForce", x)
+
+
+    def getShear(self, memberId, x):
+        """
+        Return the shear force of a member at x, or the values at a list of x
+
+        :param memberId: member ID
+        :param x: distance from the starting node, or list of distance
+        :return: value, or list of value
+        """
+        return self.getValue(memberId, "shear", x)
+
+
+    def getMoment(self, memberId, x):
+        """
+        Return the bending moment (sagging positive) of a member at x, or the values at a list of x
+
+        :param memberId: member ID
+        :param x: distance from the starting node, or list of distance
+        :return: value, or list of value
+        """
+        return self.getValue(memberId, "moment", x)
+
+
+    def getDeflection(self, memberId, x):
+        """
+        Return the deflection in the member local y axis of a member at x, or the values at a list of x
+
+        :param memberId: member ID
+        :param x: distance from the starting node, or list of distance
+        :return: value, or list of value
+        """
+        return self.getValue(memberId, "deflection", x)
+
+
+    def getDeflectedShape(self, step, memberIds=None):
+        """
+        Return the deflected shape of the members in the global axes, at adaptive stations along each member
+
+        :param step: distance between the stations along the member, about one pixel for drawing
+        :param memberIds: list of member ID, every member if None
+        :return: dictionary of member ID to list of [x, y]
+        """
+        if memberIds == None:
+            memberIds = self._memberIds
+        result = {}
+        for memberId in memberIds:
+            memberResult = self.getMemberResult(memberId)
+            xi, yi = self._coordinates[memberResult.getMember().geti()]
+            result[memberId] = memberResult.getDeflectedShape(xi, yi, step)
+        return result
+
+
+    def getMax(self, memberId, quantity):
+        """
+        Return the maximum value of a quantity of a member
+
+        :param memberId: member ID
+        :param quantity: "axialForce", "shear", "moment", "rotation", "deflection" or "axialDisplacement"
+        :return: [x, value]
+        """
+        return self.getMemberResult(memberId).getMax(quantity)
+
+
+    def getMin(self, memberId, quantity):
+        """
+        Return the minimum value of a quantity of a member
+
+        :param memberId: member ID
+        :param quantity: "axialForce", "shear", "moment", "rotation", "deflection" or "axialDisplacement"
+        :return: [x, value]
+        """
+        return self.getMemberResult(memberId).getMin(quantity)
+
+
+# testing only
+"""
+from directStiffnessMethod.analysis import Analysis
+
+analysis = Analysis()
+analysis.analyseFile("exampleStructures/frame.txt")
+query = analysis.getQuery()
+print(query.getMoment(1, [0, 1000, 2000, 3000]))
+print(query.getMax(1, "moment"))
+print(query.getDeflection(1, 1500))
+print(query.getDeflectedShape(100)[1])
+"""
@@ -0,0 +1,322 @@
+import time
+from directStiffnessMethod.sensitivity import Sensitivity
+
+
+class SectionOptimizer(object):
+    """
+    Section sizing of the members from a section catalogue for the minimum weight,
+    subject to the displacement limit and the stress limit
+    """
+
+    def __init__(self, structure, catalogue, displacementLimit, stressLimit, memberIds=None, density=1):
+        """
+        Initiating the section optimizer
+
+        :param structure: structure for analysis, the member sections are changed by the optimizer
+        :param catalogue: list of section [name, A, I, Z], Z is the elastic section modulus
+        :param displacementLimit: limit of the absolute translational displacement
+        :param stressLimit: limit of the absolute stress N/A + M/Z
+        :param memberIds: member IDs to be sized, all the members are sized if None
+        :param density: weight of unit volume
+        """
+        if len(catalogue) == 0:
+            raise Exception('Section catalogue is empty!')
+
+        self._structure = structure
+        self._catalogue = sorted(catalogue, key=lambda section: section[1])
+        self._displacementLimit = displacementLimit
+        self._stressLimit = stressLimit
+        self._density = density
+        self._log = []
+
+        self._members = {}
+        for member in structure.getMembers():
+            if memberIds == None or member.getId() in memberIds:
+                self._members[member.getId()] = member
+        if memberIds != None:
+            for memberId in memberIds:
+                if memberId not in self._members:
+                    raise Exception('Member ' + str(memberId) + ' does not exist!')
+
+        self._sectionIndex = {}
+        self._minimumIndex = {}
+        for memberId in self._members:
+            self._sectionIndex[memberId] = 0
+            self._minimumIndex[memberId] = 0
+
+
+    def setSection(self, memberId, index):
+        """
+        Change the section of a member to a section of the catalogue
+
+        :param memberId: member ID
+        :param index: index of the section in the catalogue
+        """
+        name, A, I, Z = self._catalogue[index]
+        self._sectionIndex[memberId] = index
+        self._structure.setMemberSection(memberId, A, I)
+
+
+    def getWeight(self):
+        """
+        Calculate the weight of the sized members
+
+        :return: the weight
+        """
+        result = 0
+        for memberId in self._members:
+            A = self._catalogue[self._sectionIndex[memberId]][1]
+            result = result + self._density*A*self._members[memberId].getL()
+        return result
+
+
+    def getMemberAction(self, member, memberForce):
+        """
+        Find the maximum axial force and bending moment of a member
+        The bending moment is checked at the stations and under the point loads
+
+        :param member: required member
+        :param memberForce: member force of the member
+        :return: [absolute axial force, absolute bending moment]
+        """
+        if member.getType() == "truss":
+            return [abs(memberForce[0]), 0]
+
+        if member.getType() == "beam":
+            axial = 0
+            momentI = memberForce[1]
+            momentJ = memberForce[3]
+        else:
+            axial = abs(memberForce[0])
+            momentI = memberForce[2]
+            momentJ = memberForce[5]
+
+        L = member.getL()
+        memberLoads = member.getMemberLoads()
+        stations = []
+        for step in range(21):
+            stations.append(L*step/20)
+        for a, P in memberLoads["pointLoad"]:
+            stations.append(a)
+
+        moment = 0
+        for x in stations:
+            bending = momentI*(L-x)/L - momentJ*x/L
+            for a, P in memberLoads["pointLoad"]:
+                if a <= x:
+                    bending = bending + P*(L-x)*a/L
+                else:
+                    bending = bending + P*x*(L-a)/L
+            for w in memberLoads["uniformlyDistributedLoad"]:
+                bending = bending + w*x*(L-x)/2
+            moment = max(moment, abs(bending))
+        return [axial, moment]
+
+
+    def getStressRatio(self, member, action, index):
+        """
+        Calculate the stress ratio of a member for a section of the catalogue
+
+        :param member: required member
+        :param action: [absolute axial force, absolute bending moment]
+        :param index: index of the section in the catalogue
+        :return: stress / stress limit
+        """
+        name, A, I, Z = self._catalogue[index]
+        stress = action[0]/A
+        if action[1] != 0:
+            stress = stress + action[1]/Z
+        return stress/self._stressLimit
+
+
+    def getMaxDisplacement(self, result):
+        """
+        Find the maximum absolute translational displacement
+
+        :param result: result of the reanalysis
+        :return: [name, displacement]
+        """
+        nodalDisplacement = self._structure.getNodalDisplacement()
+        freeIndex = self._structure.getStiffnessKernel().getFreeIndex()
+        name = None
+        value = 0
+        for index in range(len(freeIndex)):
+            displacementName = nodalDisplacement[freeIndex[index]]
+            if "u" in displacementName or "v" in displacementName:
+                if name == None or abs(result["rf"][index]) > abs(value):
+                    name = displacementName
+                    value = result["rf"][index]
+        return [name, value]
+
+
+    def upgradeForDisplacement(self, name, value, analysis=None):
+        """
+        Upgrade the sections with the best displacement reduction per weight,
+        until the linear estimate of the displacement meets the limit
+
+        :param name: name of the governing displacement
+        :param value: value of the governing displacement
+        :param analysis: result of Structure.reanalyse with the current sections, its decomposition is reused,
+        the structure is solved again if None
+        :return: list of upgraded member ID
+        """
+        gradient = Sensitivity(self._structure, analysis).calculate([name])[name]["gradient"]
+        sign = 1
+        if value < 0:
+            sign = -1
+
+        estimate = abs(value)
+        upgraded = []
+        while estimate > self._displacementLimit:
+            best = None
+            for memberId, dE, dA, dI in gradient:
+                if memberId not in self._members:
+                    continue
+                index = self._sectionIndex[memberId]
+                if index + 1 >= len(self._catalogue):
+                    continue
+                current = self._catalogue[index]
+                next = self._catalogue[index + 1]
+                change = sign*(dA*(next[1] - current[1]) + dI*(next[2] - current[2]))
+                cost = (next[1] - current[1])*self._members[memberId].getL()
+                if change >= 0:
+                    continue
+                if cost <= 0:
+                    cost = 1e-12
+                if best == None or change/cost < best[1]/best[2]:
+                    best = [memberId, change, cost]
+
+            if best == None:
+                break
+            memberId = best[0]
+            self._minimumIndex[memberId] = self._sectionIndex[memberId] + 1
+            self._sectionIndex[memberId] = self._sectionIndex[memberId] + 1
+            estimate = estimate + best[1]
+
+            # the gradient is only valid for the section used in the analysis
+            for item in gradient:
+                if item[0] == memberId:
+                    gradient.remove(item)
+                    break
+            upgraded.append(memberId)
+        return upgraded
+
+
+    def run(self, maxIteration=30):
+        """
+        Run the section sizing
+        Each iteration resizes the members for the stress (fully stressed design) and upgrades the members
+        with the best sensitivity for the displacement, then reanalyses the structure by Structure.reanalyse
+
+        :param maxIteration: maximum number of iterations
+        :return: dictionary of "converged", "weight", "section" (list of [member ID, section name]) and "log"
+        """
+        self._log = []
+        for memberId in self._members:
+            self.setSection(memberId, self._minimumIndex[memberId])
+
+        converged = False
+        for iteration in range(1, maxIteration + 1):
+            timing = {}
+            result = self._structure.reanalyse()
+            timing.update(result["time"])
+
+            start = time.perf_counter()
+            required = {}
+            maxStressRatio = 0
+            for memberId in self._members:
+                member = self._members[memberId]
+                action = self.getMemberAction(member, result["memberForce"][memberId])
+                maxStressRatio = max(maxStressRatio, self.getStressRatio(member, action, self._sectionIndex[memberId]))
+                index = self._minimumIndex[memberId]
+                while index + 1 < len(self._catalogue) and self.getStressRatio(member, action, index) > 1:
+                    index = index + 1
+                required[memberId] = index
+            timing["stress"] = time.perf_counter() - start
+
+            name, displacement = self.getMaxDisplacement(result)
+            feasible = maxStressRatio <= 1 and abs(displacement) <= self._displacementLimit
+            weight = self.getWeight()
+
+            start = time.perf_counter()
+            upgraded = []
+            if abs(displacement) > self._displacementLimit and name != None:
+                upgraded = self.upgradeForDisplacement(name, displacement, result)
+            timing["sensitivity"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            changed = []
+            for memberId in self._members:
+                index = max(required[memberId], self._minimumIndex[memberId])
+                if memberId in upgraded or index != self._sectionIndex[memberId]:
+                    changed.append(memberId)
+                self.setSection(memberId, index)
+            timing["resize"] = time.perf_counter() - start
+
+            self._log.append({"iteration": iteration, "weight": weight, "maxDisplacement": displacement,
+                              "maxStressRatio": maxStressRatio, "feasible": feasible, "changed": changed,
+                              "time": timing})
+            if len(changed) == 0:
+                converged = feasible
+                break
+
+        result = {"converged": converged, "weight": self.getWeight(), "section": [], "log": self._log}
+        for memberId in self._members:
+            result["section"].append([memberId, self._catalogue[self._sectionIndex[memberId]][0]])
+        return result
+
+
+    def getLog(self):
+        """
+        Return the log of the last run
+
+        :return: list of dictionary for each iteration
+        """
+        return self._log
+
+
+    def printLog(self):
+        """
+        Display the convergence and timing log for read
+        """
+        for item in self._log:
+            timing = ""
+            for step in item["time"]:
+                timing = timing + " " + step + "=" + format(item["time"][step]*1000, ".2f") + "ms"
+            print("iteration " + str(item["iteration"]) +
+                  ": weight = " + format(item["weight"], "5.4e") +
+                  ", max displacement = " + format(item["maxDisplacement"], "5.2e") +
+                  ", max stress ratio = " + str(round(item["maxStressRatio"], 3)) +
+                  ", changed = " + str(item["changed"]))
+            print("    time:" + timing)
+
+
+# testing only
+"""
+from directStiffnessMethod.structure import Structure
+
+structure = Structure()
+structure.addNode(1,0,0,"FFF")
+structure.addNode(2,0,6000,"RRR")
+structure.addNode(3,8000,6000,"RRR")
+structure.addNode(4,8000,0,"FFF")
+
+structure.addMember(1,1,2,10**4,10**8,2*(10**5),"frame")
+structure.addMember(2,2,3,10**4,10**8,2*(10**5),"frame")
+structure.addMember(3,3,4,10**4,10**8,2*(10**5),"frame")
+
+structure.addNodalLoad(2, 50000, 0, 0)
+structure.addMemberUniformlyDistributedLoad(2, -20)
+
+catalogue = [["310UB32.4", 4140, 6.37*(10**7), 4.15*(10**5)],
+             ["360UB44.7", 5720, 1.21*(10**8), 6.90*(10**5)],
+             ["410UB53.7", 6890, 1.88*(10**8), 9.39*(10**5)],
+             ["460UB67.1", 8540, 2.96*(10**8), 1.30*(10**6)],
+             ["530UB82.0", 10500, 4.77*(10**8), 1.81*(10**6)],
+             ["610UB101", 13000, 7.61*(10**8), 2.52*(10**6)]]
+
+optimizer = SectionOptimizer(structure, catalogue, 20, 250)
+result = optimizer.run()
+optimizer.printLog()
+print(result["converged"], result["weight"], result["section"])
+"""
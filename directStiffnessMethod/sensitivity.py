@@ -0,0 +1,230 @@
+from directStiffnessMethod import matrixCalculation
+
+
+class Sensitivity(object):
+    """
+    Adjoint sensitivity analysis of the responses with respect to the section properties of every member
+    The member stiffness is E*(A*KA + I*KI), so dKe/dE = A*KA + I*KI, dKe/dA = E*KA and dKe/dI = E*KI
+    """
+
+    def __init__(self, structure, analysis=None):
+        """
+        Initiating the sensitivity analysis and solve the structure once
+
+        :param structure: structure for analysis
+        :param analysis: result of Structure.reanalyse with the current sections,
+        its displacement and decomposition of Kff are reused instead of solving again if not None
+        """
+        self._structure = structure
+        self._kernel = structure.getStiffnessKernel()
+        self._matrixCalculator = matrixCalculation.MatrixCalculation()
+        self._names = self._kernel.getResponseName()
+
+        kernel = self._kernel
+        if analysis != None:
+            self._Ksf, self._factor, self._memberP = analysis["system"]
+            self._rf = analysis["rf"]
+            self._Rs = analysis["reactionForce"]
+            self._r = analysis["nodalDisplacement"]
+            return
+
+        self._Kff, self._Ksf, Kss = kernel.assemble()
+        self._factor = kernel.decompose(self._Kff)
+        Rf_Pf, Ps, memberP = kernel.getLoadBasis()
+        self._memberP = memberP[0]
+        rs = kernel.getSupportDisplacement()
+        Rf_Pf, Ps = kernel.applySettlement(Rf_Pf, Ps, self._Ksf, Kss, rs)
+
+        self._rf = []
+        for row in self._matrixCalculator.luSolve(self._factor, Rf_Pf):
+            self._rf.append(row[0])
+        Rs = self._matrixCalculator.matrixMultiplication(self._Ksf, self.convertListToMatrixForm(self._rf))
+        self._Rs = []
+        for row in range(len(Rs)):
+            self._Rs.append(Rs[row][0] + Ps[row][0])
+
+        self._r = [0]*kernel.getDofNum()
+        freeIndex = kernel.getFreeIndex()
+        for index in range(len(freeIndex)):
+            self._r[freeIndex[index]] = self._rf[index]
+        supportIndex = kernel.getSupportIndex()
+        for index in range(len(supportIndex)):
+            self._r[supportIndex[index]] = rs[index]
+
+
+    def convertListToMatrixForm(self, itemList):
+        """
+        Convert one-way array to two-way array
+
+        :param itemList: one-way array
+        :return: two-way array
+        """
+        resultMatrix = []
+        for item in itemList:
+            resultMatrix.append([item,])
+        return resultMatrix
+
+
+    def getResponseName(self):
+        """
+        Return the name of every response that can be required
+
+        :return: list of name
+        """
+        return self._names
+
+
+    def getMemberResponse(self, name):
+        """
+        Find the member and the row of the member force for a member force name
+
+        :param name: member force name
+        :return: [member ID, row of the member force]
+        """
+        for memberId in self._kernel.getMemberIds():
+            for member in self._structure.getMembers():
+                if member.getId() == memberId:
+                    names = self._structure.getMemberForceName(member)
+                    if name in names:
+                        return [memberId, names.index(name)]
+        raise Exception('Unknown response ' + str(name) + '!')
+
+
+    def getMemberDisplacement(self, memberId, vector):
+        """
+        Pick the nodal displacement of a member from a global vector
+
+        :param memberId: member ID
+        :param vector: global vector
+        :return: list of value
+        """
+        result = []
+        for index in self._kernel.getMemberDofIndex(memberId):
+            result.append(vector[index])
+        return result
+
+
+    def calculate(self, responseNames):
+        """
+        Calculate the gradient of the responses with respect to E, A and I of every member
+        All the adjoint equations are solved together by the decomposition of Kff
+
+        :param responseNames: list of response name, such as "v2", "Fy,1" or "M,j (3)"
+        :return: dictionary of response name to {"value": response value,
+        "gradient": list of [member ID, dJ/dE, dJ/dA, dJ/dI]}
+        """
+        kernel = self._kernel
+        freeIndex = kernel.getFreeIndex()
+        supportIndex = kernel.getSupportIndex()
+        freeNum = len(freeIndex)
+        memberIds = kernel.getMemberIds()
+        freePosition = {}
+        for index in range(freeNum):
+            freePosition[freeIndex[index]] = index
+
+        # adjoint loading g and the explicit part of the derivative for each response
+        G = []
+        for row in range(freeNum):
+            G.append([0]*len(responseNames))
+        values = []
+        explicit = []
+        for col in range(len(responseNames)):
+            name = responseNames[col]
+            if name in self._names and self._names.index(name) < freeNum:
+                index = self._names.index(name)
+                G[index][col] = 1
+                values.append(self._rf[index])
+                explicit.append(None)
+
+            elif name in self._names and self._names.index(name) < freeNum + len(supportIndex):
+                index = self._names.index(name) - freeNum
+                for row in range(freeNum):
+                    G[row][col] = self._Ksf[index][row]
+                values.append(self._Rs[index])
+                explicit.append(["reaction", supportIndex[index]])
+
+            else:
+                memberId, forceRow = self.getMemberResponse(name)
+                E, A, I = kernel.getMemberProperty(memberId)
+                t = kernel.getMemberForceTransform(memberId)[forceRow]
+                Ke = kernel.getMemberStiffness(memberId, E, A, I)
+                dofIndex = kernel.getMemberDofIndex(memberId)
+                r_e = self.getMemberDisplacement(memberId, self._r)
+                Pe = self._memberP.get(memberId, [0]*len(dofIndex))
+                values.append(kernel.calculateMemberForce(memberId, r_e, Pe, E, A, I)[forceRow])
+
+                for b in range(len(dofIndex)):
+                    value = 0
+                    for a in range(len(dofIndex)):
+                        value = value + t[a]*Ke[a][b]
+                    if dofIndex[b] in freePosition:
+                        G[freePosition[dofIndex[b]]][col] += value
+                explicit.append(["member", memberId, t])
+
+        # Kff is symmetric, so the adjoint equations use the same decomposition
+        adjoint = self._matrixCalculator.luSolve(self._factor, G)
+
+        result = {}
+        for col in range(len(responseNames)):
+            result[responseNames[col]] = {"value": values[col], "gradient": []}
+
+        for memberId in memberIds:
+            E, A, I = kernel.getMemberProperty(memberId)
+            KA, KI = kernel.getMemberKernel(memberId)
+            dofIndex = kernel.getMemberDofIndex(memberId)
+            r_e = self.getMemberDisplacement(memberId, self._r)
+
+            # dKe/dp * r_e for p = E, A, I
+            dKr = [[], [], []]
+            for a in range(len(dofIndex)):
+                KAr = 0
+                KIr = 0
+                for b in range(len(dofIndex)):
+                    KAr = KAr + KA[a][b]*r_e[b]
+                    KIr = KIr + KI[a][b]*r_e[b]
+                dKr[0].append(A*KAr + I*KIr)
+                dKr[1].append(E*KAr)
+                dKr[2].append(E*KIr)
+
+            for col in range(len(responseNames)):
+                gradient = [memberId]
+                for p in range(3):
+                    value = 0
+                    for a in range(len(dofIndex)):
+                        if dofIndex[a] in freePosition:
+                            value = value - adjoint[freePosition[dofIndex[a]]][col]*dKr[p][a]
+
+                    if explicit[col] != None and explicit[col][0] == "reaction":
+                        for a in range(len(dofIndex)):
+                            if dofIndex[a] == explicit[col][1]:
+                                value = value + dKr[p][a]
+                    elif explicit[col] != None and explicit[col][1] == memberId:
+                        t = explicit[col][2]
+                        for a in range(len(dofIndex)):
+                            value = value + t[a]*dKr[p][a]
+                    gradient.append(value)
+                result[responseNames[col]]["gradient"].append(gradient)
+        return result
+
+
+# testing only
+"""
+from directStiffnessMethod.structure import Structure
+
+structure = Structure()
+structure.addNode(1,0,0,"FFF")
+structure.addNode(2,3000,6000,"RRR")
+structure.addNode(3,8000,6000,"FFF")
+
+structure.addMember(1,1,2,(10**4),(10**7),2*(10**5),"frame")
+structure.addMember(2,2,3,(10**4),(10**7),2*(10**5),"frame")
+
+structure.addGlobalMemberPointLoad(2,2500,0,-10000)
+
+sensitivity = Sensitivity(structure)
+result = sensitivity.calculate(["v2", "M1", "M,j (2)"])
+for name in result:
+    print(name, result[name]["value"])
+    for gradient in result[name]["gradient"]:
+        print(gradient)
+"""
@@ -0,0 +1,435 @@
+from directStiffnessMethod import matrixCalculation
+from directStiffnessMethod.trussElement import TrussElement
+from directStiffnessMethod.beamElement import BeamElement
+from directStiffnessMethod.frameElement import FrameElement
+
+
+class StiffnessKernel(object):
+    """
+    Unit stiffness kernels of the members for assembling the stiffness matrix with new section properties
+    The member stiffness is E*(A*KA + I*KI), KA and KI only depend on the geometry of the structure
+    """
+
+    def __init__(self, structure):
+        """
+        Initiating the stiffness kernel
+
+        :param structure: structure for analysis
+        """
+        self._structure = structure
+        self._matrixCalculator = matrixCalculation.MatrixCalculation()
+
+        self._dofMap = structure.getDofMap()
+        self._freeIndex = structure.getFreeNodalIndex()
+        self._supportIndex = structure.getSupportNodalIndex()
+        self._dofNum = len(self._freeIndex) + len(self._supportIndex)
+
+        # position of each global index inside Kff (True) or Ksf/Kss (False)
+        self._position = {}
+        for index in range(len(self._freeIndex)):
+            self._position[self._freeIndex[index]] = [True, index]
+        for index in range(len(self._supportIndex)):
+            self._position[self._supportIndex[index]] = [False, index]
+
+        self._kernels = {}
+        self._memberIds = []
+        for member in structure.getMembers():
+            KA, KI = self.calculateMemberKernel(member)
+            A = 0
+            I = 0
+            if member.getType() != "beam":
+                A = member.getA()
+            if member.getType() != "truss":
+                I = member.getI()
+            self._kernels[member.getId()] = {"member": member,
+                                             "dofIndex": structure.getMemberDofIndex(member, self._dofMap),
+                                             "KA": KA,
+                                             "KI": KI,
+                                             "property": [member.getE(), A, I]}
+            self._memberIds.append(member.getId())
+
+        self._profile = self._matrixCalculator.matrixProfile(self.assemble()[0])
+
+
+    def calculateMemberKernel(self, member):
+        """
+        Calculate the unit stiffness kernels of a member by the element with unit section properties
+
+        :param member: required member
+        :return: [KA, KI] of the member in global axes
+        """
+        id = member.getId()
+        i = member.geti()
+        j = member.getj()
+        L = member.getL()
+
+        if member.getType() == "truss":
+            KA = TrussElement(id, i, j, 1, 1, L, member.getAngle()).getStiffness().getK()
+            KI = self.getZeroMatrix(4)
+        elif member.getType() == "beam":
+            KA = self.getZeroMatrix(4)
+            KI = BeamElement(id, i, j, 1, 1, L).getStiffness().getK()
+        else:
+            KA = FrameElement(id, i, j, 1, 0, 1, L, member.getAngle()).getStiffness().getK()
+            KI = FrameElement(id, i, j, 0, 1, 1, L, member.getAngle()).getStiffness().getK()
+        return [KA, KI]
+
+
+    def getZeroMatrix(self, size):
+        """
+        Create a square matrix of zero
+
+        :param size: size of the matrix
+        :return: the zero matrix
+        """
+        result = []
+        for row in range(size):
+            result.append([0]*size)
+        return result
+
+
+    def getStructure(self):
+        """
+        Return the structure of the kernel
+
+        :return: the structure
+        """
+        return self._structure
+
+
+    def getMemberIds(self):
+        """
+        Return the member IDs in the order of the structure
+
+        :return: list of member ID
+        """
+        return self._memberIds
+
+
+    def getFreeIndex(self):
+        """
+        Return the global index of the free displacements
+
+        :return: list of global index
+        """
+        return self._freeIndex
+
+
+    def getSupportIndex(self):
+        """
+        Return the global index of the support displacements
+
+        :return: list of global index
+        """
+        return self._supportIndex
+
+
+    def getDofNum(self):
+        """
+        Return the number of displacements of the structure
+
+        :return: the number of displacements
+        """
+        return self._dofNum
+
+
+    def getProfile(self):
+        """
+        Return the profile of Kff, it does not change with the section properties
+
+        :return: first nonzero column of each row of Kff
+        """
+        return self._profile
+
+
+    def getMemberDofIndex(self, memberId):
+        """
+        Return the global index of each displacement of a member
+
+        :param memberId: member ID
+        :return: list of global index
+        """
+        return self._kernels[memberId]["dofIndex"]
+
+
+    def getMemberProperty(self, memberId):
+        """
+        Return the nominal section properties of a member
+
+        :param memberId: member ID
+        :return: [E, A, I]
+        """
+        return self._kernels[memberId]["property"]
+
+
+    def setMemberProperty(self, memberId, E, A, I):
+        """
+        Change the nominal section properties of a member, the kernels are not changed
+
+        :param memberId: member ID
+        :param E: elasticity
+        :param A: area value (0 for beam member)
+        :param I: area Moment of Inertia (0 for truss member)
+        """
+        self._kernels[memberId]["property"] = [E, A, I]
+
+
+    def getMemberKernel(self, memberId):
+        """
+        Return the unit stiffness kernels of a member
+
+        :param memberId: member ID
+        :return: [KA, KI]
+        """
+        kernel = self._kernels[memberId]
+        return [kernel["KA"], kernel["KI"]]
+
+
+    def getMemberStiffness(self, memberId, E, A, I):
+        """
+        Calculate the member stiffness matrix for a set of section properties
+
+        :param memberId: member ID
+        :param E: elasticity
+        :param A: area value
+        :param I: area Moment of Inertia
+        :return: member stiffness matrix in global axes
+        """
+        KA, KI = self.getMemberKernel(memberId)
+        result = []
+        for a in range(len(KA)):
+            row = []
+            for b in range(len(KA)):
+                row.append(E*(A*KA[a][b] + I*KI[a][b]))
+            result.append(row)
+        return result
+
+
+    def assemble(self, properties=None):
+        """
+        Assemble Kff, Ksf and Kss from the kernels
+
+        :param properties: dictionary of member ID to [E, A, I], the nominal value is used for the missing member
+        :return: [Kff, Ksf, Kss]
+        """
+        freeNum = len(self._freeIndex)
+        supportNum = len(self._supportIndex)
+        Kff = []
+        for row in range(freeNum):
+            Kff.append([0]*freeNum)
+        Ksf = []
+        Kss = []
+        for row in range(supportNum):
+            Ksf.append([0]*freeNum)
+            Kss.append([0]*supportNum)
+
+        for memberId in self._memberIds:
+            kernel = self._kernels[memberId]
+            E, A, I = kernel["property"]
+            if properties != None and memberId in properties:
+                E, A, I = properties[memberId]
+            KA = kernel["KA"]
+            KI = kernel["KI"]
+            dofIndex = kernel["dofIndex"]
+
+            for a in range(len(dofIndex)):
+                isFreeRow, row = self._position[dofIndex[a]]
+                for b in range(len(dofIndex)):
+                    value = E*(A*KA[a][b] + I*KI[a][b])
+                    if value == 0:
+                        continue
+                    isFreeCol, col = self._position[dofIndex[b]]
+                    if isFreeRow and isFreeCol:
+                        Kff[row][col] += value
+                    elif isFreeCol:
+                        Ksf[row][col] += value
+                    elif not isFreeRow:
+                        Kss[row][col] += value
+        return [Kff, Ksf, Kss]
+
+
+    def getResponseName(self):
+        """
+        Return the name of every response of the structure,
+        free displacements, then reaction forces, then member forces
+
+        :return: list of name
+        """
+        structure = self._structure
+        nodalDisplacement = structure.getNodalDisplacement()
+        nodalLoad = structure.getNodalLoad()
+        result = []
+        for index in self._freeIndex:
+            result.append(nodalDisplacement[index])
+        for index in self._supportIndex:
+            result.append(nodalLoad[index])
+        for member in structure.getMembers():
+            result.extend(structure.getMemberForceName(member))
+        return result
+
+
+    def getSupportDisplacement(self):
+        """
+        Return the prescribed displacement of each support displacement
+
+        :return: list of value
+        """
+        nodalDisplacement = self._structure.getNodalDisplacement()
+        result = []
+        for index in self._supportIndex:
+            result.append(nodalDisplacement[index])
+        return result
+
+
+    def applySettlement(self, Rf_Pf, Ps, Ksf, Kss, rs, col=0):
+        """
+        Move the support displacement to the right-hand side of a column of the load basis
+        Rf - Pf - Kfs*rs for the free part and Ps + Kss*rs for the support part
+
+        :param Rf_Pf: free loading of the load basis
+        :param Ps: support loading of the load basis
+        :param Ksf: support-free stiffness matrix
+        :param Kss: support stiffness matrix
+        :param rs: support displacement (list of value)
+        :param col: column of the load basis
+        :return: [Rf - Pf, Ps] with the support displacement
+        """
+        newRf_Pf = []
+        for row in Rf_Pf:
+            newRf_Pf.append(list(row))
+        newPs = []
+        for row in Ps:
+            newPs.append(list(row))
+
+        for s in range(len(rs)):
+            if rs[s] == 0:
+                continue
+            for row in range(len(newRf_Pf)):
+                newRf_Pf[row][col] = newRf_Pf[row][col] - Ksf[s][row]*rs[s]
+            for row in range(len(newPs)):
+                newPs[row][col] = newPs[row][col] + Kss[row][s]*rs[s]
+        return [newRf_Pf, newPs]
+
+
+    def getLoadBasis(self, loadColumn=None, basisNum=1):
+        """
+        Split the loading of the structure into columns of load basis
+        The loads of the node or the member in loadColumn go to its column, the other loads go to column 0
+
+        :param loadColumn: dictionary of ("nodalLoad", node ID) or ("memberLoad", member ID) to column
+        :param basisNum: number of columns
+        :return: [Rf - Pf (free num x basis num), Ps (support num x basis num), list of dictionary of member ID to Pe]
+        """
+        if loadColumn == None:
+            loadColumn = {}
+        structure = self._structure
+        freeIndex = self._freeIndex
+        supportIndex = self._supportIndex
+
+        Rf_Pf = []
+        for index in freeIndex:
+            Rf_Pf.append([0]*basisNum)
+        Ps = []
+        for index in supportIndex:
+            Ps.append([0]*basisNum)
+        memberP = []
+        for col in range(basisNum):
+            memberP.append({})
+
+        nodalLoad = structure.getNodalLoad()
+        for nodeNum in self._dofMap:
+            col = loadColumn.get(("nodalLoad", nodeNum), 0)
+            startIndex, components = self._dofMap[nodeNum]
+            for index in range(startIndex, startIndex + len(components)):
+                isFree, position = self._position[index]
+                if isFree:
+                    Rf_Pf[position][col] += nodalLoad[index]
+
+        for memberId in self._memberIds:
+            col = loadColumn.get(("memberLoad", memberId), 0)
+            P = self._kernels[memberId]["member"].getP()
+            dofIndex = self._kernels[memberId]["dofIndex"]
+            Pe = []
+            for row in range(len(dofIndex)):
+                Pe.append(P[row][0])
+                isFree, position = self._position[dofIndex[row]]
+                if isFree:
+                    Rf_Pf[position][col] -= P[row][0]
+                else:
+                    Ps[position][col] += P[row][0]
+            memberP[col][memberId] = Pe
+        return [Rf_Pf, Ps, memberP]
+
+
+    def decompose(self, Kff):
+        """
+        LU decomposition of Kff with the profile of the structure
+
+        :param Kff: free stiffness matrix
+        :return: LU decomposition of Kff
+        """
+        return self._matrixCalculator.luDecomposition(Kff, self._profile)
+
+
+    def getMemberForceTransform(self, memberId):
+        """
+        Return the matrix T of a member, the member force is T*(Ke*r_e + Pe)
+
+        :param memberId: member ID
+        :return: T matrix (one row for truss member)
+        """
+        member = self._kernels[memberId]["member"]
+        if member.getType() == "truss":
+            return [[0, 0, member.getc(), member.gets()]]
+        elif member.getType() == "frame":
+            return member.getLD()
+        result = []
+        for a in range(4):
+            row = [0]*4
+            row[a] = 1
+            result.append(row)
+        return result
+
+
+    def calculateMemberForce(self, memberId, r_e, Pe, E, A, I):
+        """
+        Calculate the member force of a member for a set of section properties,
+        in the same way as the calculateMemberForce of the member
+
+        :param memberId: member ID
+        :param r_e: nodal displacement of the member (list of value)
+        :param Pe: loading matrix of the member (list of value)
+        :param E: elasticity
+        :param A: area value
+        :param I: area Moment of Inertia
+        :return: member force of the member (list of value), one value for truss member
+        """
+        kernel = self._kernels[memberId]
+        member = kernel["member"]
+        KA = kernel["KA"]
+        KI = kernel["KI"]
+
+        if member.getType() == "truss":
+            k = [-member.getc(), -member.gets(), member.getc(), member.gets()]
+            S = 0
+            for a in range(4):
+                S = S + k[a]*r_e[a]
+            return [E*A*S/member.getL()]
+
+        force = []
+        for a in range(len(KA)):
+            value = Pe[a]
+            for b in range(len(KA)):
+                value = value + E*(A*KA[a][b] + I*KI[a][b])*r_e[b]
+            force.append(value)
+
+        if member.getType() == "frame":
+            LD = member.getLD()
+            result = []
+            for a in range(6):
+                value = 0
+                for b in range(6):
+                    value = value + LD[a][b]*force[b]
+                result.append(value)
+            return result
+        return force
@@ -3,8 +3,10 @@ import math
 from directStiffnessMethod import matrixCalculation
 from directStiffnessMethod.beamElement import BeamElement
 from directStiffnessMethod.frameElement import FrameElement
-from fpdf import FPDF
 from directStiffnessMethod.node import Node
+from directStiffnessMethod.stiffnessKernel import StiffnessKernel
+from directStiffnessMethod.profiler import Profiler, profiled
+import time
 
 
 class Structure(object):
@@ -20,9 +22,18 @@ class Structure(object):
         self._nodeNum = len(self._nodes)
         self._members = []
         self._memberNum = len(self._members)
+        self._nodeIndex = {}
+        self._memberIndex = {}
+        self._memberDataIndex = {}
         self._nodalDisplacement = []
         self._nodalLoad = []
         self._unit = ["N","mm",2]
+        self._structureData = {"node":[], "member":[], "nodalLoad":[], "memberPointLoad":[], "uniformlyDistributedLoad":[],
+                               "nodalSettlement":[]}
+        self._kernel = None
+        self._loadBasis = None
+        self._profiler = None
+        self._memoryReport = None
 
         self._matrixCalculator = matrixCalculation.MatrixCalculation()
 
@@ -36,6 +47,97 @@ class Structure(object):
         self._unit = unit
 
 
+    def getUnit(self):
+        """
+        Return the unit of the structure
+
+        :return: [force unit, length unit, decimal place]
+        """
+        return self._unit
+
+
+    def enableProfiling(self, memory=False):
+        """
+        Start recording the wall time, call count and allocated memory of each phase of the analysis
+
+        :param memory: record the allocated memory by tracemalloc, it slows down the analysis
+        """
+        if self._profiler != None:
+            self._profiler.stop()
+        self._profiler = Profiler(memory)
+        self._profiler.start()
+
+
+    def disableProfiling(self):
+        """
+        Stop recording the phases of the analysis
+
+        :return: the record of every phase (see getProfile), None if the profiling is not enabled
+        """
+        if self._profiler == None:
+            return None
+        result = self._profiler.getResult()
+        self._profiler.stop()
+        self._profiler = None
+        return result
+
+
+    def resetProfile(self):
+        """
+        Clear the record of the profiling
+        """
+        if self._profiler != None:
+            self._profiler.reset()
+
+
+    def getProfile(self):
+        """
+        Return the record of every phase of the analysis since the profiling is enabled
+
+        :return: dictionary of phase to {"calls", "time", "selfTime", "memory"} and "peakMemory",
+        None if the profiling is not enabled
+        """
+        if self._profiler == None:
+            return None
+        return self._profiler.getResult()
+
+
+    def getProfileTable(self):
+        """
+        Return the record of every phase of the analysis as a printable table
+
+        :return: the table string, None if the profiling is not enabled
+        """
+        if self._profiler == None:
+            return None
+        return self._profiler.getTable()
+
+
+    def getMemoryReport(self):
+        """
+        Analyse the structure and account the memory of each part of the analysis
+
+        :return: dictionary of "held" (part name to bytes held), "peak" (stage name to peak traced bytes),
+        "dofNum", "freeNum" and "peakRSS" (bytes, None if not available)
+        """
+        # the memory report is only imported when it is required, it needs tracemalloc
+        from directStiffnessMethod.memoryReport import MemoryReport
+        self._memoryReport = MemoryReport(self)
+        return self._memoryReport.measure()
+
+
+    def getMemoryReportTable(self):
+        """
+        Return the memory report of the last analysis as a printable table, the structure is analysed if there is no report
+
+        :return: the table string
+        """
+        if self._memoryReport == None:
+            from directStiffnessMethod.memoryReport import MemoryReport
+            self._memoryReport = MemoryReport(self)
+        return self._memoryReport.getTable()
+
+
     def addNode(self, id, x, y, restraint):
         """
         Add node into the structure
@@ -47,7 +149,26 @@ class Structure(object):
         """
         node = Node(id, x, y, restraint)
         self._nodes.append(node)
+        self._nodeIndex[id] = node
         self._nodeNum = len(self._nodes)
+        self._structureData["node"].append([id, x, y, restraint, ""])
+        self._kernel = None
+        self._loadBasis = None
+
+
+    def getStructureData(self):
+        """
+        Return the compact description of the structure,
+        in the same form as the structure data of the structure file
+
+        :return: dictionary of the node, member and loading data
+        """
+        result = {}
+        for key in self._structureData:
+            result[key] = []
+            for data in self._structureData[key]:
+                result[key].append(data.copy())
+        return result
 
 
     def getNodeNum(self):
@@ -80,14 +201,12 @@ class Structure(object):
         :param E: elasticity
         :param type: member type string
         """
-        # need to check if two nodes exist
-        # and make sure two nodes are different
-
-        for node in self.getNodes():
-            if node.getID() == i:
-                node_i = node
-            if node.getID() == j:
-                node_j = node
+        node_i = self.getNode(i)
+        node_j = self.getNode(j)
+        if node_i == None:
+            raise Exception('Node ' + str(i) + ' of member ' + str(id) + ' is not found!')
+        if node_j == None:
+            raise Exception('Node ' + str(j) + ' of member ' + str(id) + ' is not found!')
         x = node_j.getx() - node_i.getx()
         y = node_j.gety() - node_i.gety()
 
@@ -123,7 +242,12 @@ class Structure(object):
         member.add_xy_Axis(x_axis, y_axis)
 
         self._members.append(member)
+        self._memberIndex[id] = member
         self._memberNum = len(self._members)
+        self._memberDataIndex[id] = len(self._structureData["member"])
+        self._structureData["member"].append([id, i, j, A, I, E, type])
+        self._kernel = None
+        self._loadBasis = None
 
 
     def addNodalLoad(self, nodeNum, fx, fy, moment):
@@ -135,9 +259,26 @@ class Structure(object):
         :param fy: y value of the force
         :param moment: bending moment value of the force
         """
-        for node in self.getNodes():
-            if node.getID() == nodeNum:
-                node.addNodalLoad(fx, fy, moment)
+        node = self.getNode(nodeNum)
+        if node != None:
+            node.addNodalLoad(fx, fy, moment)
+        self._structureData["nodalLoad"].append([nodeNum, fx, fy, moment])
+        self._loadBasis = None
+
+
+    def addNodalSettlement(self, nodeNum, dx, dy, rotation):
+        """
+        Add the prescribed displacement (support settlement) into the node
+
+        :param nodeNum: node ID
+        :param dx: x value of the displacement
+        :param dy: y value of the displacement
+        :param rotation: rotation value of the displacement
+        """
+        node = self.getNode(nodeNum)
+        if node != None:
+            node.addSettlement(dx, dy, rotation)
+        self._structureData["nodalSettlement"].append([nodeNum, dx, dy, rotation])
 
 
     def addMemberPointLoad(self, memberNum, x, P):
@@ -148,9 +289,11 @@ class Structure(object):
         :param x: distance from the starting node
         :param P: value of the point load
         """
-        for member in self.getMembers():
-            if member.getId() == memberNum:
-                member.addPointLoad(x, P)
+        member = self.getMember(memberNum)
+        if member != None:
+            member.addPointLoad(x, P)
+        self._structureData["memberPointLoad"].append([memberNum, x, 0, P])
+        self._loadBasis = None
 
 
     def vectorProjection(self, vector, directedVector):
@@ -227,51 +370,54 @@ class Structure(object):
             return False
 
 
-    def addGlobalMemberPointLoad(self, memberNum, x, fx, fy):
+    def resolveGlobalPointLoad(self, member, fx, fy):
         """
-        Add the global point loading into a member
+        Resolve a global point loading into the member local axes
 
-        :param memberNum: member ID
-        :param x: distance from the starting node
+        :param member: required member
         :param fx: x value of the force
         :param fy: y value of the force
+        :return: list of [x value, y value] of the force in the member local axes
         """
-        for member in self.getMembers():
-            if member.getId() == memberNum:
-                x_axis = member.get_x_Axis()
-                y_axis = member.get_y_Axis()
-
-                if fy != 0:
-                    Fy = [[0,], [fy,]]
-                    Xcomponent = self.vectorProjection(Fy, x_axis)
-                    Ycomponent = self.vectorProjection(Fy, y_axis)
-                    if self.vectorsCheckSign(Xcomponent, x_axis):
-                        f_x = math.sqrt((Xcomponent[0][0]**2) + (Xcomponent[1][0]**2))
-                    else:
-                        f_x = -math.sqrt((Xcomponent[0][0]**2) + (Xcomponent[1][0]**2))
+        result = []
+        x_axis = member.get_x_Axis()
+        y_axis = member.get_y_Axis()
 
-                    if self.vectorsCheckSign(Ycomponent, y_axis):
-                        f_y = math.sqrt((Ycomponent[0][0]**2) + (Ycomponent[1][0]**2))
-                    else:
-                        f_y = -math.sqrt((Ycomponent[0][0]**2) + (Ycomponent[1][0]**2))
+        for F in [[[0,], [fy,]], [[fx,], [0,]]]:
+            if F[0][0] == 0 and F[1][0] == 0:
+                continue
 
-                    member.addGlobalPointLoad(x, f_x, f_y)
+            Xcomponent = self.vectorProjection(F, x_axis)
+            Ycomponent = self.vectorProjection(F, y_axis)
+            if self.vectorsCheckSign(Xcomponent, x_axis):
+                f_x = math.sqrt((Xcomponent[0][0]**2) + (Xcomponent[1][0]**2))
+            else:
+                f_x = -math.sqrt((Xcomponent[0][0]**2) + (Xcomponent[1][0]**2))
 
-                if fx != 0:
-                    Fx = [[fx,], [0,]]
-                    Xcomponent = self.vectorProjection(Fx, x_axis)
-                    Ycomponent = self.vectorProjection(Fx, y_axis)
-                    if self.vectorsCheckSign(Xcomponent, x_axis):
-                        f_x = math.sqrt((Xcomponent[0][0]**2) + (Xcomponent[1][0]**2))
-                    else:
-                        f_x = -math.sqrt((Xcomponent[0][0]**2) + (Xcomponent[1][0]**2))
+            if self.vectorsCheckSign(Ycomponent, y_axis):
+                f_y = math.sqrt((Ycomponent[0][0]**2) + (Ycomponent[1][0]**2))
+            else:
+                f_y = -math.sqrt((Ycomponent[0][0]**2) + (Ycomponent[1][0]**2))
 
-                    if self.vectorsCheckSign(Ycomponent, y_axis):
-                        f_y = math.sqrt((Ycomponent[0][0]**2) + (Ycomponent[1][0]**2))
-                    else:
-                        f_y = -math.sqrt((Ycomponent[0][0]**2) + (Ycomponent[1][0]**2))
+            result.append([f_x, f_y])
+        return result
 
-                    member.addGlobalPointLoad(x, f_x, f_y)
+
+    def addGlobalMemberPointLoad(self, memberNum, x, fx, fy):
+        """
+        Add the global point loading into a member
+
+        :param memberNum: member ID
+        :param x: distance from the starting node
+        :param fx: x value of the force
+        :param fy: y value of the force
+        """
+        member = self.getMember(memberNum)
+        if member != None:
+            for f_x, f_y in self.resolveGlobalPointLoad(member, fx, fy):
+                member.addGlobalPointLoad(x, f_x, f_y)
+        self._structureData["memberPointLoad"].append([memberNum, x, fx, fy])
+        self._loadBasis = None
 
 
     def addMemberUniformlyDistributedLoad(self, memberNum, w):
@@ -281,9 +427,11 @@ class Structure(object):
         :param memberNum: member ID
         :param w: UDL value
         """
-        for member in self.getMembers():
-            if member.getId() == memberNum:
-                member.addUniformlyDistributedLoad(w)
+        member = self.getMember(memberNum)
+        if member != None:
+            member.addUniformlyDistributedLoad(w)
+        self._structureData["uniformlyDistributedLoad"].append([memberNum, w])
+        self._loadBasis = None
 
 
     def getGlobalStiffnessMatrixSize(self):
@@ -313,11 +461,32 @@ class Structure(object):
         return self._nodes
 
 
+    def getNode(self, id):
+        """
+        Find a node by its ID
+
+        :param id: nodal ID
+        :return: the node, None if it is not found
+        """
+        return self._nodeIndex.get(id)
+
+
+    def getMember(self, id):
+        """
+        Find a member by its ID
+
+        :param id: member ID
+        :return: the member, None if it is not found
+        """
+        return self._memberIndex.get(id)
+
+
+    @profiled("dofNumbering")
     def getNodalDisplacement(self):
         """
         Return the nodal displacement of the structure
 
-        :return: the nodal displacement of the structure
+        :return: the nodal displacement of the structure, the components without any member are removed
         """
         result = []
 
@@ -340,6 +509,12 @@ class Structure(object):
                         typeIndex.append(0)
                         typeIndex.append(1)
                         typeIndex.append(2)
+                    # a settlement of the displacement without the members is not dropped silently
+                    settlement = node.getSettlement()
+                    for index in [0, 2]:
+                        if index not in typeIndex and settlement[index] != 0:
+                            raise Exception('Settlement can only be added to the displacement of node ' + str(num) +
+                                            ' used by its members!')
                     if 0 not in typeIndex:
                         r.pop(0)
                     if 2 not in typeIndex:
@@ -349,6 +524,236 @@ class Structure(object):
         return result
 
 
+    @profiled("dofNumbering")
+    def getDofMap(self):
+        """
+        Number the nodal displacements of all the nodes in one pass
+        The numbering is the same as getNodalDisplacement
+
+        :return: dictionary of nodal ID to [starting index, list of displacement components]
+        """
+        type = {}
+        for member in self.getMembers():
+            for nodeNum in member.get_ij():
+                if nodeNum not in type:
+                    type[nodeNum] = []
+                type[nodeNum].append(member.getType())
+
+        dofMap = {}
+        startIndex = 0
+        for num in range(1, self.getNodeNum()+1):
+            nodeType = type.get(num, [])
+            if "frame" in nodeType or ("truss" in nodeType and "beam" in nodeType):
+                components = [0, 1, 2]
+            elif "beam" in nodeType:
+                components = [1, 2]
+            else:
+                components = [0, 1]
+            dofMap[num] = [startIndex, components]
+            startIndex = startIndex + len(components)
+        return dofMap
+
+
+    def getMemberDofIndex(self, member, dofMap=None):
+        """
+        Return the global index of each displacement of a member
+        The order is the same as the member stiffness matrix
+
+        :param member: required member
+        :param dofMap: result of getDofMap, it is calculated if None
+        :return: list of global index
+        """
+        if dofMap == None:
+            dofMap = self.getDofMap()
+
+        if member.getType() == "truss":
+            memberComponents = [0, 1]
+        elif member.getType() == "beam":
+            memberComponents = [1, 2]
+        else:
+            memberComponents = [0, 1, 2]
+
+        result = []
+        for nodeNum in member.get_ij():
+            startIndex, components = dofMap[nodeNum]
+            for component in memberComponents:
+                result.append(startIndex + components.index(component))
+        return result
+
+
+    def getStiffnessKernel(self):
+        """
+        Return the stiffness kernel of the structure
+        It is kept until a node or a member is added, so the numbering of the displacements,
+        the member kernels and the profile of Kff are reused by the reanalysis
+
+        :return: the stiffness kernel
+        """
+        if self._kernel == None:
+            self._kernel = StiffnessKernel(self)
+        return self._kernel
+
+
+    def getKernelCache(self):
+        """
+        Return the stiffness kernel and the load basis kept for the reanalysis, they are not built here
+
+        :return: [stiffness kernel, load basis], None for the one which is not built yet
+        """
+        return [self._kernel, self._loadBasis]
+
+
+    def setMemberSection(self, memberNum, A, I):
+        """
+        Change the section of a member
+
+        :param memberNum: member ID
+        :param A: area value
+        :param I: area Moment of Inertia, only the properties used by the type of the member are changed
+        """
+        member = self.getMember(memberNum)
+        if member == None:
+            raise Exception('Member ' + str(memberNum) + ' does not exist!')
+        member.setSection(A, I)
+
+        # truss member has no I and beam member has no A
+        kernelA = A
+        kernelI = I
+        data = self._structureData["member"][self._memberDataIndex[memberNum]]
+        if member.getType() != "beam":
+            data[3] = A
+        else:
+            kernelA = 0
+        if member.getType() != "truss":
+            data[4] = I
+        else:
+            kernelI = 0
+        if self._kernel != None:
+            self._kernel.setMemberProperty(memberNum, member.getE(), kernelA, kernelI)
+
+
+    def reanalyse(self):
+        """
+        Analyse the structure again by the stiffness kernel, for the loop changing the member sections
+        Kff is assembled from the kernels and decomposed within the profile found at the first analysis
+
+        :return: dictionary of "rf", "nodalDisplacement" (all the displacements), "reactionForce" (Rs),
+        "memberForce" (member ID to member force list), "time" (time of each step in second)
+        and "system" ([Ksf, decomposition of Kff, member loads of the kernel], it can be reused by Sensitivity)
+        """
+        return self.analyseByKernel(None)[0]
+
+
+    def solveSettlementScenarios(self, scenarios):
+        """
+        Analyse several settlement scenarios together with the loading of the structure
+        The scenarios are solved as the columns of one right-hand side by one decomposition of Kff
+
+        :param scenarios: list of dictionary of node ID to [dx, dy, rotation], it replaces the settlements of the structure
+        :return: list of result in the same form as reanalyse for each scenario
+        """
+        kernel = self.getStiffnessKernel()
+        dofMap = self.getDofMap()
+        supportIndex = kernel.getSupportIndex()
+        supportPosition = {}
+        for index in range(len(supportIndex)):
+            supportPosition[supportIndex[index]] = index
+
+        settlements = []
+        for scenario in scenarios:
+            rs = [0]*len(supportIndex)
+            for nodeNum in scenario:
+                if nodeNum not in dofMap:
+                    raise Exception('Node ' + str(nodeNum) + ' does not exist!')
+                startIndex, components = dofMap[nodeNum]
+                for component in range(3):
+                    value = scenario[nodeNum][component]
+                    if value == 0:
+                        continue
+                    if component not in components or startIndex + components.index(component) not in supportPosition:
+                        raise Exception('Settlement can only be added to the restrained displacement of node ' + str(nodeNum) + '!')
+                    rs[supportPosition[startIndex + components.index(component)]] = value
+            settlements.append(rs)
+        return self.analyseByKernel(settlements)
+
+
+    def analyseByKernel(self, settlements):
+        """
+        Analyse the structure by the stiffness kernel for one or more support displacement vectors
+        Kfs*rs is moved to the right-hand side, so all the vectors share one decomposition of Kff
+
+        :param settlements: list of rs (list of value), the settlements of the structure are used if None
+        :return: list of result in the same form as reanalyse for each rs
+        """
+        start = time.perf_counter()
+        kernel = self.getStiffnessKernel()
+        if self._loadBasis == None:
+            self._loadBasis = kernel.getLoadBasis()
+        Rf_Pf, Ps, memberP = self._loadBasis
+        if settlements == None:
+            settlements = [kernel.getSupportDisplacement()]
+        Kff, Ksf, Kss = kernel.assemble()
+
+        freeNum = len(Rf_Pf)
+        supportNum = len(Ps)
+        constant = []
+        for row in range(freeNum):
+            constant.append([Rf_Pf[row][0]]*len(settlements))
+        for col in range(len(settlements)):
+            rs = settlements[col]
+            for s in range(supportNum):
+                if rs[s] == 0:
+                    continue
+                for row in range(freeNum):
+                    constant[row][col] = constant[row][col] - Ksf[s][row]*rs[s]
+        assembleTime = time.perf_counter() - start
+
+        start = time.perf_counter()
+        factor = kernel.decompose(Kff)
+        factorizeTime = time.perf_counter() - start
+
+        start = time.perf_counter()
+        rf = self._matrixCalculator.luSolve(factor, constant)
+        Rs = self._matrixCalculator.matrixMultiplication(Ksf, rf)
+        for col in range(len(settlements)):
+            rs = settlements[col]
+            for row in range(supportNum):
+                value = Ps[row][0]
+                for s in range(supportNum):
+                    value = value + Kss[row][s]*rs[s]
+                Rs[row][col] = Rs[row][col] + value
+        solveTime = time.perf_counter() - start
+
+        freeIndex = kernel.getFreeIndex()
+        supportIndex = kernel.getSupportIndex()
+        result = []
+        for col in range(len(settlements)):
+            start = time.perf_counter()
+            colResult = {"rf": [], "reactionForce": [], "memberForce": {}}
+            r = [0]*kernel.getDofNum()
+            for index in range(len(freeIndex)):
+                r[freeIndex[index]] = rf[index][col]
+                colResult["rf"].append(rf[index][col])
+            for index in range(len(supportIndex)):
+                r[supportIndex[index]] = settlements[col][index]
+                colResult["reactionForce"].append(Rs[index][col])
+            colResult["nodalDisplacement"] = r
+
+            for memberId in kernel.getMemberIds():
+                r_e = []
+                for index in kernel.getMemberDofIndex(memberId):
+                    r_e.append(r[index])
+                Pe = memberP[0][memberId]
+                E, A, I = kernel.getMemberProperty(memberId)
+                colResult["memberForce"][memberId] = kernel.calculateMemberForce(memberId, r_e, Pe, E, A, I)
+            colResult["time"] = {"assemble": assembleTime, "factorize": factorizeTime, "solve": solveTime,
+                                 "recover": time.perf_counter() - start}
+            colResult["system"] = [Ksf, factor, memberP[0]]
+            result.append(colResult)
+        return result
+
+
+    @profiled("dofNumbering")
     def getNodalLoad(self):
         """
         Return the nodal load of the structure
@@ -384,6 +789,7 @@ class Structure(object):
         return result
 
 
+    @profiled("dofNumbering")
     def getNodalDisplacementNum(self, nodeNum):
         """
         Count the number of displacement for a node
@@ -417,6 +823,7 @@ class Structure(object):
                     return 3
 
 
+    @profiled("loadVector")
     def getGlobalP(self):
         """
         Return the global loading matrix
@@ -474,6 +881,7 @@ class Structure(object):
         return result
 
 
+    @profiled("partition")
     def getPf(self):
         """
         Return the free loading matrix
@@ -486,6 +894,7 @@ class Structure(object):
         return Pf
 
 
+    @profiled("partition")
     def getPs(self):
         """
         Return the support loading matrix
@@ -498,6 +907,7 @@ class Structure(object):
         return Ps
 
 
+    @profiled("elementStiffness")
     def getAllStiffness(self):
         """
         Calculate the function title value
@@ -510,6 +920,7 @@ class Structure(object):
         return allStiffness
 
 
+    @profiled("assembly")
     def getGlobalStiffness(self):
         """
         Calculate the function title value
@@ -586,6 +997,7 @@ class Structure(object):
         return result
 
 
+    @profiled("dofNumbering")
     def getFreeNodalIndex(self):
         """
         Calculate the function title value
@@ -607,11 +1019,12 @@ class Structure(object):
         :param nodeNum: nodal ID
         :return: the coordinate of the node
         """
-        for node in self.getNodes():
-            if node.getID() == nodeNum:
-                return node.get_xy()
+        node = self.getNode(nodeNum)
+        if node != None:
+            return node.get_xy()
 
 
+    @profiled("dofNumbering")
     def getSupportNodalIndex(self):
         """
         Calculate the function title value
@@ -639,6 +1052,7 @@ class Structure(object):
         return resultMatrix
 
 
+    @profiled("partition")
     def getKff(self):
         """
         Calculate the function title value
@@ -656,6 +1070,7 @@ class Structure(object):
         return Kff
 
 
+    @profiled("loadVector")
     def getRf(self):
         """
         Calculate the function title value
@@ -691,21 +1106,65 @@ class Structure(object):
     """
 
 
+    @profiled("solve")
     def getrf(self):
         """
         Calculate the function title value
 
         :return: the function title value
         """
-        Kff = self.getKff()
         Rf = self.convertListToMatrixForm(self.getRf())
         Pf = self.getPf()
         Rf_Pf = self._matrixCalculator.matrixAddition(Rf, "-", Pf)
 
-        result = self._matrixCalculator.gaussElimination(Kff, Rf_Pf)
-        return self.convertListToMatrixForm(result)
+        rs = self.getrs()
+        if self.hasSettlement(rs):
+            Kfs = self._matrixCalculator.matrixTranspose(self.getKsf())
+            Rf_Pf = self._matrixCalculator.matrixAddition(Rf_Pf, "-", self._matrixCalculator.matrixMultiplication(Kfs, rs))
+
+        # the elimination of Kff is recorded as the factorization phase, only the substitution is the solve
+        return self._matrixCalculator.luSolve(self.getKffDecomposition(), Rf_Pf)
+
+
+    @profiled("partition")
+    def getrs(self):
+        """
+        Return the support displacement (settlement) matrix
+
+        :return: the support displacement matrix
+        """
+        rs = []
+        nodalDisplacement = self.getNodalDisplacement()
+        for index in self.getSupportNodalIndex():
+            rs.append([nodalDisplacement[index],])
+        return rs
 
 
+    def hasSettlement(self, rs):
+        """
+        Check if there is any nonzero support displacement
+
+        :param rs: support displacement matrix
+        :return: True if there is any settlement
+        """
+        for row in rs:
+            if row[0] != 0:
+                return True
+        return False
+
+
+    @profiled("factorization")
+    def getKffDecomposition(self):
+        """
+        Return the LU decomposition of the free stiffness matrix
+        It can be used to solve several loading cases by the same decomposition
+
+        :return: LU decomposition of the free stiffness matrix
+        """
+        return self._matrixCalculator.luDecomposition(self.getKff())
+
+
+    @profiled("partition")
     def getKsf(self):
         """
         Calculate the function title value
@@ -722,6 +1181,24 @@ class Structure(object):
         return Ksf
 
 
+    @profiled("partition")
+    def getKss(self):
+        """
+        Return the support stiffness matrix
+
+        :return: the support stiffness matrix
+        """
+        K = self.getGlobalStiffness()
+        supportNodalIndex = self.getSupportNodalIndex()
+        Kss = []
+        for i in supportNodalIndex:
+            KssRow = []
+            for j in supportNodalIndex:
+                KssRow.append(K[i][j])
+            Kss.append(KssRow)
+        return Kss
+
+
     def getRsUnknown(self):
         """
         Calculate the function title value
@@ -734,82 +1211,143 @@ class Structure(object):
         return Rs
 
 
-    def getRs(self):
+    @profiled("reactionRecovery")
+    def getRs(self, rf=None):
         """
         Calculate the function title value
 
+        :param rf: result of getrf, it is calculated if None
         :return: the function title value
         """
-        Rs = self._matrixCalculator.matrixMultiplication(self.getKsf(), self.getrf())
+        if rf == None:
+            rf = self.getrf()
+        Rs = self._matrixCalculator.matrixMultiplication(self.getKsf(), rf)
+        rs = self.getrs()
+        if self.hasSettlement(rs):
+            Rs = self._matrixCalculator.matrixAddition(Rs, "+", self._matrixCalculator.matrixMultiplication(self.getKss(), rs))
         Rs = self._matrixCalculator.matrixAddition(Rs, "+", self.getPs())
         return Rs
 
 
-    def getNodalDisplacementResult(self):
+    @profiled("memberForceRecovery")
+    def getNodalDisplacementResult(self, rf=None):
         """
         Calculate the function title value
 
+        :param rf: result of getrf, it is calculated if None
         :return: the function title value
         """
         freeNodalIndex = self.getFreeNodalIndex()
         nodalDisplacement = self.getNodalDisplacement()
-        rf = self.getrf()
+        if rf == None:
+            rf = self.getrf()
         for index in range(len(freeNodalIndex)):
             nodalDisplacement[freeNodalIndex[index]] = rf[index][0]
         return nodalDisplacement
 
 
-    def getMemberForce(self, member):
+    @profiled("memberForceRecovery")
+    def getMemberForce(self, member, r=None):
         """
-        Calculate the function title value
+        Calculate the member force of a member
 
         :param member: required member
-        :return: the function title value
+        :param r: result of getNodalDisplacementResult, it is calculated if None
+        :return: member force of the member, a value for truss member, otherwise column matrix
         """
-        r = self.getNodalDisplacementResult()
+        if r == None:
+            r = self.getNodalDisplacementResult()
         r_e = []
-        type = member.getType()
-        i = member.geti()
-        j = member.getj()
+        for index in self.getMemberDofIndex(member):
+            r_e.append(r[index])
+        return self.calculateMemberForce(member, r_e)
 
-        if i == 1:
-            iStartPosition = 0
-            iEndPosition = self.getNodalDisplacementNum(i)
-        else:
-            iStartPosition = 0
-            for pointNum in range(1, i):
-                iStartPosition = iStartPosition + self.getNodalDisplacementNum(pointNum)
-            iEndPosition = iStartPosition + self.getNodalDisplacementNum(i)
-
-        r_i = []
-        for index in range(iStartPosition, iEndPosition):
-            r_i.append(r[index])
-        if type == "truss" and self.getNodalDisplacementNum(i) == 3:
-            r_i.pop(2)
-        elif type == "beam" and self.getNodalDisplacementNum(i) == 3:
-            r_i.pop(0)
-        r_e.extend(r_i)
-
-        if j == 1:
-            jStartPosition = 0
-            jEndPosition = self.getNodalDisplacementNum(j)
-        else:
-            jStartPosition = 0
-            for pointNum in range(1, j):
-                jStartPosition = jStartPosition + self.getNodalDisplacementNum(pointNum)
-            jEndPosition = jStartPosition + self.getNodalDisplacementNum(j)
 
-        r_j = []
-        for index in range(jStartPosition, jEndPosition):
-            r_j.append(r[index])
-        if type == "truss" and self.getNodalDisplacementNum(j) == 3:
-            r_j.pop(2)
-        elif type == "beam" and self.getNodalDisplacementNum(j) == 3:
-            r_j.pop(0)
-        r_e.extend(r_j)
+    @profiled("memberForceRecovery")
+    def getAllMemberForce(self, r=None):
+        """
+        Calculate the member force of all the members in one pass
+        The global index of the displacements of every member is taken from one numbering of the structure,
+        so the structure is solved at most once and each member is only visited once
+
+        :param r: result of getNodalDisplacementResult, it is calculated if None
+        :return: dictionary of member ID to member force, in the same form as getMemberForce
+        """
+        if r == None:
+            r = self.getNodalDisplacementResult()
+        dofMap = self.getDofMap()
+
+        result = {}
+        for member in self.getMembers():
+            r_e = []
+            for index in self.getMemberDofIndex(member, dofMap):
+                r_e.append(r[index])
+            result[member.getId()] = self.calculateMemberForce(member, r_e)
+        return result
+
+
+    def calculateMemberForce(self, member, r_e):
+        """
+        Calculate the member force from the nodal displacement of a member,
+        the same as the calculateMemberForce of the member without the generic matrix operations
+        S = AE/L*<-c,-s,c,s>{r} for truss member, F = [K]{r} + {P} for beam member and F = [LD]([K]{r} + {P}) for frame member
 
-        r_e = self.convertListToMatrixForm(r_e)
-        return member.calculateMemberForce(r_e)
+        :param member: required member
+        :param r_e: nodal displacement of the member (list of value)
+        :return: member force of the member, a value for truss member, otherwise column matrix
+        """
+        if member.getType() == "truss":
+            c = member.getc()
+            s = member.gets()
+            return member.getAEL()*(-c*r_e[0] - s*r_e[1] + c*r_e[2] + s*r_e[3])
+
+        Ke = member.getStiffness().getK()
+        Pe = member.getP()
+        size = len(Ke)
+        force = []
+        for a in range(size):
+            row = Ke[a]
+            value = 0
+            for b in range(size):
+                value += r_e[b]*row[b]
+            force.append(value + Pe[a][0])
+
+        if member.getType() == "beam":
+            result = []
+            for value in force:
+                result.append([value,])
+            return result
+
+        LD = member.getLD()
+        result = []
+        for a in range(6):
+            row = LD[a]
+            value = 0
+            for b in range(6):
+                value += force[b]*row[b]
+            result.append([value,])
+        return result
+
+
+    def getMemberForceName(self, member):
+        """
+        Return the name of each member force in the same order as getMemberForce
+
+        :param member: required member
+        :return: list of name
+        """
+        id = str(member.getId())
+        if member.getType() == "truss":
+            return ["S" + id]
+
+        if member.getType() == "beam":
+            names = ["Fy,i", "M,i", "Fy,j", "M,j"]
+        else:
+            names = ["Fx,i", "Fy,i", "M,i", "Fx,j", "Fy,j", "M,j"]
+        result = []
+        for name in names:
+            result.append(name + " (" + id + ")")
+        return result
 
 
     def printReadableRs(self):
@@ -894,6 +1432,7 @@ class Structure(object):
             print(item)
 
 
+    @profiled("formatting")
     def autoScaleMemberForceResult(self, matrix, type):
         """
         Scale the result value for the member force
@@ -989,6 +1528,7 @@ class Structure(object):
         return [result, unit]
 
 
+    @profiled("formatting")
     def printAllResult(self):
         """
         Display all the analysis result for read
@@ -999,6 +1539,7 @@ class Structure(object):
         nodalLoad = self.getNodalLoad()
 
         rf = self.getrf()
+        memberForce = self.getAllMemberForce(self.getNodalDisplacementResult(rf))
         rf = self._matrixCalculator.matrixRoundDecimal(rf, None)
 
         print("")
@@ -1037,10 +1578,10 @@ class Structure(object):
         for member in self.getMembers():
             memberData = ""
             if member.getType() == "truss":
-                memberData = " {S" + str(member.getId()) + "} = " + str(round(self.getMemberForce(member)/1000, 2)) + " kN"
+                memberData = " {S" + str(member.getId()) + "} = " + str(round(memberForce[member.getId()]/1000, 2)) + " kN"
 
             elif member.getType() == "beam":
-                memberForces = self.getMemberForce(member)
+                memberForces = memberForce[member.getId()]
                 info = self.autoScaleMemberForceResult(memberForces, "beam")
                 memberForces = info[0]
                 unit = info[1]
@@ -1053,7 +1594,7 @@ class Structure(object):
                              "\n                         M" + j + " = " + str(round(memberForces[3][0],2)) + unit[3]
 
             elif member.getType() == "frame":
-                memberForces = self.getMemberForce(member)
+                memberForces = memberForce[member.getId()]
                 info = self.autoScaleMemberForceResult(memberForces, "frame")
                 memberForces = info[0]
                 unit = info[1]
@@ -1071,16 +1612,23 @@ class Structure(object):
             print("")
 
 
-    def packAllResult(self):
+    @profiled("formatting")
+    def packAllResult(self, rf=None, Rs=None):
         """
         Pack all the analysis result for display
+        The structure is only solved once, the reaction force and the member force reuse rf
+
+        :param rf: result of getrf, it is calculated if None
+        :param Rs: result of getRs, it is calculated if None
+        :return: dictionary of "nodalDisplacement", "reactionForce", "axialLoad", "shearForce" and "bendingMoment"
         """
         result = {"nodalDisplacement": [], "reactionForce":[], "axialLoad":[], "shearForce":[], "bendingMoment":[]}
 
         # nodal displacement
         freeNodalIndex = self.getFreeNodalIndex()
         nodalDisplacement = self.getNodalDisplacement()
-        rf = self.getrf()
+        if rf == None:
+            rf = self.getrf()
 
         for index in range(len(freeNodalIndex)):
             name = nodalDisplacement[freeNodalIndex[index]]
@@ -1096,82 +1644,93 @@ class Structure(object):
         # reaction force
         supportNodalIndex = self.getSupportNodalIndex()
         nodalLoad = self.getNodalLoad()
-        Rs = self.getRs()
+        if Rs == None:
+            Rs = self.getRs(rf)
 
         for index in range(len(supportNodalIndex)):
             resultNum = Rs[index][0]
             result["reactionForce"].append([nodalLoad[supportNodalIndex[index]], str(resultNum)])
 
         # axial load + shear force + bending moment
+        memberForce = self.getAllMemberForce(self.getNodalDisplacementResult(rf))
         for member in self.getMembers():
 
             if member.getType() == "truss":
-                axialLoad = self.getMemberForce(member)
+                axialLoad = memberForce[member.getId()]
                 if axialLoad == 0:
                     axialLoad = 0
                 result["axialLoad"].append([member.getId(), member.geti(), member.getj(), axialLoad, member.getL()])
 
             elif member.getType() == "frame":
-                memberForces = self.getMemberForce(member)
+                memberForces = memberForce[member.getId()]
                 axialLoad = -memberForces[0][0]
                 if axialLoad == 0:
                     axialLoad = 0
                 result["axialLoad"].append([member.getId(), member.geti(), member.getj(), axialLoad, member.getL()])
 
-                memberLoads = member.getMemberLoads().copy()
-
-                list = memberLoads["pointMoment"].copy()
-                list.append([0, -memberForces[2][0]])
-                list.append([round(member.getL()), memberForces[5][0]])
-                memberLoads["pointMoment"] = list
-
-                result["bendingMoment"].append(memberLoads)
-
-                memberLoads = member.getMemberLoads().copy()
-
-                list = memberLoads["pointLoad"].copy()
-                list.append([0, memberForces[1][0]])
-                list.append([round(member.getL()), memberForces[4][0]])
-                memberLoads["pointLoad"] = list
-
-                result["shearForce"].append(memberLoads)
+                shearForce, bendingMoment = self.packMemberDiagramData(member, memberForces)
+                result["bendingMoment"].append(bendingMoment)
+                result["shearForce"].append(shearForce)
 
 
             elif member.getType() == "beam":
                 axialLoad = 0
                 result["axialLoad"].append([member.getId(), member.geti(), member.getj(), axialLoad, member.getL()])
 
-                memberForces = self.getMemberForce(member)
-                memberLoads = member.getMemberLoads().copy()
+                shearForce, bendingMoment = self.packMemberDiagramData(member, memberForce[member.getId()])
+                result["bendingMoment"].append(bendingMoment)
+                result["shearForce"].append(shearForce)
+        return result
 
-                list = memberLoads["pointMoment"].copy()
-                list.append([0, -memberForces[1][0]])
-                list.append([round(member.getL()), memberForces[3][0]])
-                memberLoads["pointMoment"] = list
 
-                result["bendingMoment"].append(memberLoads)
+    def packMemberDiagramData(self, member, memberForces):
+        """
+        Pack the shear force and bending moment data of a beam or frame member for drawing,
+        they are the member loads with the end forces and the end moments added
 
-                memberLoads = member.getMemberLoads().copy()
+        :param member: beam or frame member
+        :param memberForces: member force of the member (see getMemberForce)
+        :return: [shear force data, bending moment data]
+        """
+        if member.getType() == "beam":
+            Fi, Mi, Fj, Mj = [memberForces[index][0] for index in range(4)]
+        else:
+            Fi, Mi, Fj, Mj = [memberForces[index][0] for index in [1, 2, 4, 5]]
 
-                list = memberLoads["pointLoad"].copy()
-                list.append([0, memberForces[0][0]])
-                list.append([round(member.getL()), memberForces[2][0]])
-                memberLoads["pointLoad"] = list
+        bendingMoment = member.getMemberLoads().copy()
+        list = bendingMoment["pointMoment"].copy()
+        list.append([0, -Mi])
+        list.append([round(member.getL()), Mj])
+        bendingMoment["pointMoment"] = list
 
-                result["shearForce"].append(memberLoads)
-        return result
+        shearForce = member.getMemberLoads().copy()
+        list = shearForce["pointLoad"].copy()
+        list.append([0, Fi])
+        list.append([round(member.getL()), Fj])
+        shearForce["pointLoad"] = list
+        return [shearForce, bendingMoment]
 
 
-    def getAllResult(self):
+    @profiled("formatting")
+    def getAllResult(self, rf=None, Rs=None):
         """
         Analyse the structure and save the result
+
+        :param rf: result of getrf, it is calculated if None
+        :param Rs: result of getRs, it is calculated if None
+        :return: the result text
         """
         result = ""
         freeNodalIndex = self.getFreeNodalIndex()
         supportNodalIndex = self.getSupportNodalIndex()
         nodalDisplacement = self.getNodalDisplacement()
         nodalLoad = self.getNodalLoad()
-        rf = self._matrixCalculator.matrixRoundDecimal(self.getrf(), None)
+        if rf == None:
+            rf = self.getrf()
+        memberForce = self.getAllMemberForce(self.getNodalDisplacementResult(rf))
+        if Rs == None:
+            Rs = self.getRs(rf)
+        rf = self._matrixCalculator.matrixRoundDecimal(rf, None)
 
         result = result + "    ----------------------------------\n"
         result = result + "    Nodal Displacement:\n"
@@ -1187,7 +1746,6 @@ class Structure(object):
                 unit = ""
             result = result + "    "+name + " = " + format(displacement, "5.2e") + unit +"\n"
 
-        Rs = self.getRs()
         result = result + "\n"
         result = result + "    Nodal Reaction Force:\n"
 
@@ -1215,14 +1773,14 @@ class Structure(object):
         for member in self.getMembers():
             memberData = ""
             if member.getType() == "truss":
-                trussMemberForce = self.getMemberForce(member)
+                trussMemberForce = memberForce[member.getId()]
                 if self._unit[0] == "kN":
                     trussMemberForce = trussMemberForce/1000
                 memberData = " {S" + str(member.getId()) + "} = " + str(round(trussMemberForce, self._unit[2])) + " " + self._unit[0]
 
 
             elif member.getType() == "beam":
-                memberForces = self.getMemberForce(member)
+                memberForces = memberForce[member.getId()]
                 info = self.autoScaleMemberForceResult(memberForces, "beam")
                 memberForces = info[0]
                 unit = info[1]
@@ -1236,7 +1794,7 @@ class Structure(object):
                              "\n                             M" + j + " = " + str(round(memberForces[3][0],self._unit[2])) + unit[3]
 
             elif member.getType() == "frame":
-                memberForces = self.getMemberForce(member)
+                memberForces = memberForce[member.getId()]
                 info = self.autoScaleMemberForceResult(memberForces, "frame")
                 memberForces = info[0]
                 unit = info[1]
@@ -1409,6 +1967,8 @@ class Structure(object):
         fd.write("############################################")
         fd.close()
 
+        # the PDF backend is only loaded when the PDF is generated
+        from fpdf import FPDF
         pdf = FPDF()
         pdf.add_page()
         pdf.set_font("Arial", size=5)
@@ -1944,6 +2504,7 @@ class Structure(object):
         :return: the function title value
         """
         results = []
+        memberForce = self.getAllMemberForce()
 
         for member in self.getMembers():
             result = []
@@ -1951,10 +2512,10 @@ class Structure(object):
             if member.getType() == "truss":
                 result.append(["Truss: member"+ str(member.getId())])
                 result.append(["S"+ str(member.getId())+ " = (AE/L) x <-c,-s,c,s>{r" + str(member.getId()) + "} = "
-                               + format(self.getMemberForce(member), "5.2e"),])
+                               + format(memberForce[member.getId()], "5.2e"),])
 
             elif member.getType() == "beam":
-                memberForces = self.getMemberForce(member)
+                memberForces = memberForce[member.getId()]
 
                 size = len(memberForces)
                 position = size//2
@@ -1974,7 +2535,7 @@ class Structure(object):
                     result.append(rowList)
 
             elif member.getType() == "frame":
-                memberForces = self.getMemberForce(member)
+                memberForces = memberForce[member.getId()]
 
                 size = len(memberForces)
                 position = size//2
@@ -2217,4 +2778,29 @@ structure.addMember(2,2,3,(10**4),(10**7),2*(10**5),"frame")
 structure.addGlobalMemberPointLoad(2,2500,0,-10000)
 
 structure.printAllResult()
-"""
\ No newline at end of file
+"""
+
+"""
+# same as the delta example above, by the support settlement of node 3
+I = (10**8)
+E = 200*(10**3)
+
+structure = Structure()
+structure.addNode(1,0,0,"FFF")
+structure.addNode(2,2000,0,"RFR")
+structure.addNode(3,5000,0,"RFR")
+structure.addNode(4,9000,0,"FFF")
+
+structure.addMember(1,1,2,None,I,E,"beam")
+structure.addMember(2,2,3,None,I,E,"beam")
+structure.addMember(3,3,4,None,I,E,"beam")
+
+structure.addMemberUniformlyDistributedLoad(2, -4)
+structure.addMemberPointLoad(3, 2000, -10000)
+
+structure.addNodalSettlement(3, 0, -2, 0)
+structure.printAllResult()
+
+for result in structure.solveSettlementScenarios([{}, {3:[0,-2,0]}, {2:[0,-1,0], 3:[0,-2,0]}]):
+    print(result["rf"], result["reactionForce"])
+"""
@@ -0,0 +1,245 @@
+import os
+from directStiffnessMethod.structure import Structure
+
+
+# buffer size of writing the .txt file in bytes
+BUFFER_SIZE = 1024*1024
+
+
+class StructureFile(object):
+    """
+    Read the structure .txt file and build the structure without the user interface
+    """
+
+    def read(self, filename):
+        """
+        Read the structure from .txt file, the file is streamed line by line
+
+        :param filename: path of the .txt file
+        :return: dictionary of "origin", "unit", "scaling" and "structureData"
+        """
+        fd = open(filename, "r")
+        try:
+            return self.readLines(fd)
+        finally:
+            fd.close()
+
+
+    def readLines(self, lines):
+        """
+        Read the structure from the lines of the .txt file in one pass and validate it (see validate)
+
+        :param lines: list or file of line string
+        :return: dictionary of "origin", "unit", "scaling" and "structureData"
+        """
+        structureData = {"node":[], "member":[], "nodalLoad":[], "memberPointLoad":[], "uniformlyDistributedLoad":[],
+                         "nodalSettlement":[]}
+        header = []
+        type = None
+        lineNum = 0
+        for line in lines:
+            lineNum = lineNum + 1
+            line = line.rstrip("\r\n")
+            if lineNum <= 3:
+                header.append(line)
+                continue
+            if line == "":
+                break
+
+            if "#" in line:
+                type = line.strip("#")
+                if type not in structureData:
+                    raise Exception('Unknown section #' + type + ' at line ' + str(lineNum) + '!')
+                continue
+
+            if type == None:
+                raise Exception('Data at line ' + str(lineNum) + ' is not in any section!')
+            data = line.split(";")
+            try:
+                if type == "node":
+                    structureData["node"].append([int(data[0]), int(data[1]), int(data[2]), data[3], data[4]])
+                elif type == "member":
+                    A = None
+                    if data[3] != "":
+                        A = float(data[3])
+                    I = None
+                    if data[4] != "":
+                        I = float(data[4])
+                    structureData["member"].append([int(data[0]), int(data[1]), int(data[2]), A, I, float(data[5]), data[6]])
+                elif type == "uniformlyDistributedLoad":
+                    structureData["uniformlyDistributedLoad"].append([int(data[0]), float(data[1])])
+                else:
+                    structureData[type].append([int(data[0]), float(data[1]), float(data[2]), float(data[3])])
+            except (ValueError, IndexError):
+                raise Exception('Invalid ' + str(type) + ' data "' + line + '" at line ' + str(lineNum) + '!')
+
+        if len(header) < 3:
+            raise Exception('The origin, unit and scaling lines are missing!')
+        try:
+            origin = header[0].split(";")
+            unit = header[1].split(";")
+            result = {"origin": [float(origin[0]), float(origin[1])],
+                      "unit": [unit[0], unit[1], int(unit[2])],
+                      "scaling": float(header[2]),
+                      "structureData": structureData}
+        except (ValueError, IndexError):
+            raise Exception('Invalid origin, unit or scaling line!')
+
+        self.validate(structureData)
+        return result
+
+
+    def validate(self, structureData):
+        """
+        Check the references of the structure data with the indexed IDs:
+        the IDs are unique, the members connect two different existing nodes and have the properties of their type,
+        and the loads are on existing nodes and members
+
+        :param structureData: dictionary of the node, member and loading data
+        """
+        nodes = set()
+        for data in structureData["node"]:
+            if data[0] in nodes:
+                raise Exception('Node ' + str(data[0]) + ' is defined twice!')
+            nodes.add(data[0])
+
+        members = {}
+        for data in structureData["member"]:
+            id, i, j, A, I, E, type = data
+            if id in members:
+                raise Exception('Member ' + str(id) + ' is defined twice!')
+            if i not in nodes or j not in nodes:
+                raise Exception('Node of member ' + str(id) + ' is not found!')
+            if i == j:
+                raise Exception('Member ' + str(id) + ' has the same starting and ending node!')
+            if type not in ["truss", "beam", "frame"]:
+                raise Exception('Unknown type ' + str(type) + ' of member ' + str(id) + '!')
+            if type != "beam" and A == None:
+                raise Exception('Area of member ' + str(id) + ' is missing!')
+            if type != "truss" and I == None:
+                raise Exception('Moment of inertia of member ' + str(id) + ' is missing!')
+            members[id] = type
+
+        for key in ["nodalLoad", "nodalSettlement"]:
+            for data in structureData.get(key, []):
+                if data[0] not in nodes:
+                    raise Exception('Node ' + str(data[0]) + ' of the ' + key + ' is not found!')
+        for key in ["memberPointLoad", "uniformlyDistributedLoad"]:
+            for data in structureData[key]:
+                if data[0] not in members:
+                    raise Exception('Member ' + str(data[0]) + ' of the ' + key + ' is not found!')
+
+
+    def buildStructure(self, structureData, unit=None):
+        """
+        Build the structure from the structure data, in the same way as the user interface
+        The members and the loads find their nodes and members by the indexed IDs of the structure
+
+        :param structureData: dictionary of the node, member and loading data
+        :param unit: required unit, the default unit is used if None
+        :return: the structure
+        """
+        structure = Structure()
+        if unit != None:
+            structure.changeUnit(unit)
+
+        for data in structureData["node"]:
+            restraint = data[3]
+            if restraint == "":
+                restraint = "RRR"
+            structure.addNode(data[0], data[1], data[2], restraint)
+
+        for data in structureData["member"]:
+            structure.addMember(data[0], data[1], data[2], data[3], data[4], data[5], data[6])
+
+        for data in structureData["nodalLoad"]:
+            structure.addNodalLoad(data[0], data[1], data[2], data[3])
+
+        for data in structureData["memberPointLoad"]:
+            member = structure.getMember(data[0])
+            if member == None or data[1] > member.getL():
+                continue
+            if member.getType() == "beam":
+                structure.addMemberPointLoad(data[0], data[1], data[3])
+            elif member.getType() == "frame":
+                structure.addGlobalMemberPointLoad(data[0], data[1], data[2], data[3])
+
+        for data in structureData["uniformlyDistributedLoad"]:
+            structure.addMemberUniformlyDistributedLoad(data[0], data[1])
+
+        for data in structureData.get("nodalSettlement", []):
+            structure.addNodalSettlement(data[0], data[1], data[2], data[3])
+
+        return structure
+
+
+    def generateLines(self, fileData):
+        """
+        Generate the lines of the .txt file one by one, in the same way as the user interface
+
+        :param fileData: dictionary of "origin", "unit", "scaling" and "structureData"
+        :return: generator of line string
+        """
+        origin = fileData["origin"]
+        unit = fileData["unit"]
+        yield str(origin[0]) + ";" + str(origin[1])
+        yield unit[0] + ";" + unit[1] + ";" + str(unit[2])
+        yield str(fileData["scaling"])
+
+        structureData = fileData["structureData"]
+        for key in structureData:
+            yield "#" + key
+            for data in structureData[key]:
+                items = []
+                for info in data:
+                    if info == None:
+                        info = ""
+                    items.append(str(info))
+                yield ";".join(items)
+
+
+    def writeLines(self, fileData):
+        """
+        Convert the structure into the lines of the .txt file, in the same way as the user interface
+
+        :param fileData: dictionary of "origin", "unit", "scaling" and "structureData"
+        :return: list of line string
+        """
+        return list(self.generateLines(fileData))
+
+
+    def write(self, filename, fileData, atomic=False):
+        """
+        Write the structure into .txt file, the lines are streamed through the buffer of the file,
+        so the time is linear and the whole text is never kept in the memory
+
+        :param filename: path of the .txt file
+        :param fileData: dictionary of "origin", "unit", "scaling" and "structureData"
+        :param atomic: write beside and then rename, so the old file is never left half written
+        """
+        path = filename
+        if atomic:
+            path = filename + "." + str(os.getpid()) + ".tmp"
+        fd = open(path, "w", buffering=BUFFER_SIZE)
+        try:
+            try:
+                for line in self.generateLines(fileData):
+                    fd.write(line)
+                    fd.write("\n")
+            finally:
+                fd.close()
+        except BaseException:
+            if atomic:
+                os.remove(path)
+            raise
+        if atomic:
+            os.replace(path, filename)
+
+
+# testing only
+"""
+structureFile = StructureFile()
+data = structureFile.read("exampleStructures/frame.txt")
+structure = structureFile.buildStructure(data["structureData"], data["unit"])
+structure.printAllResult()
+"""
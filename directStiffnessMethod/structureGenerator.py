@@ -0,0 +1,305 @@
+import random
+from directStiffnessMethod.structureFile import StructureFile
+
+
+# families of the generated structure
+TRUSS_TYPES = ["pratt", "warren", "howe"]
+
+
+def createStructureData():
+    """
+    Create empty structure data, in the same form as the structure data of the structure file
+
+    :return: dictionary of the node, member and loading data
+    """
+    return {"node":[], "member":[], "nodalLoad":[], "memberPointLoad":[], "uniformlyDistributedLoad":[],
+            "nodalSettlement":[]}
+
+
+def addNode(structureData, x, y, restraint="RRR", restraintShape=""):
+    """
+    Add a node with the next node ID, the coordinates are rounded to integer like the structure file
+
+    :param structureData: structure data
+    :param x: x coordinate
+    :param y: y coordinate
+    :param restraint: nodal restraint string
+    :param restraintShape: restraint shape string of the user interface
+    :return: node ID
+    """
+    id = len(structureData["node"]) + 1
+    structureData["node"].append([id, int(round(x)), int(round(y)), restraint, restraintShape])
+    return id
+
+
+def addMember(structureData, i, j, A, I, E, type):
+    """
+    Add a member with the next member ID
+
+    :param structureData: structure data
+    :param i: starting node ID
+    :param j: ending node ID
+    :param A: area value (None for beam member)
+    :param I: area Moment of Inertia (None for truss member)
+    :param E: elasticity
+    :param type: member type string
+    :return: member ID
+    """
+    id = len(structureData["member"]) + 1
+    structureData["member"].append([id, i, j, A, I, E, type])
+    return id
+
+
+def generatePortalFrame(bays, storeys, bayWidth=6000, storeyHeight=3500, A=10**4, I=10**8, E=2*(10**5),
+                        lateralLoad=10000, w=-20):
+    """
+    Generate a n-bay x m-storey portal frame with fixed column bases
+
+    :param bays: number of bays
+    :param storeys: number of storeys
+    :param bayWidth: width of each bay
+    :param storeyHeight: height of each storey
+    :param A: area value of the members
+    :param I: area Moment of Inertia of the members
+    :param E: elasticity of the members
+    :param lateralLoad: horizontal nodal load at the left node of each floor
+    :param w: UDL of the beams
+    :return: structure data
+    """
+    if bays < 1 or storeys < 1:
+        raise Exception('Portal frame needs at least one bay and one storey!')
+
+    structureData = createStructureData()
+    nodes = []
+    for level in range(storeys + 1):
+        row = []
+        for column in range(bays + 1):
+            if level == 0:
+                row.append(addNode(structureData, column*bayWidth, 0, "FFF", "FFF1"))
+            else:
+                row.append(addNode(structureData, column*bayWidth, level*storeyHeight))
+        nodes.append(row)
+
+    for level in range(1, storeys + 1):
+        for column in range(bays + 1):
+            addMember(structureData, nodes[level - 1][column], nodes[level][column], A, I, E, "frame")
+        for column in range(bays):
+            memberId = addMember(structureData, nodes[level][column], nodes[level][column + 1], A, I, E, "frame")
+            if w != 0:
+                structureData["uniformlyDistributedLoad"].append([memberId, w])
+        if lateralLoad != 0:
+            structureData["nodalLoad"].append([nodes[level][0], lateralLoad, 0, 0])
+    return structureData
+
+
+def generateTruss(panels, type="pratt", panelWidth=4000, height=4000, A=10**4, E=2*(10**5), load=-100000):
+    """
+    Generate a simply supported Pratt, Warren or Howe truss
+    The Pratt and Howe trusses have inclined end posts and verticals at the inner panel points,
+    the Warren truss has no verticals and its top chord nodes are at the middle of the panels
+
+    :param panels: number of panels
+    :param type: "pratt", "warren" or "howe"
+    :param panelWidth: width of each panel
+    :param height: height of the truss
+    :param A: area value of the members
+    :param E: elasticity of the members
+    :param load: vertical nodal load at each inner bottom chord node
+    :return: structure data
+    """
+    if type not in TRUSS_TYPES:
+        raise Exception('Unknown truss type ' + str(type) + '!')
+    if panels < 2:
+        raise Exception('Truss needs at least two panels!')
+
+    structureData = createStructureData()
+    bottom = []
+    for index in range(panels + 1):
+        if index == 0:
+            bottom.append(addNode(structureData, 0, 0, "FFR", "FFR1"))
+        elif index == panels:
+            bottom.append(addNode(structureData, index*panelWidth, 0, "RFR", "RFR1"))
+        else:
+            bottom.append(addNode(structureData, index*panelWidth, 0))
+
+    for index in range(panels):
+        addMember(structureData, bottom[index], bottom[index + 1], A, None, E, "truss")
+
+    if type == "warren":
+        top = []
+        for index in range(panels):
+            top.append(addNode(structureData, (index + 0.5)*panelWidth, height))
+        for index in range(panels - 1):
+            addMember(structureData, top[index], top[index + 1], A, None, E, "truss")
+        for index in range(panels):
+            addMember(structureData, bottom[index], top[index], A, None, E, "truss")
+            addMember(structureData, top[index], bottom[index + 1], A, None, E, "truss")
+
+    else:
+        # top[index] is above bottom[index], there is no top chord node above the supports
+        top = [None]
+        for index in range(1, panels):
+            top.append(addNode(structureData, index*panelWidth, height))
+        for index in range(1, panels - 1):
+            addMember(structureData, top[index], top[index + 1], A, None, E, "truss")
+        for index in range(1, panels):
+            addMember(structureData, bottom[index], top[index], A, None, E, "truss")
+
+        addMember(structureData, bottom[0], top[1], A, None, E, "truss")
+        addMember(structureData, top[panels - 1], bottom[panels], A, None, E, "truss")
+        for index in range(1, panels - 1):
+            leftHalf = index + 0.5 < panels/2
+            # Pratt diagonals slope down towards the middle, Howe diagonals slope up towards the middle
+            if leftHalf == (type == "pratt"):
+                addMember(structureData, top[index], bottom[index + 1], A, None, E, "truss")
+            else:
+                addMember(structureData, bottom[index], top[index + 1], A, None, E, "truss")
+
+    if load != 0:
+        for index in range(1, panels):
+            structureData["nodalLoad"].append([bottom[index], 0, load, 0])
+    return structureData
+
+
+def generateContinuousBeam(spans, spanLength=6000, I=2.5*(10**8), E=2.1*(10**5), w=-20):
+    """
+    Generate a continuous beam with a pin at the left end and rollers at the other supports
+
+    :param spans: number of spans
+    :param spanLength: length of each span
+    :param I: area Moment of Inertia of the members
+    :param E: elasticity of the members
+    :param w: UDL of every span
+    :return: structure data
+    """
+    if spans < 1:
+        raise Exception('Continuous beam needs at least one span!')
+
+    structureData = createStructureData()
+    nodes = [addNode(structureData, 0, 0, "FFR", "FFR1")]
+    for index in range(1, spans + 1):
+        nodes.append(addNode(structureData, index*spanLength, 0, "RFR", "RFR1"))
+
+    for index in range(spans):
+        memberId = addMember(structureData, nodes[index], nodes[index + 1], None, I, E, "beam")
+        if w != 0:
+            structureData["uniformlyDistributedLoad"].append([memberId, w])
+    return structureData
+
+
+def generateRandomLattice(columns, rows, spacing=3000, jitter=0.2, seed=None, type="truss",
+                          A=10**4, I=10**8, E=2*(10**5), load=-50000):
+    """
+    Generate a random planar lattice, the nodes of a grid are moved randomly
+    and each cell is split by one random diagonal, so the lattice is stable as a truss
+    The bottom left node is pinned and the bottom right node is on a roller
+
+    :param columns: number of cells in x direction
+    :param rows: number of cells in y direction
+    :param spacing: spacing of the grid
+    :param jitter: maximum random movement of the nodes, as a fraction of the spacing
+    :param seed: seed of the random number generator
+    :param type: "truss" or "frame"
+    :param A: area value of the members
+    :param I: area Moment of Inertia of the members (frame member only)
+    :param E: elasticity of the members
+    :param load: maximum random vertical nodal load at each top node
+    :return: structure data
+    """
+    if type not in ["truss", "frame"]:
+        raise Exception('Random lattice only supports truss and frame members!')
+    if columns < 1 or rows < 1:
+        raise Exception('Random lattice needs at least one cell!')
+
+    generator = random.Random(seed)
+    memberI = None
+    if type == "frame":
+        memberI = I
+
+    structureData = createStructureData()
+    nodes = []
+    for row in range(rows + 1):
+        nodeRow = []
+        for column in range(columns + 1):
+            x = column*spacing
+            y = row*spacing
+            if row > 0:
+                x = x + generator.uniform(-jitter, jitter)*spacing
+                y = y + generator.uniform(-jitter, jitter)*spacing
+            restraint = "RRR"
+            restraintShape = ""
+            if row == 0 and column == 0:
+                restraint = "FFR"
+                restraintShape = "FFR1"
+            elif row == 0 and column == columns:
+                restraint = "RFR"
+                restraintShape = "RFR1"
+            nodeRow.append(addNode(structureData, x, y, restraint, restraintShape))
+        nodes.append(nodeRow)
+
+    for row in range(rows + 1):
+        for column in range(columns + 1):
+            if column < columns:
+                addMember(structureData, nodes[row][column], nodes[row][column + 1], A, memberI, E, type)
+            if row < rows:
+                addMember(structureData, nodes[row][column], nodes[row + 1][column], A, memberI, E, type)
+            if row < rows and column < columns:
+                if generator.random() < 0.5:
+                    addMember(structureData, nodes[row][column], nodes[row + 1][column + 1], A, memberI, E, type)
+                else:
+                    addMember(structureData, nodes[row][column + 1], nodes[row + 1][column], A, memberI, E, type)
+
+    if load != 0:
+        for column in range(columns + 1):
+            structureData["nodalLoad"].append([nodes[rows][column], 0, generator.uniform(0.5, 1)*load, 0])
+    return structureData
+
+
+def createStructure(structureData, unit=None):
+    """
+    Build the structure from the generated structure data
+
+    :param structureData: structure data
+    :param unit: required unit, the default unit is used if None
+    :return: the structure
+    """
+    return StructureFile().buildStructure(structureData, unit)
+
+
+def writeStructure(filename, structureData, unit=None, origin=None, scaling=None):
+    """
+    Write the generated structure into the .txt file of the user interface
+
+    :param filename: path of the .txt file
+    :param structureData: structure data
+    :param unit: unit of the file, ["kN", "m", 2] if None
+    :param origin: origin of the drawing, [100, 800] if None
+    :param scaling: scaling of the drawing, the structure is fitted into the canvas if None
+    """
+    if unit == None:
+        unit = ["kN", "m", 2]
+    if origin == None:
+        origin = [100, 800]
+    if scaling == None:
+        width = 0
+        height = 0
+        for data in structureData["node"]:
+            width = max(width, abs(data[1]))
+            height = max(height, abs(data[2]))
+        scaling = max(width/1000, height/700, 1)
+
+    StructureFile().write(filename, {"origin": origin, "unit": unit, "scaling": scaling,
+                                     "structureData": structureData})
+
+
+# testing only
+"""
+structure = createStructure(generatePortalFrame(3, 5))
+structure.printAllResult()
+
+for type in TRUSS_TYPES:
+    writeStructure("exampleStructures/" + type + "8.txt", generateTruss(8, type))
+
+structure = createStructure(generateRandomLattice(10, 4, seed=1))
+print(structure.getNodeNum(), len(structure.getMembers()))
+"""
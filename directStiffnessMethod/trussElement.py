@@ -39,6 +39,17 @@ class TrussElement(Member):
         return self._allP[0]
 
 
+    def setSection(self, A, I):
+        """
+        Change the section of this member, the area Moment of Inertia is not used by truss member
+
+        :param A: area value
+        :param I: area Moment of Inertia
+        """
+        self._A = A
+        self._stiffness = TrussStiffness(self._id, self._i, self._j, A, self._E, self._L, self._c, self._s)
+
+
     def getA(self):
         """
         Get the area value of this member
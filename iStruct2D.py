@@ -14,15 +14,14 @@ Description: This project is my individual project, the purpose of the project i
 import math
 import tkinter as tk
 from directStiffnessMethod.structure import Structure
+from directStiffnessMethod.analysis import Analysis
+from directStiffnessMethod.structureFile import StructureFile
+from directStiffnessMethod.resultFile import getResultFilename
+from directStiffnessMethod.modelFile import ModelFile, EXTENSION
+from directStiffnessMethod.pdfReport import PdfReport
 from directStiffnessMethod.matrixCalculation import MatrixCalculation
+from directStiffnessMethod import memberDiagram
 from tkinter import *
-from PIL import ImageTk, Image
-from tkinter import simpledialog
-from tkinter import filedialog
-from reportlab.platypus import SimpleDocTemplate
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import Table
-from reportlab.platypus import TableStyle
 
 
 class DataInput(object):
@@ -87,6 +86,8 @@ class DataInput(object):
             for item in pictures:
                 self.names.extend(pictures[item])
 
+            # the imaging backend is only loaded when the support pictures are shown
+            from PIL import ImageTk, Image
             for support in pictures:
                 self._supportFrame = tk.Frame(self._master)
                 self._supportFrame.pack(pady=5)
@@ -290,6 +291,7 @@ class App(object):
         filemenu.add_command(label="Open", command=self.open)
         filemenu.add_command(label="Save", command=self.save)
         filemenu.add_command(label="Save As", command=self.saveAs)
+        filemenu.add_command(label="Save As Binary", command=self.saveAsBinary)
         filemenu.add_command(label="Quit", command= lambda : self._master.destroy())
 
         filemenu2 = tk.Menu(menubar)
@@ -399,6 +401,9 @@ class App(object):
                         canvas.create_text((node[1]/self._scaling + self._origin[0]), (self._origin[1] - node[2]/self._scaling) - deltaY, text=node[labelIndex], fill="#953BCB", font=("Arial", 10))
 
             for member in deflectedStructure["member"].copy():
+                if len(member) > 2:
+                    self.createDeflectedMember(member[2], canvas)
+                    continue
                 for node in deflectedStructure["node"].copy():
                     if node[0] == member[0]:
                         xi = node[1]
@@ -444,22 +449,18 @@ class App(object):
 
         # Draw the shear forces
         if shearForce != None:
+            # the diagram of each member is built once, the maximum is found from its critical points
             shearMax = 0
+            shearDiagrams = {}
             for memberShearData in shearForce:
                 for member in self._structure.getMembers():
                     if member.getId() == memberShearData["id"]:
                         drawingMember = member
 
-                for x in range(0, round(drawingMember.getL())+1, 10):
-                    shear = 0
-                    if len(memberShearData["pointLoad"]) != 0:
-                        for pointData in memberShearData["pointLoad"].copy():
-                            shear = shear + self.singularityFunction(x,pointData[0])*pointData[1]
-                    if len(memberShearData["uniformlyDistributedLoad"]) != 0:
-                        for w in memberShearData["uniformlyDistributedLoad"].copy():
-                            shear = shear + w*x
-                    if abs(shear) > shearMax:
-                        shearMax = abs(shear)
+                diagram = memberDiagram.createShearDiagram(memberShearData, drawingMember.getL())
+                shearDiagrams[memberShearData["id"]] = diagram
+                if abs(diagram.getAbsMax()[1]) > shearMax:
+                    shearMax = abs(diagram.getAbsMax()[1])
 
             lastPoint = None
             shearNum = 0
@@ -492,16 +493,12 @@ class App(object):
                 if lastPoint == None:
                     lastPoint = (xi, yi)
 
-                for x in range(0, round(drawingMember.getL())+1, 10):
+                # about one vertex for each pixel along the member, and the both sides of each point load
+                points = shearDiagrams[memberShearData["id"]].getDrawingPoints(self._scaling)
+                for index in range(len(points)):
+                    x, shear = points[index]
                     shearNum = shearNum + 1
                     tag = "shear" + str(shearNum)
-                    shear = 0
-                    if len(memberShearData["pointLoad"]) != 0:
-                        for pointData in memberShearData["pointLoad"].copy():
-                            shear = shear + self.singularityFunction(x,pointData[0])*pointData[1]
-                    if len(memberShearData["uniformlyDistributedLoad"]) != 0:
-                        for w in memberShearData["uniformlyDistributedLoad"].copy():
-                            shear = shear + w*x
 
                     x_axis_Vector = self._matrixCalculator.matrixScale(x_axis, x)
                     y_axis_Vector = self._matrixCalculator.matrixScale(y_axis, 85*self._scaling*shear/shearMax)
@@ -531,12 +528,12 @@ class App(object):
 
                     shear = round(shear, self._unit[2])
 
-                    if x == round(drawingMember.getL()):
+                    if index == len(points) - 1:
                         jPointX = xj/self._scaling + self._origin[0]
                         jPointY = self._origin[1] - yj/self._scaling
                         canvas.create_line([(shearX,shearY), (jPointX, jPointY)], fill='blue', width=2)
 
-                    if x == 0 or x == round(drawingMember.getL()):
+                    if index == 0 or index == len(points) - 1:
                         shearMagnitudeVector = [[shearMemberX-y_axis_Vector[0][0]],
                                                 [shearMemberY-y_axis_Vector[1][0]]]
                         yshearMagnitudeVector = self._matrixCalculator.matrixScale(y_axis_Vector, 1.2)
@@ -548,31 +545,18 @@ class App(object):
         # Draw the bending moments
         if bendingMoment != None:
 
+            # the diagram of each member is built once, the maximum is found from its critical points
             bendingMax = 0
+            bendingDiagrams = {}
             for memberBendingData in bendingMoment:
                 for member in self._structure.getMembers():
                     if member.getId() == memberBendingData["id"]:
                         drawingMember = member
 
-                for x in range(0, round(drawingMember.getL())+1, 10):
-                    bending = 0
-                    if len(memberBendingData["pointLoad"]) != 0:
-                        for pointData in memberBendingData["pointLoad"].copy():
-                            if x <= pointData[0]:
-                                bending = bending + (-pointData[1])*x*(drawingMember.getL()-pointData[0])/drawingMember.getL()
-                            elif x > pointData[0]:
-                                bending = bending + (-pointData[1])*(drawingMember.getL()-x)*pointData[0]/drawingMember.getL()
-                    if len(memberBendingData["uniformlyDistributedLoad"]) != 0:
-                        for w in memberBendingData["uniformlyDistributedLoad"].copy():
-                            bending = bending + (-w/2)*(x**2) + ((w*drawingMember.getL())/2)*x
-                    if len(memberBendingData["pointMoment"]) != 0:
-                        for pointData in memberBendingData["pointMoment"].copy():
-                            if pointData[0] == 0:
-                                bending = bending + (pointData[1]/drawingMember.getL())*(drawingMember.getL()-x)
-                            elif pointData[0] == round(drawingMember.getL()):
-                                bending = bending + (pointData[1]*x)/drawingMember.getL()
-                    if abs(bending) > bendingMax:
-                        bendingMax = abs(bending)
+                diagram = memberDiagram.createBendingDiagram(memberBendingData, drawingMember.getL())
+                bendingDiagrams[memberBendingData["id"]] = diagram
+                if abs(diagram.getAbsMax()[1]) > bendingMax:
+                    bendingMax = abs(diagram.getAbsMax()[1])
 
             lastPoint = None
             bendingNum = 0
@@ -611,30 +595,18 @@ class App(object):
                             momentMagnitude[0] = 0
                         momentMagnitude[1] = momentMagnitude[1]*(-1)
                     memberBendingData["pointMoment"] = momentList
+                    bendingDiagrams[memberBendingData["id"]] = memberDiagram.createBendingDiagram(memberBendingData,
+                                                                                                  drawingMember.getL())
 
                 if lastPoint == None:
                     lastPoint = (xi, yi)
 
-                for x in range(0, round(drawingMember.getL())+1, 10):
+                # about one vertex for each pixel along the member, and the exact peaks and break points
+                points = bendingDiagrams[memberBendingData["id"]].getDrawingPoints(self._scaling)
+                for index in range(len(points)):
+                    x, bending = points[index]
                     bendingNum = bendingNum + 1
                     tag = "bending" + str(bendingNum)
-                    bending = 0
-                    if len(memberBendingData["pointLoad"]) != 0:
-                        for pointData in memberBendingData["pointLoad"].copy():
-                            if x <= pointData[0]:
-                                bending = bending + (pointData[1])*x*(drawingMember.getL()-pointData[0])/drawingMember.getL()
-                            elif x > pointData[0]:
-                                bending = bending + (pointData[1])*(drawingMember.getL()-x)*pointData[0]/drawingMember.getL()
-
-                    if len(memberBendingData["uniformlyDistributedLoad"]) != 0:
-                        for w in memberBendingData["uniformlyDistributedLoad"].copy():
-                            bending = bending + (-w/2)*(x**2) + ((w*drawingMember.getL())/2)*x
-                    if len(memberBendingData["pointMoment"]) != 0:
-                        for pointData in memberBendingData["pointMoment"].copy():
-                            if pointData[0] == 0:
-                                bending = bending + (-pointData[1]/drawingMember.getL())*(drawingMember.getL()-x)
-                            elif pointData[0] == round(drawingMember.getL()):
-                                bending = bending + (-pointData[1]*x)/drawingMember.getL()
 
                     x_axis_Vector = self._matrixCalculator.matrixScale(x_axis, x)
                     y_axis_Vector = self._matrixCalculator.matrixScale(y_axis, 85*self._scaling*bending/bendingMax)
@@ -666,12 +638,12 @@ class App(object):
 
                     bending = round(bending, self._unit[2])
 
-                    if x == round(drawingMember.getL()):
+                    if index == len(points) - 1:
                         jPointX = xj/self._scaling + self._origin[0]
                         jPointY = self._origin[1] - yj/self._scaling
                         canvas.create_line([(bendingX,bendingY), (jPointX, jPointY)], fill='red', width=2)
 
-                    if x == 0 or x == round(drawingMember.getL()):
+                    if index == 0 or index == len(points) - 1:
                         bendingMagnitudeVector = [[bendingMemberX-y_axis_Vector[0][0]],
                                                 [bendingMemberY-y_axis_Vector[1][0]]]
                         yBendingMagnitudeVector = self._matrixCalculator.matrixScale(y_axis_Vector, 1.2)
@@ -713,6 +685,19 @@ class App(object):
         canvas.create_line([(xi, yi), (xj, yj)], fill='red')
 
 
+    def createDeflectedMember(self, points, canvas):
+        """
+        Generate the deflected member along its length in the canvas
+
+        :param points: list of [x, y] of the deflected member
+        :param canvas: canvas of iStruct2D
+        """
+        line = []
+        for x, y in points:
+            line.append((x/self._scaling + self._origin[0], self._origin[1] - y/self._scaling))
+        canvas.create_line(line, fill='red')
+
+
     def showResultLabel(self):
         """
         Draw the result label in the canvas
@@ -793,10 +778,12 @@ class App(object):
         self._moving = False
         self._unit = ["N","mm",2]
         self._filename = None
+        self._extension = ".txt"
         self._analysisTime = 0
         self._structure = Structure()
         self._structureData = {"node":[], "member":[], "nodalLoad":[], "memberPointLoad":[], "uniformlyDistributedLoad":[]}
         self._structureDrawingData = {"node":[], "member":[]}
+        self._loading = False
         self._canvas.delete("all")
         self.clearAllCanvas()
         self._master.title("iStruct2D")
@@ -1074,125 +1061,140 @@ class App(object):
 
     def open(self):
         """
-        Open and read the structure from .txt file
+        Open and read the structure from .txt file or binary model file
         """
+        from tkinter import filedialog
         filename = filedialog.askopenfilename(title="Choosing File", initialdir=("exampleStructures/"))
         if filename:
             self.new()
             self._filename = filename.split("/")[-1].split(".")[0]
+            if filename.endswith(EXTENSION):
+                self._extension = EXTENSION
             self._master.title("iStruct2D: "+ self._filename)
-            fd = open("exampleStructures/" + self._filename + ".txt", "r")
+            analysis = Analysis()
+            fileData = analysis.load("exampleStructures/" + self._filename + self._extension)
 
-            line = fd.readline().strip("\n")
-            origin = line.split(";")
-            self._origin = [float(origin[0]), float(origin[1])]
+            self._origin = fileData["origin"]
             self.updateOrigin()
 
-            line = fd.readline().strip("\n")
-            unit = line.split(";")
-            self._unit = [unit[0], unit[1], int(unit[2])]
+            self._unit = fileData["unit"]
             self.updateUnit()
 
-            line = fd.readline().strip("\n")
-            self._scaling = float(line)
+            self._scaling = fileData["scaling"]
             self.scalingBarUpdate2()
 
-            line = fd.readline().strip("\n")
-
-            type = None
-
-            while line != "":
-                if "#" in line:
-                    type = line.strip("#")
-
-                else:
-                    if type == "node":
-                        data = line.split(";")
-                        self.createNode(data[0], data[1],data[2], data[3], data[4], True)
-                    elif type == "member":
-                        data = line.split(";")
-                        self.createMember(data[0], data[1],data[2], data[3], data[4], data[5], data[6], True)
-                    elif type == "nodalLoad":
-                        data = line.split(";")
-                        self.createNodalLoad(data[0], data[1],data[2], data[3], True)
-                    elif type == "memberPointLoad":
-                        data = line.split(";")
-                        self.createMemberPointLoad(data[0], data[1],data[2], data[3])
-                    elif type == "uniformlyDistributedLoad":
-                        data = line.split(";")
-                        self.createMemberUniformlyDistributedLoad(data[0], data[1])
-
-                line = fd.readline().strip("\n")
-            fd.close()
+            # the structure is built by the analysis engine, the records are only drawn here
+            self._structure = analysis.getStructure()
+            self._structureData = fileData["structureData"]
+            self.drawStructureData(self._structureData)
+
             self.displayData("Successfully open the structure\n" +
-                             "    Filename: " + self._filename + ".txt\n")
+                             "    Filename: " + self._filename + self._extension + "\n" +
+                             "    Nodes: " + str(self._structure.getNodeNum()) +
+                             " ; Members: " + str(self._structure.getMemberNum()) + "\n")
+
+
+    def drawStructureData(self, structureData):
+        """
+        Draw the records of a structure which is already built, in one pass
+        The result center and the label are only updated once at the end, not for every record
+
+        :param structureData: dictionary of the node, member and loading data
+        """
+        self._loading = True
+        try:
+            for data in structureData["node"]:
+                self.createNode(data[0], data[1], data[2], data[3], data[4], True, build=False)
+            for data in structureData["member"]:
+                A = data[3]
+                if A == None:
+                    A = ""
+                I = data[4]
+                if I == None:
+                    I = ""
+                self.createMember(data[0], data[1], data[2], A, I, data[5], data[6], True, build=False)
+            for data in structureData["nodalLoad"]:
+                self.createNodalLoad(data[0], data[1], data[2], data[3], True, build=False)
+            for data in structureData["memberPointLoad"]:
+                self.createMemberPointLoad(data[0], data[1], data[2], data[3], build=False)
+            for data in structureData["uniformlyDistributedLoad"]:
+                self.createMemberUniformlyDistributedLoad(data[0], data[1], build=False)
+        finally:
+            self._loading = False
+        self.update()
 
 
     def save(self):
         """
-        Save the structure into .txt file
+        Save the structure into .txt file, or binary model file if it is opened from one
         """
         if self._filename is None:
+            from tkinter import simpledialog
             filename = simpledialog.askstring("Saving the structure", "Structure name:")
             if filename:
                 self._filename = filename
 
-        if self._filename:
-            self._master.title("iStruct2D: "+ self._filename)
-            fd = open("exampleStructures/" + self._filename + ".txt", "w")
-
-            result = "" + str(self._origin[0]) + ";" + str(self._origin[1]) + "\n"
-            result = result + self._unit[0] + ";" + self._unit[1] + ";" + str(self._unit[2]) + "\n"
-            result = result + str(self._scaling) + "\n"
-
-            for key in self._structureData:
-                result = result + "#"+key+"\n"
-                for data in self._structureData[key]:
-                    for info in data:
-                        if info == None:
-                            info = ""
-                        result = result + str(info) + ";"
-                    result = result[:-1]
-                    result = result + "\n"
-
-            fd.write(result)
-            fd.close()
-            self.displayData("Successfully saved the structure\n" +
-                             "    Filename: " + self._filename + ".txt\n" +
-                             "    Location: " + "exampleStructures/" + self._filename + ".txt\n")
+        if self._filename and self._extension == EXTENSION:
+            self.saveModelFile()
+        elif self._filename:
+            self.saveStructureFile()
 
 
     def saveAs(self):
         """
         Save the structure into .txt file at the selected location
         """
+        from tkinter import simpledialog
         filename = simpledialog.askstring("Saving the structure", "Structure name:")
         if filename:
             self._filename = filename
+            self._extension = ".txt"
 
         if self._filename:
-            self._master.title("iStruct2D: "+ self._filename)
-            fd = open("exampleStructures/" + self._filename + ".txt", "w")
+            self.saveStructureFile()
 
-            result = "" + str(self._origin[0]) + ";" + str(self._origin[1]) + "\n"
-            result = result + self._unit[0] + ";" + self._unit[1] + ";" + str(self._unit[2]) + "\n"
-            result = result + str(self._scaling) + "\n"
 
-            for key in self._structureData:
-                result = result + "#"+key+"\n"
-                for data in self._structureData[key]:
-                    for info in data:
-                        if info == None:
-                            info = ""
-                        result = result + str(info) + ";"
-                    result = result[:-1]
-                    result = result + "\n"
+    def saveStructureFile(self):
+        """
+        Write the structure into the .txt file of the filename (see StructureFile.write),
+        the file is streamed and replaced at once, so a failed save keeps the old file
+        """
+        self._master.title("iStruct2D: "+ self._filename)
+        self._extension = ".txt"
+        filename = "exampleStructures/" + self._filename + ".txt"
+        StructureFile().write(filename, {"origin": self._origin, "unit": self._unit, "scaling": self._scaling,
+                                         "structureData": self._structureData}, atomic=True)
+        self.displayData("Successfully saved the structure\n" +
+                         "    Filename: " + self._filename + ".txt\n" +
+                         "    Location: " + filename + "\n")
 
-            fd.write(result)
-            fd.close()
-            self.displayData("Successfully saved the structure\n" +
-                             "    Filename: " + self._filename + ".txt\n" +
-                             "    Location: " + "exampleStructures/" + self._filename + ".txt\n")
+
+    def saveAsBinary(self):
+        """
+        Save the structure into binary model file at the selected location, for very large structures
+        """
+        from tkinter import simpledialog
+        filename = simpledialog.askstring("Saving the structure", "Structure name:")
+        if filename:
+            self._filename = filename
+            self._extension = EXTENSION
+
+        if self._filename:
+            self.saveModelFile()
+
+
+    def saveModelFile(self):
+        """
+        Write the structure into the binary model file of the filename (see ModelFile)
+        """
+        self._master.title("iStruct2D: "+ self._filename)
+        self._extension = EXTENSION
+        filename = "exampleStructures/" + self._filename + EXTENSION
+        ModelFile().write(filename, {"origin": self._origin, "unit": self._unit, "scaling": self._scaling,
+                                     "structureData": self._structureData})
+        self.displayData("Successfully saved the structure\n" +
+                         "    Filename: " + self._filename + EXTENSION + "\n" +
+                         "    Location: " + filename + "\n")
 
 
     def clearAllData(self):
@@ -1231,79 +1233,65 @@ class App(object):
         """
         Analyse and get the results of the structure
         """
-        self._structure.changeUnit(self._unit)
+        analysis = Analysis(self._structure, self._unit)
 
         deflectedShapeData = {"node":[], "member":[]}
-        for node in self._structure.getNodes():
-            deflectedShapeData['node'].append([node.getID(), node.getx(), node.gety()])
-        for member in self._structure.getMembers():
-            deflectedShapeData['member'].append([member.geti(), member.getj()])
-
-        allResult = self._structure.packAllResult()
-        result = allResult["nodalDisplacement"].copy()
-
-        for data in result:
-            if "u" in data[0]:
-                nodeNum = int(data[0].strip("u"))
-                for nodeDataIndex in range(len(deflectedShapeData["node"])):
-                    nodeData = deflectedShapeData["node"][nodeDataIndex]
-                    if nodeData[0] == nodeNum:
-                        deflectedShapeData['node'][nodeDataIndex][1] = data[1]+nodeData[1]
-                        displacement = data[1]
-                        if self._unit[1] == "m":
-                            displacement = displacement/1000
-                        deflectedShapeData['node'][nodeDataIndex].append("Δx: "+ format(displacement, "5.2e")+data[2])
-
-            elif "v" in data[0]:
-                nodeNum = int(data[0].strip("v"))
-                for nodeDataIndex in range(len(deflectedShapeData["node"])):
-                    nodeData = deflectedShapeData["node"][nodeDataIndex]
-                    if nodeData[0] == nodeNum:
-                        deflectedShapeData['node'][nodeDataIndex][2] = data[1]+nodeData[2]
-                        displacement = data[1]
+
+        # the saved result next to the structure file is reloaded if the model has not changed since
+        allResult = None
+        resultFilename = None
+        if self._filename != None:
+            resultFilename = getResultFilename("exampleStructures/" + self._filename + self._extension)
+            allResult = analysis.loadResult(resultFilename)
+        if allResult == None:
+            allResult = analysis.analyse()
+            if resultFilename != None:
+                analysis.saveResult(allResult, resultFilename)
+        analysisResult = analysis.getAnalysisResult()
+
+        # the deflected nodes are read from the displacement of each node with the free components labelled
+        labels = ["Δx: ", "Δy: ", "θ: "]
+        for nodeId in analysisResult.getNodeIds():
+            nodeData = [nodeId] + analysisResult.getDeflectedCoordinate(nodeId)
+            displacement = analysisResult.getDisplacement(nodeId)
+            for component in range(3):
+                if analysisResult.isFree(nodeId, component):
+                    value = displacement[component]
+                    unit = ""
+                    if component != 2:
+                        unit = " " + self._unit[1]
                         if self._unit[1] == "m":
-                            displacement = displacement/1000
-                        deflectedShapeData['node'][nodeDataIndex].append("Δy: " + format(displacement, "5.2e")+data[2])
-
-            elif "θ" in data[0]:
-                nodeNum = int(data[0].strip("θ"))
-                for nodeDataIndex in range(len(deflectedShapeData["node"])):
-                    nodeData = deflectedShapeData["node"][nodeDataIndex]
-                    if nodeData[0] == nodeNum:
-                        displacement = data[1]
-                        deflectedShapeData['node'][nodeDataIndex].append("θ: " + format(displacement, "5.2e")+data[2])
-
-        result = allResult["reactionForce"].copy()
+                            value = value/1000
+                    nodeData.append(labels[component] + format(value, "5.2e") + unit)
+            deflectedShapeData['node'].append(nodeData)
+
+        # the deflected members are drawn along their length at about one station for each pixel
+        deflectedShape = analysis.getQuery().getDeflectedShape(self._scaling)
+        for memberId in analysisResult.getMemberIds():
+            deflectedShapeData['member'].append(analysisResult.getMemberNodes(memberId) + [deflectedShape[memberId]])
+
+        # one reaction force for each restrained component of a node
         reactionForceData = []
-        for forceData in result:
-            force = [forceData[0][-1], 0, 0, 0]
-            if forceData[0][0] == "F":
-                if forceData[0][1] == "x":
-                    force[1] = forceData[1]
-                elif forceData[0][1] == "y":
-                    force[2] = forceData[1]
-            elif forceData[0][0] == "M":
-                force[3] = forceData[1]
-            reactionForceData.append(force)
-
-        result = allResult["axialLoad"].copy()
+        for nodeId in analysisResult.getNodeIds():
+            reaction = analysisResult.getReaction(nodeId)
+            for component in range(3):
+                if analysisResult.isRestrained(nodeId, component):
+                    force = [nodeId, 0, 0, 0]
+                    force[component + 1] = reaction[component]
+                    reactionForceData.append(force)
+
         axialLoadData = []
-        for axialForceData in result:
-            for nodeItem in self._structure.getNodes():
-                if nodeItem.getID() == axialForceData[1]:
-                    xi = nodeItem.getx()
-                    yi = nodeItem.gety()
-                elif nodeItem.getID() == axialForceData[2]:
-                    xj = nodeItem.getx()
-                    yj = nodeItem.gety()
-            axialLoadData.append([xi,yi,xj,yj, axialForceData[3], axialForceData[4]])
+        for memberId in analysisResult.getMemberIds():
+            i, j = analysisResult.getMemberNodes(memberId)
+            axialLoadData.append(analysisResult.getCoordinate(i) + analysisResult.getCoordinate(j) +
+                                 [analysisResult.getAxialForce(memberId), analysisResult.getMemberLength(memberId)])
 
         shearForceData = allResult["shearForce"]
         bendingMomentData = allResult["bendingMoment"]
 
 
         self._analysisTime = self._analysisTime + 1
-        result = "Linear Analysis Result#" +str(self._analysisTime)+ ":\n" + self._structure.getAllResult()
+        result = "Linear Analysis Result#" +str(self._analysisTime)+ ":\n" + allResult["report"]
         self.displayData(result)
         self._canvasDisplay.config(state=NORMAL)
         pos = self._canvasDisplay.search("Linear Analysis Result#"+str(self._analysisTime),"1.0")
@@ -1423,7 +1411,7 @@ class App(object):
         canvas.create_line([(position1[0], position1[1]), (position2[0], position2[1])], fill=color)
 
 
-    def createMember(self, data0, data1, data2, data3, data4, data5, data6, detail, canvas=None):
+    def createMember(self, data0, data1, data2, data3, data4, data5, data6, detail, canvas=None, build=True):
         """
         Generate the member from the user's input
 
@@ -1436,6 +1424,7 @@ class App(object):
         :param data6: type string
         :param detail: detail of member
         :param canvas: canvas to be added into
+        :param build: add the member into the structure, False if the structure is built by the analysis engine
         """
         if canvas == None:
             canvas = self._canvas
@@ -1454,22 +1443,19 @@ class App(object):
 
         type = data6
 
-        if detail:
+        if detail and build:
             self._structure.addMember(memberID,nodeI, nodeJ, A, I, E, type)
             memberData = [memberID,nodeI,nodeJ,A,I,E,type]
             self._structureData["member"].append(memberData)
 
-        for member in self._structure.getMembers():
-            if member.getId() == memberID:
-                L = member.getL()
+        L = self._structure.getMember(memberID).getL()
 
-        for node in self._structure.getNodes():
-            if node.getID() == nodeI:
-                nodeIx = node.getx()/self._scaling+ self._origin[0]
-                nodeIy = self._origin[1] - node.gety()/self._scaling
-            if node.getID() == nodeJ:
-                nodeJx = node.getx()/self._scaling+ self._origin[0]
-                nodeJy = self._origin[1] - node.gety()/self._scaling
+        node = self._structure.getNode(nodeI)
+        nodeIx = node.getx()/self._scaling+ self._origin[0]
+        nodeIy = self._origin[1] - node.gety()/self._scaling
+        node = self._structure.getNode(nodeJ)
+        nodeJx = node.getx()/self._scaling+ self._origin[0]
+        nodeJy = self._origin[1] - node.gety()/self._scaling
 
         canvas.create_line([(nodeIx, nodeIy), (nodeJx, nodeJy)], fill='black')
 
@@ -1494,14 +1480,16 @@ class App(object):
             if self._unit[1] == "m":
                 length = length/1000
 
-            self.displayData("Successfully created Member "+str(memberID)+" : \n   "+
-                             " type: " + type + "\n   "
-                             " i: Node " + str(nodeI) +" ; j: Node "+ str(nodeJ)+ "\n   "+
-                             " E: " + format(E, "5.2e") + " [MPa]\n   " +
-                             dataI + dataA +
-                             " L: " + format(length, "5.2e")+ " [" + self._unit[1] +"]\n   ")
+            if not self._loading:
+                self.displayData("Successfully created Member "+str(memberID)+" : \n   "+
+                                 " type: " + type + "\n   "
+                                 " i: Node " + str(nodeI) +" ; j: Node "+ str(nodeJ)+ "\n   "+
+                                 " E: " + format(E, "5.2e") + " [MPa]\n   " +
+                                 dataI + dataA +
+                                 " L: " + format(length, "5.2e")+ " [" + self._unit[1] +"]\n   ")
             self._structureDrawingData["member"].append([data0, data1, data2, data3, data4, data5, data6])
-        self.update()
+        if not self._loading:
+            self.update()
 
 
     def pointRotation(self, point, radian, center):
@@ -1534,7 +1522,7 @@ class App(object):
         return result
 
 
-    def createNode(self, data0, data1, data2, data3, data4, detail, canvas=None):
+    def createNode(self, data0, data1, data2, data3, data4, detail, canvas=None, build=True):
         """
         Generate the node from the user's input
 
@@ -1545,6 +1533,7 @@ class App(object):
         :param data4: restraint shape string of the node
         :param detail: detail of the node
         :param canvas: canvas to be added into
+        :param build: add the node into the structure, False if the structure is built by the analysis engine
         """
         if canvas == None:
             canvas = self._canvas
@@ -1557,7 +1546,7 @@ class App(object):
         if restraint == "":
             restraint = "RRR"
 
-        if detail:
+        if detail and build:
             self._structure.addNode(nodeID, nodeX, nodeY, restraint)
 
             nodeData = [nodeID,nodeX,nodeY,restraint,restraintShape]
@@ -1863,7 +1852,8 @@ class App(object):
             canvas.create_line([(additionPoint7[0][0], additionPoint7[1][0]), (additionPoint8[0][0], additionPoint8[1][0])], fill='black')
             canvas.create_line([(additionPoint9[0][0], additionPoint9[1][0]), (additionPoint10[0][0], additionPoint10[1][0])], fill='black')
 
-        self.update()
+        if not self._loading:
+            self.update()
         if detail:
             x_coordinate = nodeX
             y_coordinate = nodeY
@@ -1872,14 +1862,15 @@ class App(object):
                 x_coordinate = x_coordinate/1000
                 y_coordinate = y_coordinate/1000
 
-            self.displayData("Successfully created Node "+str(nodeID)+" : \n   "+
-                             " coordinate: (" + str(x_coordinate) +","+ str(y_coordinate)+ ") [" + self._unit[1] + "]\n   "+
-                             " type: " + type + "\n   "
-                             " restraint: " + restraint+ "\n   ")
+            if not self._loading:
+                self.displayData("Successfully created Node "+str(nodeID)+" : \n   "+
+                                 " coordinate: (" + str(x_coordinate) +","+ str(y_coordinate)+ ") [" + self._unit[1] + "]\n   "+
+                                 " type: " + type + "\n   "
+                                 " restraint: " + restraint+ "\n   ")
             self._structureDrawingData["node"].append([data0, data1, data2, data3, data4])
 
 
-    def createNodalLoad(self, data0, data1, data2, data3, detail, canvas=None):
+    def createNodalLoad(self, data0, data1, data2, data3, detail, canvas=None, build=True):
         """
         Generate the nodal force from the user's input
 
@@ -1889,6 +1880,7 @@ class App(object):
         :param data3: moment value of the force
         :param detail: detail of the nodal load
         :param canvas: canvas to be added into
+        :param build: add the nodal load into the structure, False if the structure is built by the analysis engine
         """
         if canvas == None:
             canvas = self._canvas
@@ -1897,7 +1889,7 @@ class App(object):
         Fy = float(data2)
         M = float(data3)
 
-        if detail:
+        if detail and build:
             self._structure.addNodalLoad(nodeID,Fx, Fy, M)
             nodalLoadData = [nodeID,Fx,Fy,M]
             self._structureData["nodalLoad"].append(nodalLoadData)
@@ -1913,10 +1905,9 @@ class App(object):
         Fy = round(Fy,self._unit[2])
         M = round(M,self._unit[2])
 
-        for node in self._structure.getNodes():
-            if node.getID() == nodeID:
-                x = node.getx()/self._scaling + self._origin[0]
-                y = self._origin[1] - node.gety()/self._scaling
+        node = self._structure.getNode(nodeID)
+        x = node.getx()/self._scaling + self._origin[0]
+        y = self._origin[1] - node.gety()/self._scaling
 
         if Fx > 0 or Fx < 0:
             if Fx > 0:
@@ -1948,7 +1939,7 @@ class App(object):
                 canvas.create_arc(coord, start=-120, extent=270, style=tk.ARC, width=1, outline="red")
                 self.drawArrow((x-5,y+19), (x-10, y+18), "red", canvas)
                 canvas.create_text(x-10, y+36, text=str(-M) + " " + self._unit[0]+self._unit[1], fill="red")
-        if detail:
+        if detail and not self._loading:
             self.displayData("Successfully added Nodal Load"+ "\n   ")
 
 
@@ -1973,7 +1964,7 @@ class App(object):
         return (vector[0][0]+ix, vector[1][0]+iy)
 
 
-    def createMemberPointLoad(self, data0, data1, data2, data3):
+    def createMemberPointLoad(self, data0, data1, data2, data3, build=True):
         """
         Generate the member point load from the user's input
 
@@ -1981,34 +1972,31 @@ class App(object):
         :param data1: distance from starting point
         :param data2: x value of the force
         :param data3: y value of the force
+        :param build: add the load into the structure, False if the structure is built by the analysis engine
         """
         memberID = int(data0)
         x = float(data1)
         Fx = float(data2)
         Fy = float(data3)
 
-        for member in self._structure.getMembers():
-            if member.getId() == memberID:
-                type = member.getType()
-                nodes = member.get_ij()
-                L = member.getL()
+        member = self._structure.getMember(memberID)
+        type = member.getType()
+        nodes = member.get_ij()
+        L = member.getL()
 
         if x > L:
             return None
 
-        for node in self._structure.getNodes():
-            if node.getID() == nodes[0]:
-                ix = node.getx()
-                iy = node.gety()
-            elif node.getID() == nodes[1]:
-                jx = node.getx()
-                jy = node.gety()
+        ix, iy = self._structure.getNodeCoordinate(nodes[0])
+        jx, jy = self._structure.getNodeCoordinate(nodes[1])
 
-        memberPointLoadData = [memberID,x,Fx,Fy]
-        self._structureData["memberPointLoad"].append(memberPointLoadData)
+        if build:
+            memberPointLoadData = [memberID,x,Fx,Fy]
+            self._structureData["memberPointLoad"].append(memberPointLoadData)
 
         if type == "beam":
-            self._structure.addMemberPointLoad(memberID,x,Fy)
+            if build:
+                self._structure.addMemberPointLoad(memberID,x,Fy)
             pointX, pointY = self.calculatePosition((ix,iy), (jx,jy), x)
             pointX = pointX/self._scaling + self._origin[0]
             pointY = self._origin[1] - pointY/self._scaling
@@ -2028,7 +2016,8 @@ class App(object):
                 self._canvas.create_text(pointX, pointY+70, text=str(Fy) + " " + self._unit[0], fill="red")
 
         elif type == "frame":
-            self._structure.addGlobalMemberPointLoad(memberID,x,Fx,Fy)
+            if build:
+                self._structure.addGlobalMemberPointLoad(memberID,x,Fx,Fy)
             pointX, pointY = self.calculatePosition((ix,iy), (jx,jy), x)
             pointX = pointX/self._scaling + self._origin[0]
             pointY = self._origin[1] - pointY/self._scaling
@@ -2061,24 +2050,27 @@ class App(object):
         distance = x
         if self._unit[1] == "m":
             distance = distance/1000
-        self.displayData("Successfully added Member Point Load:\n   " +
-                         " Distance from node " + str(nodes[0]) + " : " + str(distance)+ " " + self._unit[1] + "\n   ")
+        if not self._loading:
+            self.displayData("Successfully added Member Point Load:\n   " +
+                             " Distance from node " + str(nodes[0]) + " : " + str(distance)+ " " + self._unit[1] + "\n   ")
 
 
-    def createMemberUniformlyDistributedLoad(self, data0, data1):
+    def createMemberUniformlyDistributedLoad(self, data0, data1, build=True):
         """
         Generate the member UDL from the user's input
         UDL not included in frame member
 
         :param data0: member ID
         :param data1: value of the UDL
+        :param build: add the UDL into the structure, False if the structure is built by the analysis engine
         """
         memberID = int(data0)
         w = float(data1)
 
-        self._structure.addMemberUniformlyDistributedLoad(memberID, w)
-        uniformlyDistributedLoadData = [memberID,w]
-        self._structureData["uniformlyDistributedLoad"].append(uniformlyDistributedLoadData)
+        if build:
+            self._structure.addMemberUniformlyDistributedLoad(memberID, w)
+            uniformlyDistributedLoadData = [memberID,w]
+            self._structureData["uniformlyDistributedLoad"].append(uniformlyDistributedLoadData)
 
         if self._unit[0] == "kN":
             w = w/1000
@@ -2089,18 +2081,12 @@ class App(object):
         w = round(w,self._unit[2])
 
 
-        for member in self._structure.getMembers():
-            if member.getId() == memberID:
-                nodes = member.get_ij()
-                L = member.getL()
+        member = self._structure.getMember(memberID)
+        nodes = member.get_ij()
+        L = member.getL()
 
-        for node in self._structure.getNodes():
-            if node.getID() == nodes[0]:
-                ix = node.getx()
-                iy = node.gety()
-            elif node.getID() == nodes[1]:
-                jx = node.getx()
-                jy = node.gety()
+        ix, iy = self._structure.getNodeCoordinate(nodes[0])
+        jx, jy = self._structure.getNodeCoordinate(nodes[1])
 
         numOfLine = math.floor((L/self._scaling)/20)
 
@@ -2137,7 +2123,8 @@ class App(object):
                 if index == numOfLine//2:
                     self._canvas.create_text(pointX, pointY+75, text=str(w) + " "+self._unit[0]+"/"+self._unit[1], fill="red")
 
-        self.displayData("Successfully added Distributed Load"+ "\n   ")
+        if not self._loading:
+            self.displayData("Successfully added Distributed Load"+ "\n   ")
 
 
     def update(self):
@@ -2171,6 +2158,7 @@ class App(object):
         """
         if self._unit[1] == "m":
             x = x/1000
+        x = round(x, self._unit[2])
 
         if type == "Shear Force":
             if self._unit[0] == "kN":
@@ -2197,131 +2185,10 @@ class App(object):
         """
         Generate the result of the analysis and save it into PDF
         """
-        filename = "results/" + self._filename + ".pdf"
-
-        pdf = SimpleDocTemplate(filename, pagesize=letter)
-
-        style1 = TableStyle([("ALIGN", (0,0), (-1,-1),"CENTER"),
-                             ("BOX", (0,0), (-1,-1), 2, "black"),
-                             ("LINEBEFORE", (0,0), (-1,-1), 1, "black"),
-                             ("LINEABOVE", (0,0), (-1,-1), 1, "black")])
-
-        memberTable1 = Table(self._structure.getMemberInformationTable1())
-        memberTable2 = Table(self._structure.getMemberInformationTable2())
-
-        memberTable1.setStyle(style1)
-        memberTable2.setStyle(style1)
-
-        elements = []
-        elements.append(Table([["Linear Analysis Result: " + self._filename,],]))
-        elements.append(Table([["unit: [N], [mm]",],]))
-        elements.append(Table([["",],]))
-        elements.append(Table([["Member Information: ",],]))
-        elements.append(Table([["",],]))
-        elements.append(memberTable1)
-        elements.append(Table([["",],])) # blank line
-        elements.append(memberTable2)
-        elements.append(Table([["",],]))
-
-        style2 = TableStyle([("ALIGN", (0,0), (-1,-1),"CENTER"),])
-
-        elements.append(Table([["",],]))
-        elements.append(Table([["Member Local Stiffness: ",],]))
-        elements.append(Table([["",],]))
-        for stiffness in self._structure.getLocalStiffness():
-            table = Table(stiffness)
-            table.setStyle(style2)
-            elements.append(table)
-            elements.append(Table([["",],]))
-
-        style3 = TableStyle([("ALIGN", (0,0), (-1,-1),"CENTER"),
-                             ("FONTSIZE", (0,0), (-1,-1), 7)])
-
-        elements.append(Table([["",],]))
-        elements.append(Table([["Structure Global Stiffness: ",],]))
-        elements.append(Table([["",],]))
-        globalStiffness = Table(self._structure.getGlobalStiffnessString())
-        globalStiffness.setStyle(style3)
-        elements.append(globalStiffness)
-        elements.append(Table([["",],]))
-
-        elements.append(Table([["",],]))
-        elements.append(Table([["Nodal Displacement & Nodal Load: ",],]))
-        elements.append(Table([["",],]))
-        r_R = Table(self._structure.getNodalDisplacementAndLoad())
-        r_R.setStyle(style2)
-        elements.append(r_R)
-        elements.append(Table([["",],]))
-
-        elements.append(Table([["",],]))
-        elements.append(Table([["Member Local P: ",],]))
-        elements.append(Table([["",],]))
-        for P in self._structure.getAllLocalP():
-            eachP = Table(P)
-            eachP.setStyle(style2)
-            elements.append(eachP)
-            elements.append(Table([["",],]))
-        elements.append(Table([["",],]))
-
-        elements.append(Table([["",],]))
-        elements.append(Table([["Structure Global P: ",],]))
-        elements.append(Table([["",],]))
-        globalP = Table(self._structure.getGlobalPString())
-        globalP.setStyle(style2)
-        elements.append(globalP)
-        elements.append(Table([["",],]))
-
-        elements.append(Table([["",],]))
-        elements.append(Table([["Nodal Displacement {rf}: ",],]))
-        elements.append(Table([["{Rf} = [Kff]{rf} + {Pf}",],]))
-        elements.append(Table([["{rf} = [Kff]^(-1) x ({Rf} - {Pf})",],]))
-        elements.append(Table([["",],]))
-        Kff = Table(self._structure.getKffString())
-        Kff.setStyle(style2)
-        elements.append(Kff)
-        elements.append(Table([["",],]))
-        Rf = Table(self._structure.getRfString())
-        Rf.setStyle(style2)
-        elements.append(Rf)
-        elements.append(Table([["",],]))
-        Pf = Table(self._structure.getPfString())
-        Pf.setStyle(style2)
-        elements.append(Pf)
-        elements.append(Table([["",],]))
-        rf = Table(self._structure.get_rfString())
-        rf.setStyle(style2)
-        elements.append(rf)
-        elements.append(Table([["",],]))
-
-        elements.append(Table([["",],]))
-        elements.append(Table([["Reaction Force {Rs}: ",],]))
-        elements.append(Table([["{Rs} = [Ksf]{rf} + {Ps}",],]))
-        elements.append(Table([["",],]))
-        Ksf = Table(self._structure.getKsfString())
-        Ksf.setStyle(style2)
-        elements.append(Ksf)
-        elements.append(Table([["",],]))
-        Ps = Table(self._structure.getPsString())
-        Ps.setStyle(style2)
-        elements.append(Ps)
-        elements.append(Table([["",],]))
-        Rs = Table(self._structure.getRsString())
-        Rs.setStyle(style2)
-        elements.append(Rs)
-        elements.append(Table([["",],]))
-
-        elements.append(Table([["",],]))
-        elements.append(Table([["Member Force: ",],]))
-        elements.append(Table([["",],]))
-        for F in self._structure.getLocalMemberForce():
-            eachF = Table(F)
-            eachF.setStyle(style2)
-            elements.append(eachF)
-            elements.append(Table([["",],]))
-
-        pdf.build(elements)
-
-
-root = tk.Tk()
-app = App(root)
-root.mainloop()
\ No newline at end of file
+        PdfReport(self._structure).write("results/" + self._filename + ".pdf", self._filename)
+
+
+if __name__ == "__main__":
+    root = tk.Tk()
+    app = App(root)
+    root.mainloop()
\ No newline at end of file